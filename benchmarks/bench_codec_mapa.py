@@ -0,0 +1,83 @@
+"""Compara o codec do mapa (`src.codec_mapa`) com a grade de dicionários antiga.
+
+Uso (na raiz do repositório):
+
+    python -m benchmarks.bench_codec_mapa
+    python -m benchmarks.bench_codec_mapa --tamanhos 10 64 200 --repeticoes 5
+
+Para cada tamanho de andar, mede o JSON gerado e o tempo de salvar (serializar +
+`json.dumps`) e de carregar (`json.loads` + hidratar) nos dois formatos.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from collections.abc import Callable
+
+from src import config
+from src.codec_mapa import codificar_mapa, decodificar_mapa
+from src.gerador_mapa import gerar_mapa
+from src.mapa_compacto import MapaCompacto
+
+
+def _melhor_tempo(funcao: Callable[[], object], repeticoes: int) -> float:
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def _grade_antiga(mapa: MapaCompacto) -> list[list[dict[str, object]]]:
+    return [[sala.to_dict() for sala in linha] for linha in mapa]
+
+
+def main() -> None:
+    """Roda o benchmark e imprime uma tabela simples."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[10, 200])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    cabecalho = (
+        "tamanho",
+        "codec (KiB)",
+        "grade (KiB)",
+        "salvar (ms)",
+        "grade (ms)",
+        "carregar (ms)",
+        "grade (ms)",
+    )
+    print("{:>8} {:>12} {:>12} {:>12} {:>11} {:>14} {:>11}".format(*cabecalho))
+    for tamanho in args.tamanhos:
+        mapa = gerar_mapa(
+            3,
+            config.DIFICULDADES["normal"],
+            rng=random.Random(1),
+            largura=tamanho,
+            altura=tamanho,
+        )
+        texto_codec = json.dumps(codificar_mapa(mapa))
+        texto_grade = json.dumps(_grade_antiga(mapa))
+
+        salvar = _melhor_tempo(lambda m=mapa: json.dumps(codificar_mapa(m)), args.repeticoes)
+        salvar_grade = _melhor_tempo(lambda m=mapa: json.dumps(_grade_antiga(m)), args.repeticoes)
+        carregar = _melhor_tempo(
+            lambda t=texto_codec: decodificar_mapa(json.loads(t)), args.repeticoes
+        )
+        carregar_grade = _melhor_tempo(
+            lambda t=texto_grade: MapaCompacto.de_dicts(json.loads(t)), args.repeticoes
+        )
+        print(
+            f"{tamanho:>8} {len(texto_codec) / 1024:>12.1f} {len(texto_grade) / 1024:>12.1f} "
+            f"{salvar * 1000:>12.2f} {salvar_grade * 1000:>11.2f} "
+            f"{carregar * 1000:>14.2f} {carregar_grade * 1000:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
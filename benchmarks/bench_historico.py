@@ -0,0 +1,107 @@
+"""Compara o histórico em SQLite com o `history.json` reescrito a cada run.
+
+Uso (na raiz do repositório):
+
+    python -m benchmarks.bench_historico
+    python -m benchmarks.bench_historico --runs 1000 10000 50000
+
+Cada linha pré-carrega `runs` entradas e mede registrar mais uma run, abrir a
+primeira página da tela de histórico (20 runs) e montar o ranking com as estatísticas
+agregadas (por classe, percentis de andar e letalidade por andar). A coluna `json` simula o formato
+antigo sem o corte de 50 entradas: ler, acrescentar e reescrever o arquivo inteiro.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from src.historico import HistoricoRuns
+
+CLASSES = ("Guerreiro", "Mago", "Arqueiro", "Ladino")
+
+
+def _entrada(indice: int) -> dict[str, object]:
+    return {
+        "motivo": "morte" if indice % 3 else "saida",
+        "personagem": f"Heroi {indice}",
+        "classe": CLASSES[indice % len(CLASSES)],
+        "nivel_personagem": 1 + indice % 12,
+        "andar_alcancado": 1 + indice % 15,
+        "dificuldade": "normal",
+        "inimigos_derrotados": indice % 40,
+        "itens_obtidos": indice % 9,
+        "inimigo_causa_morte": "Goblin" if indice % 3 else None,
+        "turnos_totais": 100 + indice % 900,
+        "seed_run": indice * 7919,
+        "timestamp_local": "2026-01-01 12:00:00",
+    }
+
+
+def _tempo(funcao: Callable[[], object]) -> float:
+    inicio = time.perf_counter()
+    funcao()
+    return time.perf_counter() - inicio
+
+
+def _registrar_json(caminho: Path, entrada: dict[str, object]) -> None:
+    historico = json.loads(caminho.read_text(encoding="utf-8"))
+    historico.append(entrada)
+    caminho.write_text(json.dumps(historico, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def _ranking(banco: HistoricoRuns) -> None:
+    banco.ranking()
+    for estat in banco.estatisticas_por_classe():
+        banco.percentis_andar((50, 90), classe=estat.classe)
+    banco.inimigo_mais_letal_por_andar()
+
+
+def _medir(runs: int, diretorio: Path) -> tuple[float, ...]:
+    """Retorna os tempos de registro, tela e ranking com `runs` entradas."""
+    entradas = [_entrada(indice) for indice in range(runs)]
+    banco = HistoricoRuns(diretorio / "history.db")
+    banco.importar(entradas)
+    arquivo_json = diretorio / "history.json"
+    arquivo_json.write_text(json.dumps(entradas, indent=2), encoding="utf-8")
+
+    return (
+        _tempo(lambda: banco.registrar(_entrada(runs))),
+        _tempo(lambda: _registrar_json(arquivo_json, _entrada(runs))),
+        _tempo(lambda: (banco.consultar(pagina=0), banco.melhor_andar_por_classe())),
+        _tempo(lambda: list(reversed(json.loads(arquivo_json.read_text(encoding="utf-8"))))[:20]),
+        _tempo(lambda: _ranking(banco)),
+    )
+
+
+def main() -> None:
+    """Roda o benchmark e imprime uma tabela simples."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    cabecalho = (
+        "runs",
+        "sqlite reg (ms)",
+        "json reg (ms)",
+        "sqlite tela (ms)",
+        "json tela (ms)",
+        "ranking (ms)",
+    )
+    print("{:>7} {:>16} {:>14} {:>17} {:>15} {:>13}".format(*cabecalho))
+    for runs in args.runs:
+        with tempfile.TemporaryDirectory() as diretorio:
+            tempos = _medir(runs, Path(diretorio))
+        reg_sqlite, reg_json, tela_sqlite, tela_json, ranking = (tempo * 1000 for tempo in tempos)
+        print(
+            f"{runs:>7} {reg_sqlite:>16.2f} {reg_json:>14.2f} "
+            f"{tela_sqlite:>17.2f} {tela_json:>15.2f} {ranking:>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Mede memória e tempo de geração do mapa compacto contra a grade `list[list[Sala]]`.
+
+Uso (na raiz do repositório):
+
+    python -m benchmarks.bench_mapa
+    python -m benchmarks.bench_mapa --tamanhos 10 128 256 512 --repeticoes 5
+
+A coluna `us/sala` mostra o custo por sala criada: ela se mantém estável quando a
+geração escala linearmente com o número de salas. A grade legada só é medida até
+`--limite-legado` (padrão 100): em 1000x1000 ela alocaria um milhão de `Sala` e
+passa de um gigabyte.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from src import config
+from src.gerador_mapa import gerar_mapa
+from src.mapa_compacto import MapaCompacto, criar_parede
+
+
+def _medir(funcao: Callable[[], Any], repeticoes: int) -> tuple[float, int]:
+    """Retorna (melhor tempo em segundos, pico de memória em bytes)."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    tracemalloc.start()
+    resultado = funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resultado
+    return melhor, pico
+
+
+def _grade_legada(tamanho: int) -> list[list[Any]]:
+    """Reproduz só a alocação de paredes da grade antiga (uma Sala por célula)."""
+    return [[criar_parede() for _ in range(tamanho)] for _ in range(tamanho)]
+
+
+def main() -> None:
+    """Roda o benchmark e imprime uma tabela simples."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--tamanhos", type=int, nargs="+", default=[10, 64, 100, 128, 256, 512, 1000]
+    )
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--limite-legado", type=int, default=100)
+    args = parser.parse_args()
+
+    cabecalho = ("tamanho", "salas", "gerar (ms)", "us/sala", "pico (KiB)", "legado (KiB)")
+    print("{:>8} {:>8} {:>12} {:>9} {:>12} {:>14}".format(*cabecalho))
+    for tamanho in args.tamanhos:
+
+        def gerar(t: int = tamanho) -> MapaCompacto:
+            perfil = config.DIFICULDADES["normal"]
+            return gerar_mapa(5, perfil, rng=random.Random(1), largura=t, altura=t)
+
+        tempo, pico = _medir(gerar, args.repeticoes)
+        salas = gerar().quantidade_salas
+        legado = "-"
+        if tamanho <= args.limite_legado:
+            _, pico_legado = _medir(lambda t=tamanho: _grade_legada(t), 1)
+            legado = f"{pico_legado / 1024:.0f}"
+        print(
+            f"{tamanho:>8} {salas:>8} {tempo * 1000:>12.1f} {tempo * 1e6 / salas:>9.1f} "
+            f"{pico / 1024:>12.0f} {legado:>14}"
+        )
+
+
+if __name__ == "__main__":
+    main()
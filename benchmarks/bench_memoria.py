@@ -0,0 +1,126 @@
+"""Mede com `tracemalloc` a memória das entidades com `__slots__` contra dataclasses comuns.
+
+Uso (na raiz do repositório):
+
+    python -m benchmarks.bench_memoria
+    python -m benchmarks.bench_memoria --tamanhos 50 100 200 --itens 1000 10000
+
+Para cada andar `tamanho x tamanho`, mede a memória retida pelas salas (e inimigos)
+reais do mapa; para o inventário, a de `itens` itens do catálogo. A coluna `sem slots`
+constrói os mesmos objetos, a partir dos mesmos dicionários, com cópias das classes
+geradas sem `__slots__` (o layout anterior, com `__dict__` por instância).
+
+A segunda tabela compara o inventário antigo (uma cópia de `Item` por drop, numa lista)
+com o `Inventario` em pilhas que referencia os protótipos compartilhados do catálogo.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import MISSING, Field, field, fields, make_dataclass
+from itertools import cycle, islice
+from typing import Any
+
+from src import config
+from src.entidades import Inimigo, Inventario, Item, Sala
+from src.gerador_itens import obter_item_por_nome, obter_itens_por_raridade
+from src.gerador_mapa import gerar_mapa
+
+
+def _sem_slots(cls: type) -> type:
+    """Recria a dataclass com os mesmos campos e padrões, mas sem `__slots__`."""
+
+    def _copiar(campo: Field[Any]) -> Field[Any]:
+        if campo.default is not MISSING:
+            return field(default=campo.default)
+        if campo.default_factory is not MISSING:
+            return field(default_factory=campo.default_factory)
+        return field()
+
+    return make_dataclass(
+        f"{cls.__name__}SemSlots",
+        [(campo.name, campo.type, _copiar(campo)) for campo in fields(cls)],
+    )
+
+
+def _memoria_retida(construir: Callable[[], object]) -> int:
+    """Bytes ainda alocados logo após `construir()`, com o resultado vivo."""
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    objetos = construir()
+    retida = tracemalloc.get_traced_memory()[0] - antes
+    tracemalloc.stop()
+    del objetos
+    return retida
+
+
+def _salas(dados: list[dict[str, Any]], cls_sala: type, cls_inimigo: type) -> list[object]:
+    return [
+        cls_sala(
+            **{
+                **sala,
+                "inimigo_atual": cls_inimigo(**sala["inimigo_atual"])
+                if sala["inimigo_atual"]
+                else None,
+            }
+        )
+        for sala in dados
+    ]
+
+
+def _linha(rotulo: str, antes: int, depois: int) -> str:
+    return f"{rotulo:<24} {antes / 1024:>14.1f} {depois / 1024:>14.1f} {1 - depois / antes:>10.0%}"
+
+
+def main() -> None:
+    """Roda o benchmark e imprime uma tabela simples."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--itens", type=int, nargs="+", default=[1000])
+    args = parser.parse_args()
+
+    sala_sem_slots, inimigo_sem_slots = _sem_slots(Sala), _sem_slots(Inimigo)
+    item_sem_slots = _sem_slots(Item)
+
+    print("{:<24} {:>14} {:>14} {:>10}".format("caso", "sem slots KiB", "slots KiB", "redução"))
+    for tamanho in args.tamanhos:
+        mapa = gerar_mapa(
+            3,
+            config.DIFICULDADES["dificil"],
+            rng=random.Random(11),
+            largura=tamanho,
+            altura=tamanho,
+        )
+        dados = [sala.to_dict() for _, _, sala in mapa.salas()]
+        antes = _memoria_retida(lambda d=dados: _salas(d, sala_sem_slots, inimigo_sem_slots))
+        depois = _memoria_retida(lambda d=dados: _salas(d, Sala, Inimigo))
+        print(_linha(f"mapa {tamanho}x{tamanho} ({len(dados)} salas)", antes, depois))
+
+    catalogo = [
+        Item.from_dict(item).to_dict()
+        for itens in obter_itens_por_raridade().values()
+        for item in itens
+    ]
+    for quantidade in args.itens:
+        dados_itens = list(islice(cycle(catalogo), quantidade))
+        antes = _memoria_retida(lambda d=dados_itens: [item_sem_slots(**item) for item in d])
+        depois = _memoria_retida(lambda d=dados_itens: [Item(**item) for item in d])
+        print(_linha(f"inventário {quantidade} itens", antes, depois))
+
+    print()
+    print("{:<24} {:>14} {:>14} {:>10}".format("caso", "cópias KiB", "pilhas KiB", "redução"))
+    for quantidade in args.itens:
+        dados_itens = list(islice(cycle(catalogo), quantidade))
+        drops = [obter_item_por_nome(item["nome"]) or Item(**item) for item in dados_itens]
+        antes = _memoria_retida(lambda d=dados_itens: [Item.from_dict(item) for item in d])
+        depois = _memoria_retida(lambda d=drops: Inventario(d))
+        print(_linha(f"inventário {quantidade} itens", antes, depois))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Compara tamanho e tempo de carga do `rng_state` compacto contra o formato em listas.
+
+Uso (na raiz do repositório):
+
+    python -m benchmarks.bench_rng
+    python -m benchmarks.bench_rng --sorteios 100 10000 100000 --repeticoes 50
+
+Cada linha consome `sorteios` chamadas de `random()` em todos os fluxos da run e mede
+o JSON do estado e o tempo de `json.loads` + `restaurar_rng`. A coluna `listas` é o
+formato anterior (estado completo do Mersenne Twister como listas aninhadas).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from src.aleatoriedade import FLUXOS_RNG, FORMATO_FLUXOS_LISTAS, criar_rng, restaurar_rng
+from src.aleatoriedade import serializar_estado_rng as serializar
+
+SEED = 20240601
+
+
+def _estado_em_listas(estado: object) -> object:
+    if isinstance(estado, tuple | list):
+        return [_estado_em_listas(item) for item in estado]
+    return estado
+
+
+def _medir_carga(texto: str, repeticoes: int) -> float:
+    """Retorna o melhor tempo (segundos) de desserializar e restaurar o estado."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        restaurar_rng(SEED, json.loads(texto))
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main() -> None:
+    """Roda o benchmark e imprime uma tabela simples."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sorteios", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    cabecalho = ("sorteios", "compacto (B)", "listas (B)", "carga (ms)", "listas (ms)")
+    print("{:>9} {:>13} {:>11} {:>11} {:>12}".format(*cabecalho))
+    for sorteios in args.sorteios:
+        _, rng = criar_rng(SEED)
+        for nome in FLUXOS_RNG:
+            fluxo = rng.fluxo(nome)
+            for _ in range(sorteios):
+                fluxo.random()
+        compacto = json.dumps(serializar(rng))
+        listas = json.dumps(
+            {
+                "formato": FORMATO_FLUXOS_LISTAS,
+                "raiz": _estado_em_listas(rng.getstate()),
+                "fluxos": {
+                    nome: _estado_em_listas(rng.fluxo(nome).getstate()) for nome in FLUXOS_RNG
+                },
+            }
+        )
+        carga = _medir_carga(compacto, args.repeticoes)
+        carga_listas = _medir_carga(listas, args.repeticoes)
+        print(
+            f"{sorteios:>9} {len(compacto):>13} {len(listas):>11} "
+            f"{carga * 1000:>11.3f} {carga_listas * 1000:>12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
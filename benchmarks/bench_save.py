@@ -0,0 +1,76 @@
+"""Mede o carregamento de saves com mapas grandes (parse, migração e validação).
+
+Uso (na raiz do repositório):
+
+    python -m benchmarks.bench_save
+    python -m benchmarks.bench_save --tamanhos 64 256 512 --repeticoes 5
+
+Cada linha gera um andar `tamanho x tamanho`, grava o save num diretório temporário e
+mede `carregar_jogo`. A coluna `deepcopy (ms)` é o custo que a migração antiga pagava
+em todo carregamento, copiando o save inteiro mesmo sem nada a migrar.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import random
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from jogo import serializar_mapa
+from src import armazenamento, config
+from src.gerador_mapa import gerar_mapa
+
+
+def _melhor_tempo(funcao: Callable[[], object], repeticoes: int) -> float:
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main() -> None:
+    """Roda o benchmark e imprime uma tabela simples."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[32, 128, 256, 512])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        armazenamento._DIRETORIO_SALVAMENTO = Path(diretorio)
+        armazenamento._ARQUIVO_SALVAMENTO = Path(diretorio) / "save.json"
+
+        cabecalho = ("tamanho", "save (KiB)", "carregar (ms)", "deepcopy (ms)")
+        print("{:>8} {:>11} {:>14} {:>14}".format(*cabecalho))
+        for tamanho in args.tamanhos:
+            mapa = gerar_mapa(
+                3,
+                config.DIFICULDADES["normal"],
+                rng=random.Random(1),
+                largura=tamanho,
+                altura=tamanho,
+            )
+            estado = {
+                "jogador": {"nome": "Bench", "classe": "Guerreiro", "nivel": 3},
+                "mapa": serializar_mapa(mapa),
+                "nivel_masmorra": 3,
+            }
+            caminho = armazenamento.salvar_jogo(estado, slot_id=1)
+            conteudo = json.loads(caminho.read_text(encoding="utf-8"))
+
+            carregar = _melhor_tempo(lambda: armazenamento.carregar_jogo(1), args.repeticoes)
+            copiar = _melhor_tempo(lambda c=conteudo: copy.deepcopy(c), args.repeticoes)
+            print(
+                f"{tamanho:>8} {caminho.stat().st_size / 1024:>11.0f} "
+                f"{carregar * 1000:>14.1f} {copiar * 1000:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Compara os `to_dict`/`from_dict` escritos à mão com a versão baseada em `asdict`.
+
+Uso (na raiz do repositório):
+
+    python -m benchmarks.bench_serializacao
+    python -m benchmarks.bench_serializacao --tamanho 200 --repeticoes 5
+
+Gera um andar `tamanho x tamanho` (padrão 100x100, com inimigos nas salas) e mede a
+ida e volta de todas as células pela grade de dicionários (`to_dict` + `from_dict`) e
+pelo codec do save (`serializar_mapa` + `hidratar_mapa`). A coluna `asdict` roda as
+mesmas operações com a implementação anterior: `dataclasses.asdict` e `setdefault`
+campo a campo.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict
+from typing import Any
+
+from jogo import hidratar_mapa, serializar_mapa
+from src import config
+from src.entidades import PADROES_SALA, Inimigo, Sala
+from src.gerador_mapa import gerar_mapa
+from src.mapa_compacto import Mapa
+
+
+def _sala_to_dict_asdict(sala: Sala) -> dict[str, Any]:
+    data = asdict(sala)
+    if sala.inimigo_atual:
+        data["inimigo_atual"] = asdict(sala.inimigo_atual)
+    return data
+
+
+def _sala_from_dict_setdefault(data: dict[str, Any]) -> Sala:
+    payload = data.copy()
+    inimigo_raw = payload.get("inimigo_atual")
+    if isinstance(inimigo_raw, dict):
+        inimigo = inimigo_raw.copy()
+        inimigo.setdefault("drop_item_nome", None)
+        payload["inimigo_atual"] = Inimigo(**inimigo)
+    else:
+        payload["inimigo_atual"] = None
+    for campo, padrao in PADROES_SALA.items():
+        payload.setdefault(campo, padrao)
+    return Sala(**payload)
+
+
+@contextmanager
+def _serializadores_asdict() -> Iterator[None]:
+    """Troca temporariamente os métodos de `Sala` pela implementação anterior."""
+    to_dict, from_dict = Sala.to_dict, Sala.__dict__["from_dict"]
+    Sala.to_dict = _sala_to_dict_asdict  # type: ignore[method-assign]
+    Sala.from_dict = staticmethod(_sala_from_dict_setdefault)  # type: ignore[method-assign,assignment]
+    try:
+        yield
+    finally:
+        Sala.to_dict = to_dict  # type: ignore[method-assign]
+        Sala.from_dict = from_dict  # type: ignore[method-assign]
+
+
+def _melhor_tempo(funcao: Callable[[], object], repeticoes: int) -> float:
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def _ida_e_volta_grade(mapa: Mapa) -> None:
+    for linha in mapa:
+        for sala in linha:
+            Sala.from_dict(sala.to_dict())
+
+
+def main() -> None:
+    """Roda o benchmark e imprime uma tabela simples."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanho", type=int, default=100)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    mapa = gerar_mapa(
+        3,
+        config.DIFICULDADES["dificil"],
+        rng=random.Random(5),
+        largura=args.tamanho,
+        altura=args.tamanho,
+    )
+    casos: dict[str, Callable[[], object]] = {
+        "grade (to_dict + from_dict)": lambda: _ida_e_volta_grade(mapa),
+        "codec (serializar + hidratar)": lambda: hidratar_mapa(serializar_mapa(mapa)),
+    }
+    print(f"andar {args.tamanho}x{args.tamanho}")
+    print("{:<30} {:>13} {:>12} {:>9}".format("ida e volta", "asdict (ms)", "manual (ms)", "ganho"))
+    for nome, funcao in casos.items():
+        with _serializadores_asdict():
+            antes = _melhor_tempo(funcao, args.repeticoes)
+        depois = _melhor_tempo(funcao, args.repeticoes)
+        print(f"{nome:<30} {antes * 1000:>13.1f} {depois * 1000:>12.1f} {antes / depois:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
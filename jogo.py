@@ -1,24 +1,33 @@
+import argparse
 import random
 import sys
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum, auto
+from functools import partial
 from typing import Any
 
 from src import config
-from src.aleatoriedade import restaurar_rng, serializar_estado_rng
+from src.aleatoriedade import EstadoRNG, fluxo_rng, restaurar_rng, serializar_estado_rng
 from src.armazenamento import (
     ErroCarregamento,
+    EstadoJogo,
     SaveInfo,
     carregar_jogo,
     listar_saves,
     proximo_slot_disponivel,
     registrar_historico,
-    salvar_jogo,
 )
-from src.atualizador import AtualizacaoInfo, carregar_preferencias, verificar_atualizacao
-from src.combate import iniciar_combate
+from src.atualizador import AtualizacaoInfo, servico_preferencias, verificar_atualizacao
+from src.autosave import MOTIVO_DESCIDA, PoliticaAutosave
+from src.codec_mapa import MapaSerializado, codificar_mapa, decodificar_mapa, mapa_codificado
+from src.combate import (
+    auto_resolver_ativo,
+    combate_trivial,
+    iniciar_combate,
+    resolver_combate_automatico,
+)
 from src.entidades import Inimigo, Item, Personagem, Sala
 from src.erros import ErroDadosError
 from src.estados import (
@@ -58,8 +67,13 @@ from src.estados import (
     usar_item as usar_item_estado,
 )
 from src.gerador_itens import gerar_item_aleatorio, obter_item_por_nome
+from src.gerador_mapa import validar_dimensoes_mapa
+from src.gravador_saves import GravadorSaves
+from src.mapa_compacto import Mapa, MapaCompacto, iterar_salas
 from src.personagem import criar_personagem, obter_classes
 from src.personagem_utils import aplicar_bonus_equipamento, consumir_status_temporarios
+from src.pregeracao import PreGeradorAndares
+from src.relogio import Relogio, RelogioReal
 from src.tramas import (
     TramaAtiva,
     obter_trama_config,
@@ -87,7 +101,6 @@ from src.ui_helpers import TutorialEstado
 from src.ui_resumo import desenhar_tela_resumo_final
 from src.version import __version__
 
-Mapa = list[list[Sala]]
 EffectHandler = Callable[[Personagem, int], str]
 
 # Retrocompatibilidade para os testes que importam direto de jogo.py
@@ -138,6 +151,9 @@ class ContextoJogo:
     info_atualizacao: AtualizacaoInfo | None = None
     alerta_atualizacao_exibido: bool = False
     dificuldade: str = config.DIFICULDADE_PADRAO
+    tamanho_mapa_novas_runs: tuple[int, int] = (config.MAP_WIDTH, config.MAP_HEIGHT)
+    largura_mapa: int = field(init=False)
+    altura_mapa: int = field(init=False)
     estatisticas_andar: dict[str, int] = field(default_factory=_nova_estatistica_andar)
     estatisticas_total: dict[str, int] = field(default_factory=_nova_estatistica_total)
     tutorial: TutorialEstado = field(default_factory=TutorialEstado)
@@ -146,11 +162,18 @@ class ContextoJogo:
     trama_consequencia_resumo: str | None = None
     seed_run: int | None = None
     rng: random.Random = field(default_factory=random.Random, repr=False)
+    relogio: Relogio = field(default_factory=RelogioReal, repr=False)
+    pregerador: PreGeradorAndares = field(default_factory=PreGeradorAndares, repr=False)
+    gravador: GravadorSaves = field(default_factory=GravadorSaves, repr=False)
+    autosave: PoliticaAutosave = field(default_factory=PoliticaAutosave, repr=False)
     chefe_mais_profundo_nivel: int = 0
     chefe_mais_profundo_nome: str | None = None
     inimigo_causa_morte: str | None = None
     turnos_totais: int = 0
 
+    def __post_init__(self) -> None:
+        self.largura_mapa, self.altura_mapa = self.tamanho_mapa_novas_runs
+
     def limpar_combate(self) -> None:
         """Remove referências ao combate atual."""
         self.sala_em_combate = None
@@ -177,17 +200,20 @@ class ContextoJogo:
         self.trama_consequencia_resumo = None
         self.seed_run = None
         self.rng = random.Random()
+        self.pregerador.descartar()
+        self.largura_mapa, self.altura_mapa = self.tamanho_mapa_novas_runs
         self.chefe_mais_profundo_nivel = 0
         self.chefe_mais_profundo_nome = None
         self.inimigo_causa_morte = None
         self.turnos_totais = 0
+        self.autosave.reiniciar()
 
     def inicializar_rng(
         self,
         seed: int | None = None,
-        estado_serializado: list[Any] | None = None,
+        estado_serializado: EstadoRNG = None,
     ) -> None:
-        """Inicializa ou restaura o RNG isolado da run."""
+        """Inicializa ou restaura o RNG isolado da run (raiz e fluxos por subsistema)."""
         self.seed_run, self.rng = restaurar_rng(seed, estado_serializado)
 
     def obter_perfil_dificuldade(self) -> config.DificuldadePerfil:
@@ -206,6 +232,16 @@ class ContextoJogo:
             chave_normalizada = config.DIFICULDADE_PADRAO
         self.dificuldade = chave_normalizada
 
+    def definir_tamanho_mapa(self, largura: object, altura: object) -> None:
+        """Define o tamanho dos andares da run carregada; rejeita valores corrompidos."""
+        if not isinstance(largura, int) or not isinstance(altura, int):
+            raise ErroCarregamento(f"Tamanho de mapa inválido no save: {largura!r}x{altura!r}.")
+        try:
+            validar_dimensoes_mapa(largura, altura)
+        except ValueError as erro:
+            raise ErroCarregamento(f"Tamanho de mapa inválido no save: {erro}") from erro
+        self.largura_mapa, self.altura_mapa = largura, altura
+
     def resetar_estatisticas(self) -> None:
         """Limpa as estatísticas acumuladas do andar atual."""
         self.estatisticas_andar = _nova_estatistica_andar()
@@ -321,11 +357,10 @@ def selecionar_dificuldade(contexto: ContextoJogo) -> None:
 
 def _posicionar_na_entrada(jogador: Personagem, mapa: Mapa) -> None:
     """Posiciona o jogador na entrada (usado ao gerar um mapa novo)."""
-    for y_idx, linha in enumerate(mapa):
-        for x_idx, sala in enumerate(linha):
-            if sala.tipo == "entrada":
-                jogador.x, jogador.y = x_idx, y_idx
-                return
+    for x_idx, y_idx, sala in iterar_salas(mapa):
+        if sala.tipo == "entrada":
+            jogador.x, jogador.y = x_idx, y_idx
+            return
 
 
 def _salvar_slot_contexto(contexto: ContextoJogo, slot: str | None) -> None:
@@ -372,10 +407,13 @@ def _selecionar_slot(novo_jogo: bool, saves: list[SaveInfo]) -> str | None:
 
 def executar_estado_menu(contexto: ContextoJogo) -> Estado:
     """Renderiza o menu e decide o próximo estado."""
+    # O menu é o ponto de revalidação: grava pendências e capta edições externas
+    # do settings.json com um único `stat`, sem I/O nos caminhos quentes do jogo.
+    preferencias = servico_preferencias()
+    preferencias.revalidar()
     # Carrega preferências (inclui tutorial) só na primeira passagem.
     if not contexto.tutorial.vistos:
-        prefs = carregar_preferencias()
-        contexto.tutorial.ativo = bool(prefs.get("tutorial_enabled", True))
+        contexto.tutorial.ativo = bool(preferencias.valor("tutorial_enabled", True))
 
     if not contexto.atualizacao_notificada:
         info = verificar_atualizacao()
@@ -385,6 +423,8 @@ def executar_estado_menu(contexto: ContextoJogo) -> Estado:
             if not contexto.alerta_atualizacao_exibido:
                 _mostrar_aviso_atualizacao(info)
                 contexto.alerta_atualizacao_exibido = True
+    # Saves ainda na fila precisam chegar ao disco antes de listar ou carregar slots.
+    contexto.gravador.aguardar()
     saves_disponiveis = listar_saves()
     tem_save = bool(saves_disponiveis)
     alerta = None
@@ -435,6 +475,10 @@ def executar_estado_menu(contexto: ContextoJogo) -> Estado:
             nivel_masmorra = estado_salvo.get("nivel_masmorra")
             if not all([jogador_data, mapa_salvo, isinstance(nivel_masmorra, int)]):
                 raise ErroCarregamento("Arquivo de save inválido ou corrompido.")
+            contexto.definir_tamanho_mapa(
+                estado_salvo.get("mapa_largura", config.MAP_WIDTH),
+                estado_salvo.get("mapa_altura", config.MAP_HEIGHT),
+            )
             contexto.definir_dificuldade(estado_salvo.get("dificuldade", config.DIFICULDADE_PADRAO))
             contexto.jogador = Personagem.from_dict(jogador_data)
             contexto.mapa_atual = hidratar_mapa(mapa_salvo)
@@ -456,6 +500,7 @@ def executar_estado_menu(contexto: ContextoJogo) -> Estado:
                 estado_salvo.get("rng_state"),
             )
             contexto.posicao_anterior = None
+            contexto.autosave.reiniciar()
             _salvar_slot_contexto(contexto, slot_escolhido)
             desenhar_tela_evento("JOGO CARREGADO", "Seu progresso foi restaurado!")
             return Estado.EXPLORACAO
@@ -472,12 +517,14 @@ def executar_estado_menu(contexto: ContextoJogo) -> Estado:
 def executar_estado_criacao(contexto: ContextoJogo) -> Estado:
     """Cria um personagem novo e segue para exploração."""
     selecionar_dificuldade(contexto)
+    # Um save carregado antes pode ter deixado outro tamanho no contexto.
+    contexto.largura_mapa, contexto.altura_mapa = contexto.tamanho_mapa_novas_runs
     contexto.inicializar_rng()
     jogador = processo_criacao_personagem(contexto.rng)
     contexto.jogador = jogador
     contexto.trama_ativa = sortear_trama_para_motivacao(
         jogador.motivacao.id if jogador.motivacao else None,
-        rng=contexto.rng,
+        rng=fluxo_rng(contexto.rng, "tramas"),
     )
     contexto.trama_pistas_exibidas.clear()
     contexto.trama_consequencia_resumo = None
@@ -510,7 +557,7 @@ def _aplicar_consequencia_trama(contexto: ContextoJogo, sala: Sala, desfecho: st
     if not consequencias:
         return
 
-    consequencia = contexto.rng.choice(list(consequencias))
+    consequencia = fluxo_rng(contexto.rng, "tramas").choice(list(consequencias))
     tipo = str(consequencia.get("tipo", "")).lower()
     jogador = contexto.jogador
     mensagens: list[str] = []
@@ -638,6 +685,37 @@ def _narrar_descida_andar(contexto: ContextoJogo, proximo_andar: int) -> str:
     )
 
 
+def _montar_estado_save(contexto: ContextoJogo, jogador: Personagem, mapa: Mapa) -> EstadoJogo:
+    """Monta o estado salvo da run (dicionários novos, seguros para a thread do gravador)."""
+    return {
+        "jogador": jogador.to_dict(),
+        "mapa": serializar_mapa(mapa),
+        "nivel_masmorra": contexto.nivel_masmorra,
+        "dificuldade": contexto.dificuldade,
+        "mapa_largura": contexto.largura_mapa,
+        "mapa_altura": contexto.altura_mapa,
+        "trama_ativa": (contexto.trama_ativa.to_dict() if contexto.trama_ativa else None),
+        "trama_pistas_exibidas": sorted(contexto.trama_pistas_exibidas),
+        "trama_consequencia_resumo": contexto.trama_consequencia_resumo,
+        "seed_run": contexto.seed_run,
+        "rng_state": serializar_estado_rng(contexto.rng),
+    }
+
+
+def _verificar_autosave(contexto: ContextoJogo, jogador: Personagem, mapa: Mapa) -> None:
+    """Agenda um autosave se algum gatilho disparou e o orçamento de I/O permite."""
+    turno = contexto.turnos_totais
+    motivo = contexto.autosave.proximo_motivo(turno)
+    if motivo is None:
+        return
+    contexto.gravador.agendar(
+        _montar_estado_save(contexto, jogador, mapa),
+        contexto.slot_atual,
+        incremental=True,
+        ao_concluir=partial(contexto.autosave.registrar, motivo, turno),
+    )
+
+
 def executar_estado_exploracao(contexto: ContextoJogo) -> Estado:
     """Executa um ciclo de exploração e retorna o próximo estado."""
     jogador = contexto.jogador
@@ -707,6 +785,7 @@ def executar_estado_exploracao(contexto: ContextoJogo) -> Estado:
                 "A escada está bloqueada. Derrote o chefe para prosseguir.",
             )
 
+    _verificar_autosave(contexto, jogador, mapa)
     opcoes.extend(["Ver Ficha do Personagem", "Ver Inventário", "Salvar jogo", "Sair da masmorra"])
     escolha_str = desenhar_hud_exploracao(
         jogador,
@@ -715,6 +794,7 @@ def executar_estado_exploracao(contexto: ContextoJogo) -> Estado:
         contexto.nivel_masmorra,
         contexto.obter_perfil_dificuldade().nome,
         contexto.mapa_atual,
+        contexto.gravador.status_para_hud(),
     )
 
     def _executar_acao(acao_escolhida: str, posicao_atual: tuple[int, int]) -> Estado:
@@ -753,6 +833,7 @@ def executar_estado_exploracao(contexto: ContextoJogo) -> Estado:
             contexto.mapa_atual = None
             contexto.posicao_anterior = None
             contexto.resetar_estatisticas()
+            contexto.autosave.marcar(MOTIVO_DESCIDA)
             contexto.turnos_totais += 1
             return Estado.EXPLORACAO
         if acao_escolhida == "Ver Ficha do Personagem":
@@ -763,22 +844,10 @@ def executar_estado_exploracao(contexto: ContextoJogo) -> Estado:
             contexto.turnos_totais += 1
             return Estado.INVENTARIO
         if acao_escolhida == "Salvar jogo":
-            estado = {
-                "jogador": jogador.to_dict(),
-                "mapa": serializar_mapa(mapa),
-                "nivel_masmorra": contexto.nivel_masmorra,
-                "dificuldade": contexto.dificuldade,
-                "trama_ativa": (contexto.trama_ativa.to_dict() if contexto.trama_ativa else None),
-                "trama_pistas_exibidas": sorted(contexto.trama_pistas_exibidas),
-                "trama_consequencia_resumo": contexto.trama_consequencia_resumo,
-                "seed_run": contexto.seed_run,
-                "rng_state": serializar_estado_rng(contexto.rng),
-            }
-            try:
-                caminho = salvar_jogo(estado, contexto.slot_atual)
-                desenhar_tela_evento("JOGO SALVO", f"Progresso salvo em {caminho}.")
-            except OSError as erro:
-                desenhar_tela_evento("ERRO AO SALVAR", f"Não foi possível salvar: {erro}.")
+            # Serialização, fsync e backup rodam em segundo plano; o HUD mostra o resultado.
+            contexto.gravador.agendar(
+                _montar_estado_save(contexto, jogador, mapa), contexto.slot_atual, incremental=True
+            )
             contexto.turnos_totais += 1
             return Estado.EXPLORACAO
         if acao_escolhida == "Sair da masmorra":
@@ -855,11 +924,11 @@ def executar_estado_combate(contexto: ContextoJogo) -> Estado:
     )
     return executar_estado_combate_mod(
         contexto,
-        lambda jogador, inimigo, usar_item: iniciar_combate(
+        lambda jogador, inimigo, usar_item: _iniciar_combate_contexto(
+            contexto,
             jogador,
             inimigo,
             usar_item,
-            rng=contexto.rng,
         ),
         _usar_item_com_feedback,
         lambda raridade: _gerar_item_para_contexto(contexto, raridade),
@@ -871,6 +940,27 @@ def executar_estado_combate(contexto: ContextoJogo) -> Estado:
     )
 
 
+def _iniciar_combate_contexto(
+    contexto: ContextoJogo,
+    jogador: Personagem,
+    inimigo: Inimigo,
+    usar_item: Callable[[Personagem], bool | None],
+) -> tuple[bool, Inimigo]:
+    """Escolhe entre a auto-resolução de encontros triviais e o combate interativo."""
+    sala = contexto.sala_em_combate
+    eh_chefe = sala is not None and sala.chefe
+    rng = fluxo_rng(contexto.rng, "combate")
+    if not eh_chefe and auto_resolver_ativo() and combate_trivial(jogador, inimigo):
+        return resolver_combate_automatico(
+            jogador,
+            inimigo,
+            rng=rng,
+            usar_item_callback=usar_item,
+            relogio=contexto.relogio,
+        )
+    return iniciar_combate(jogador, inimigo, usar_item, rng=rng, relogio=contexto.relogio)
+
+
 def _mostrar_aviso_atualizacao(
     info: AtualizacaoInfo, titulo: str = "ATUALIZAÇÃO DISPONÍVEL!"
 ) -> None:
@@ -924,6 +1014,7 @@ def _equipar_item_com_bonus(jogador: Personagem) -> None:
 
 def _gerar_item_para_contexto(contexto: ContextoJogo, raridade: str) -> Item | None:
     bonus = contexto.obter_perfil_dificuldade().drop_consumivel_bonus
+    rng = fluxo_rng(contexto.rng, "saque")
     jogador = contexto.jogador
     # Drops guiados para andares iniciais: garantir 1 arma e 1 escudo cedo.
     if jogador and contexto.nivel_masmorra <= 2:
@@ -937,32 +1028,26 @@ def _gerar_item_para_contexto(contexto: ContextoJogo, raridade: str) -> Item | N
         )
         if not possui_arma:
             return obter_item_por_nome("Espada Afiada") or gerar_item_aleatorio(
-                "comum", bonus_consumivel=bonus, rng=contexto.rng
+                "comum", bonus_consumivel=bonus, rng=rng
             )
         if not possui_escudo:
             return obter_item_por_nome("Escudo de Madeira") or gerar_item_aleatorio(
-                "comum", bonus_consumivel=bonus, rng=contexto.rng
+                "comum", bonus_consumivel=bonus, rng=rng
             )
 
-    return gerar_item_aleatorio(raridade, bonus_consumivel=bonus, rng=contexto.rng)
+    return gerar_item_aleatorio(raridade, bonus_consumivel=bonus, rng=rng)
 
 
-def serializar_mapa(mapa: Mapa) -> list[list[dict[str, Any]]]:
-    """Converta o mapa em uma estrutura serializável."""
-    mapa_serializado: list[list[dict[str, Any]]] = []
-    for linha in mapa:
-        nova_linha = [sala.to_dict() for sala in linha]
-        mapa_serializado.append(nova_linha)
-    return mapa_serializado
+def serializar_mapa(mapa: Mapa) -> dict[str, Any]:
+    """Converta o mapa no formato do save (sala padrão, deltas e paredes em run-length)."""
+    return codificar_mapa(mapa)
 
 
-def hidratar_mapa(mapa_serializado: list[list[dict[str, Any]]]) -> Mapa:
-    """Reconstrói as salas do mapa a partir dos dicionários serializados."""
-    mapa_hidratado: Mapa = []
-    for linha in mapa_serializado:
-        nova_linha = [Sala.from_dict(sala) for sala in linha]
-        mapa_hidratado.append(nova_linha)
-    return mapa_hidratado
+def hidratar_mapa(mapa_serializado: MapaSerializado) -> Mapa:
+    """Reconstrói o mapa compacto a partir do codec ou da grade de dicionários antiga."""
+    if mapa_codificado(mapa_serializado):
+        return decodificar_mapa(mapa_serializado)  # type: ignore[arg-type]
+    return MapaCompacto.de_dicts(mapa_serializado)  # type: ignore[arg-type]
 
 
 def verificar_level_up(jogador: Personagem) -> None:
@@ -1041,9 +1126,41 @@ def _executar_loop_principal(contexto: ContextoJogo, estado_inicial: Estado = Es
             return
 
 
-def main() -> None:
+def _tamanho_mapa_cli(valor: str) -> tuple[int, int]:
+    """Converta `LARGURAxALTURA` da linha de comando, validando os limites do gerador."""
+    largura_txt, separador, altura_txt = valor.lower().partition("x")
+    if not separador or not largura_txt.isdigit() or not altura_txt.isdigit():
+        raise argparse.ArgumentTypeError(
+            f"use LARGURAxALTURA, por exemplo 64x32 (recebido: {valor})"
+        )
+    largura, altura = int(largura_txt), int(altura_txt)
+    try:
+        validar_dimensoes_mapa(largura, altura)
+    except ValueError as erro:
+        raise argparse.ArgumentTypeError(str(erro)) from erro
+    return largura, altura
+
+
+def _ler_argumentos(argv: list[str] | None = None) -> argparse.Namespace:
+    """Lê as opções de linha de comando do jogo."""
+    parser = argparse.ArgumentParser(description="RPG de masmorra em terminal.")
+    parser.add_argument(
+        "--mapa",
+        type=_tamanho_mapa_cli,
+        default=(config.MAP_WIDTH, config.MAP_HEIGHT),
+        metavar="LARGURAxALTURA",
+        help=(
+            f"tamanho dos andares nas novas runs (padrão {config.MAP_WIDTH}x{config.MAP_HEIGHT}, "
+            f"limites {config.MAP_TAMANHO_MIN}..{config.MAP_TAMANHO_MAX})"
+        ),
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
     """Função principal do jogo."""
-    contexto = ContextoJogo()
+    argumentos = _ler_argumentos(argv)
+    contexto = ContextoJogo(tamanho_mapa_novas_runs=argumentos.mapa)
     try:
         if config.UI_TELA_ALTERNATIVA and sys.stdout.isatty():
             with console.screen(hide_cursor=False):
@@ -1057,6 +1174,10 @@ def main() -> None:
     except ErroDadosError as erro:
         desenhar_tela_saida("ERRO DE DADOS", str(erro))
         sys.exit(1)
+    finally:
+        contexto.pregerador.encerrar()
+        contexto.gravador.encerrar()
+        servico_preferencias().gravar()
 
 
 if __name__ == "__main__":
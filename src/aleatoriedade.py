@@ -1,11 +1,223 @@
-"""Utilitários para seed por run e serialização segura do estado do RNG."""
+"""Utilitários para seed por run e serialização segura do estado do RNG.
+
+O estado de cada fluxo vai para o save na forma compacta: como todo fluxo nasce de
+uma seed conhecida e conta as palavras de 32 bits que consome, basta guardar o
+contador e, ao carregar, avançar um RNG novo até o mesmo ponto, qualquer que seja o
+tamanho da run. Quando a origem não é conhecida (estado aplicado com `setstate`) ou há
+um `gauss` pendente, o estado do Mersenne Twister é empacotado em base64.
+"""
 
 from __future__ import annotations
 
+import base64
+import hashlib
 import random
+import struct
 
 _SEED_MAX = 2**63 - 1
-type EstadoRNG = int | float | str | bool | None | list["EstadoRNG"]
+FORMATO_FLUXOS = "fluxos-v2"
+FORMATO_FLUXOS_LISTAS = "fluxos-v1"
+_PALAVRAS_MT = 624
+_ESTRUTURA_MT = struct.Struct(f"<{_PALAVRAS_MT + 1}I")
+_ESTRUTURA_GAUSS = struct.Struct("<d")
+# Métodos em C chamados direto nas sobrescritas de `FluxoContado` (sem o custo de `super()`).
+_RANDOM = random.Random.random
+_GETRANDBITS = random.Random.getrandbits
+FLUXOS_RNG = ("mapa", "combate", "saque", "eventos", "tramas")
+type EstadoRNG = int | float | str | bool | None | list["EstadoRNG"] | dict[str, "EstadoRNG"]
+
+
+def derivar_seed(seed_run: int, rotulo: str) -> int:
+    """Deriva uma seed estável e independente de `seed_run` para o `rotulo` informado."""
+    digest = hashlib.blake2b(f"{seed_run}:{rotulo}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") or 1
+
+
+class FluxoContado(random.Random):
+    """`random.Random` nascido de `seed_origem` que conta as palavras de 32 bits consumidas.
+
+    Todo sorteio passa por `random()` (2 palavras) ou `getrandbits(k)` (⌈k/32⌉ palavras),
+    inclusive `randint`, `choice`, `shuffle` e `gauss`, então o contador é exato. Um
+    `setstate` ou uma `seed` diferente tiram a origem conhecida do fluxo.
+    """
+
+    # Slots deixam o incremento do contador barato no caminho quente de cada sorteio.
+    __slots__ = ("origem_conhecida", "palavras", "seed_origem")
+
+    def __init__(self, seed_origem: int) -> None:
+        self.seed_origem = seed_origem
+        self.palavras = 0
+        self.origem_conhecida = True
+        super().__init__(seed_origem)
+
+    def seed(
+        self, a: int | float | str | bytes | bytearray | None = None, version: int = 2
+    ) -> None:
+        """Reinicia o gerador; a contagem só continua válida para a seed de origem."""
+        super().seed(a, version)
+        self.palavras = 0
+        self.origem_conhecida = a == self.seed_origem
+
+    def setstate(self, state: tuple[object, ...]) -> None:
+        """Aplica um estado arbitrário; a partir daqui o contador não vale mais."""
+        super().setstate(state)
+        self.origem_conhecida = False
+
+    def random(self) -> float:
+        """Sorteia um float em [0, 1), consumindo duas palavras."""
+        self.palavras += 2
+        return _RANDOM(self)
+
+    def getrandbits(self, k: int) -> int:
+        """Sorteia `k` bits, consumindo ⌈k/32⌉ palavras."""
+        bits = _GETRANDBITS(self, k)
+        self.palavras += (k + 31) // 32
+        return bits
+
+    def compactar(self) -> int | str:
+        """Retorna as palavras consumidas ou, sem origem conhecida, o estado empacotado."""
+        if self.origem_conhecida and self.gauss_next is None:
+            return self.palavras
+        return empacotar_estado(self.getstate())
+
+    def restaurar_compacto(self, estado: EstadoRNG) -> None:
+        """Aplica um estado de `compactar` (contador ou base64) ou a lista legada."""
+        if isinstance(estado, bool) or not isinstance(estado, int | str | list):
+            raise ValueError("Estado de fluxo do RNG inválido.")
+        if isinstance(estado, int):
+            self.avancar(estado)
+        elif isinstance(estado, str):
+            self.setstate(desempacotar_estado(estado))
+        else:
+            self.setstate(_lista_para_tupla(estado))  # type: ignore[arg-type]
+
+    def avancar(self, palavras: int) -> None:
+        """Recoloca o fluxo na seed de origem e consome `palavras` palavras de 32 bits."""
+        if palavras < 0:
+            raise ValueError("Contador de palavras do RNG inválido.")
+        self.seed(self.seed_origem)
+        restantes = palavras
+        while restantes:
+            bloco = min(restantes, _PALAVRAS_MT * 16)
+            self.getrandbits(32 * bloco)
+            restantes -= bloco
+
+    def __reduce__(self) -> tuple[object, ...]:
+        return (_reconstruir_fluxo, (self.seed_origem, self.compactar()))
+
+
+class FluxosRNG(FluxoContado):
+    """RNG raiz da run com fluxos independentes por subsistema.
+
+    O próprio objeto continua sendo o fluxo raiz (compatível com `random.Random`); os
+    fluxos nomeados em `FLUXOS_RNG` (mapa, combate, saque, eventos, tramas) nascem sob
+    demanda de seeds derivadas de `seed_run`. Assim, sortear mais itens não muda os
+    combates, e um subsistema pode ser reproduzido sem simular os outros.
+    """
+
+    def __init__(self, seed_run: int) -> None:
+        super().__init__(seed_run)
+        self.seed_run = seed_run
+        self._fluxos: dict[str, FluxoContado] = {}
+
+    def fluxo(self, nome: str) -> random.Random:
+        """Retorna o fluxo do subsistema `nome`, criando-o na primeira vez."""
+        fluxo = self._fluxos.get(nome)
+        if fluxo is None:
+            if nome not in FLUXOS_RNG:
+                raise ValueError(f"Fluxo de RNG desconhecido: {nome!r}.")
+            fluxo = FluxoContado(derivar_seed(self.seed_run, f"fluxo:{nome}"))
+            self._fluxos[nome] = fluxo
+        return fluxo
+
+    @property
+    def mapa(self) -> random.Random:
+        """Fluxo da geração de mapas."""
+        return self.fluxo("mapa")
+
+    @property
+    def combate(self) -> random.Random:
+        """Fluxo de inimigos e da variação de dano."""
+        return self.fluxo("combate")
+
+    @property
+    def saque(self) -> random.Random:
+        """Fluxo de itens e recompensas."""
+        return self.fluxo("saque")
+
+    @property
+    def eventos(self) -> random.Random:
+        """Fluxo dos eventos de sala."""
+        return self.fluxo("eventos")
+
+    @property
+    def tramas(self) -> random.Random:
+        """Fluxo de tramas, pistas e consequências."""
+        return self.fluxo("tramas")
+
+    def serializar(self) -> dict[str, EstadoRNG]:
+        """Estado compacto da raiz e dos fluxos já usados, em estruturas JSON."""
+        return {
+            "formato": FORMATO_FLUXOS,
+            "raiz": self.compactar(),
+            "fluxos": {nome: fluxo.compactar() for nome, fluxo in self._fluxos.items()},
+        }
+
+    def restaurar(self, estado: dict[str, EstadoRNG]) -> None:
+        """Aplica um estado gerado por `serializar` (formato compacto ou em listas)."""
+        self.restaurar_compacto(estado["raiz"])
+        fluxos = estado.get("fluxos") or {}
+        if not isinstance(fluxos, dict):
+            raise ValueError("Estado de fluxos do RNG inválido.")
+        for nome, estado_fluxo in fluxos.items():
+            self.fluxo(nome).restaurar_compacto(estado_fluxo)
+
+    def restaurar_raiz(self, estado: EstadoRNG) -> None:
+        """Aplica ao fluxo raiz um estado isolado (lista legada ou compacto)."""
+        self.restaurar_compacto(estado)
+
+    def __reduce__(self) -> tuple[object, ...]:
+        return (_reconstruir_fluxos, (self.seed_run, self.serializar()))
+
+
+def empacotar_estado(estado: tuple[object, ...]) -> str:
+    """Empacota o estado de um `random.Random` em base64 (2,5 KB em vez de ~7 KB de JSON)."""
+    _, interno, gauss = estado
+    dados = _ESTRUTURA_MT.pack(*interno)  # type: ignore[misc]
+    if gauss is not None:
+        dados += _ESTRUTURA_GAUSS.pack(gauss)
+    return base64.b64encode(dados).decode("ascii")
+
+
+def desempacotar_estado(texto: str) -> tuple[object, ...]:
+    """Reverte `empacotar_estado`, validando o tamanho do estado."""
+    try:
+        dados = base64.b64decode(texto, validate=True)
+    except ValueError as exc:
+        raise ValueError("Estado empacotado do RNG inválido.") from exc
+    tamanho = _ESTRUTURA_MT.size
+    if len(dados) not in (tamanho, tamanho + _ESTRUTURA_GAUSS.size):
+        raise ValueError("Estado empacotado do RNG inválido.")
+    interno = _ESTRUTURA_MT.unpack_from(dados)
+    gauss = _ESTRUTURA_GAUSS.unpack_from(dados, tamanho)[0] if len(dados) > tamanho else None
+    return (3, interno, gauss)
+
+
+def fluxo_rng(rng: random.Random, nome: str) -> random.Random:
+    """Retorna o fluxo `nome` de um `FluxosRNG`; outros RNGs são usados como estão."""
+    return rng.fluxo(nome) if isinstance(rng, FluxosRNG) else rng
+
+
+def _reconstruir_fluxo(seed_origem: int, estado: EstadoRNG) -> FluxoContado:
+    fluxo = FluxoContado(seed_origem)
+    fluxo.restaurar_compacto(estado)
+    return fluxo
+
+
+def _reconstruir_fluxos(seed_run: int, estado: dict[str, EstadoRNG]) -> FluxosRNG:
+    rng = FluxosRNG(seed_run)
+    rng.restaurar(estado)
+    return rng
 
 
 def gerar_seed() -> int:
@@ -13,26 +225,46 @@ def gerar_seed() -> int:
     return random.SystemRandom().randrange(1, _SEED_MAX)
 
 
-def criar_rng(seed: int | None = None) -> tuple[int, random.Random]:
-    """Cria um RNG isolado para a run a partir da seed informada ou gerada."""
+def criar_rng(seed: int | None = None) -> tuple[int, FluxosRNG]:
+    """Cria o RNG isolado da run (com fluxos por subsistema) a partir da seed."""
     seed_normalizada = _normalizar_seed(seed)
-    return seed_normalizada, random.Random(seed_normalizada)
+    return seed_normalizada, FluxosRNG(seed_normalizada)
+
+
+def derivar_seed_andar(seed_run: int, nivel: int) -> int:
+    """Deriva uma seed estável e independente para gerar o andar `nivel` da run.
+
+    O andar passa a depender só de `seed_run` e do número do andar, não de quanto o
+    RNG principal da run foi consumido; assim ele pode ser gerado antecipadamente.
+    """
+    return derivar_seed(seed_run, f"andar:{nivel}")
 
 
 def restaurar_rng(
     seed: int | None = None,
-    estado_serializado: list[EstadoRNG] | None = None,
-) -> tuple[int, random.Random]:
-    """Restaura um RNG a partir da seed e, se existir, do estado serializado."""
+    estado_serializado: EstadoRNG = None,
+) -> tuple[int, FluxosRNG]:
+    """Restaura o RNG a partir da seed e, se existir, do estado serializado.
+
+    Aceita o formato compacto com fluxos, o formato com fluxos em listas e o formato
+    antigo (lista com o estado de um único `random.Random`), que passa a ser o estado
+    do fluxo raiz.
+    """
     seed_normalizada, rng = criar_rng(seed)
-    if estado_serializado is not None:
-        rng.setstate(_lista_para_tupla(estado_serializado))
+    if isinstance(estado_serializado, dict):
+        if estado_serializado.get("formato") not in (FORMATO_FLUXOS, FORMATO_FLUXOS_LISTAS):
+            raise ValueError("Formato de estado do RNG desconhecido.")
+        rng.restaurar(estado_serializado)
+    elif estado_serializado is not None:
+        rng.restaurar_raiz(estado_serializado)
     return seed_normalizada, rng
 
 
-def serializar_estado_rng(rng: random.Random) -> list[EstadoRNG]:
-    """Serializa o estado do RNG para estruturas compatíveis com JSON."""
-    return _tupla_para_lista(rng.getstate())
+def serializar_estado_rng(rng: random.Random) -> EstadoRNG:
+    """Serializa o estado do RNG de forma compacta e compatível com JSON."""
+    if isinstance(rng, FluxosRNG):
+        return rng.serializar()
+    return empacotar_estado(rng.getstate())
 
 
 def _normalizar_seed(seed: int | None) -> int:
@@ -48,15 +280,6 @@ def _normalizar_seed(seed: int | None) -> int:
     return seed_int
 
 
-def _tupla_para_lista(valor: object) -> EstadoRNG:
-    """Converta recursivamente tuplas em listas para serialização JSON."""
-    if isinstance(valor, tuple):
-        return [_tupla_para_lista(item) for item in valor]
-    if isinstance(valor, list):
-        return [_tupla_para_lista(item) for item in valor]
-    return valor  # type: ignore[return-value]
-
-
 def _lista_para_tupla(valor: object) -> object:
     """Restaure recursivamente listas serializadas para tuplas do estado RNG."""
     if isinstance(valor, list):
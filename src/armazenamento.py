@@ -4,16 +4,24 @@ from __future__ import annotations
 
 import copy
 import json
+import logging
 import os
 import shutil
+import sqlite3
+import uuid
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
-from src import config
+from src import config, container_save, diario_save
+from src.codec_mapa import codificar_linhas, mapa_codificado, validar_mapa_codificado
+from src.historico import HistoricoRuns
 from src.version import __version__
 
+_LOGGER = logging.getLogger(__name__)
+
 DiretorioSalvamento = Path
 EstadoJogo = dict[str, Any]
 
@@ -21,7 +29,13 @@ _DIRETORIO_SALVAMENTO: DiretorioSalvamento = Path("saves")
 _ARQUIVO_SALVAMENTO: Path = _DIRETORIO_SALVAMENTO / "save.json"
 _PADRAO_NOME_SLOT = "save_{slot}.json"
 _ARQUIVO_HISTORICO: Path = _DIRETORIO_SALVAMENTO / "history.json"
-SAVE_SCHEMA_VERSION = 2
+_NOME_INDICE = "index.json"
+SAVE_SCHEMA_VERSION = 3
+INDICE_SCHEMA_VERSION = 1
+
+type MigradorSave = Callable[[dict[str, Any]], dict[str, Any]]
+# Migradores por schema de origem (n -> n + 1), registrados com `@_migrador(n)`.
+_MIGRADORES: dict[int, MigradorSave] = {}
 
 
 @dataclass
@@ -43,6 +57,36 @@ class ErroCarregamento(RuntimeError):  # noqa: N818
     """Erro específico disparado quando o arquivo de save não pode ser carregado."""
 
 
+@dataclass
+class _EstadoDiario:
+    """Último estado persistido de um slot, base dos deltas do próximo save incremental."""
+
+    id_snapshot: str
+    entradas: int
+    dados: EstadoJogo
+    assinatura: list[int]
+
+
+# Base do diário por arquivo de snapshot, preenchida ao salvar e ao carregar.
+_DIARIOS: dict[Path, _EstadoDiario] = {}
+
+
+@dataclass
+class ContadoresIO:
+    """Escritas de save feitas pelo processo (snapshots, backups e linhas de diário)."""
+
+    escritas: int = 0
+    bytes_gravados: int = 0
+
+    def registrar(self, tamanho: int) -> None:
+        """Contabiliza uma escrita de `tamanho` bytes."""
+        self.escritas += 1
+        self.bytes_gravados += tamanho
+
+
+CONTADORES_IO = ContadoresIO()
+
+
 def _slot_para_path(slot_id: str | int | None) -> Path:
     """Converta um identificador de slot em caminho."""
     if slot_id is None or str(slot_id) in {"legacy", "default"}:
@@ -66,8 +110,20 @@ def existe_save() -> bool:
     return bool(listar_saves())
 
 
-def salvar_jogo(estado: EstadoJogo, slot_id: str | int | None = None) -> Path:
-    """Salva o estado atual do jogo em formato JSON no slot indicado."""
+def salvar_jogo(
+    estado: EstadoJogo,
+    slot_id: str | int | None = None,
+    *,
+    incremental: bool = False,
+) -> Path:
+    """Salva o estado atual do jogo no slot indicado.
+
+    Com `incremental=True`, se o slot já foi salvo ou carregado nesta sessão e o
+    snapshot em disco não mudou, só o delta desde o último save é anexado ao diário
+    do slot; a cada `SAVE_DIARIO_COMPACTAR_A_CADA` entradas (ou sem base conhecida),
+    um snapshot completo é gravado e o diário recomeça. A base do próximo delta é
+    uma cópia própria: alterar `estado` depois de salvo não afeta o diário.
+    """
     _DIRETORIO_SALVAMENTO.mkdir(parents=True, exist_ok=True)
 
     jogador = estado.get("jogador", {}) or {}
@@ -82,16 +138,49 @@ def salvar_jogo(estado: EstadoJogo, slot_id: str | int | None = None) -> Path:
         "salvo_em_utc": agora_utc.isoformat(timespec="seconds"),
     }
 
+    caminho = caminho_save(slot_id)
+    salvo_em = agora_utc.isoformat(timespec="seconds")
+    diario = _DIARIOS.get(caminho) if incremental else None
+    if (
+        diario is not None
+        and diario.entradas < config.SAVE_DIARIO_COMPACTAR_A_CADA
+        and _assinatura_de(caminho) == diario.assinatura
+    ):
+        delta = diario_save.diferenca_estado(diario.dados, estado)
+        tamanho = diario_save.anexar_entrada(
+            diario_save.caminho_diario(caminho),
+            {
+                "id": diario.id_snapshot,
+                "seq": diario.entradas + 1,
+                "salvo_em": salvo_em,
+                "meta": meta,
+                "delta": delta,
+            },
+        )
+        CONTADORES_IO.registrar(tamanho)
+        diario.entradas += 1
+        # Só o que mudou é copiado para a base; o resto dela já não é do chamador.
+        diario_save.aplicar_delta(diario.dados, copy.deepcopy(delta))
+        _atualizar_indice(
+            caminho,
+            _metadados_save(
+                {"versao": __version__, "salvo_em": salvo_em, "meta": meta, "dados": estado}
+            ),
+        )
+        return caminho
+
     estado_serializavel = {
         "save_version": SAVE_SCHEMA_VERSION,
         "versao": __version__,
-        "salvo_em": agora_utc.isoformat(timespec="seconds"),
+        "salvo_em": salvo_em,
+        "diario_id": uuid.uuid4().hex,
         "meta": meta,
         "dados": estado,
     }
 
-    caminho = caminho_save(slot_id)
     _escrever_save_atomico(caminho, estado_serializavel)
+    _registrar_diario(caminho, estado_serializavel, entradas=0)
+    _atualizar_indice(caminho, _metadados_save(estado_serializavel))
 
     return caminho
 
@@ -102,7 +191,7 @@ def carregar_jogo(slot_id: str | int | None = None) -> EstadoJogo:
     if not caminho.exists():
         raise ErroCarregamento("Nenhum arquivo de save encontrado para esse slot.")
 
-    conteudo = _ler_save_com_fallback(caminho)
+    conteudo, lido_de = _ler_save_com_origem(caminho)
 
     try:
         conteudo = _normalizar_envelope_save(conteudo)
@@ -119,10 +208,16 @@ def carregar_jogo(slot_id: str | int | None = None) -> EstadoJogo:
             f"({__version__})."
         )
 
+    entradas = _aplicar_diario(caminho, conteudo_migrado)
     dados = conteudo_migrado.get("dados", {})
     _validar_estado(dados)
     if migrou:
         _escrever_save_atomico(caminho, conteudo_migrado)
+    if lido_de == caminho and not migrou:
+        _registrar_diario(caminho, conteudo_migrado, entradas=entradas)
+    else:
+        # Veio do backup ou foi regravado: o próximo save começa um snapshot novo.
+        _DIARIOS.pop(caminho, None)
     return dados
 
 
@@ -134,41 +229,166 @@ def remover_save(slot_id: str | int | None = None) -> None:
     caminho_backup = _caminho_backup(caminho)
     if caminho_backup.exists():
         caminho_backup.unlink()
+    diario_save.caminho_diario(caminho).unlink(missing_ok=True)
+    diario_save.caminho_diario(caminho_backup).unlink(missing_ok=True)
+    _DIARIOS.pop(caminho, None)
+    indice = _ler_indice()
+    if indice.pop(caminho.name, None) is not None:
+        _gravar_indice(indice)
 
 
 def _extrair_info(path: Path, slot_id: str) -> SaveInfo | None:
     """Lê metadados de um arquivo de save sem validá-lo completamente."""
+    metadados = _ler_metadados_save(path)
+    if metadados is None:
+        return None
+    return _info_de_metadados(path, slot_id, metadados)
+
+
+def _ler_metadados_save(path: Path) -> dict[str, Any] | None:
+    """Faz o parse completo do save só para extrair os metadados do menu."""
     try:
-        with path.open(encoding="utf-8") as arquivo:
-            conteudo = json.load(arquivo)
-        conteudo = _normalizar_envelope_save(conteudo)
+        conteudo = _normalizar_envelope_save(_ler_json_save(path))
         conteudo, _ = _migrar_conteudo_save(conteudo)
-    except (OSError, json.JSONDecodeError):
+        _aplicar_diario(path, conteudo)
+    except (OSError, json.JSONDecodeError, ErroCarregamento):
         return None
     except ValueError:
         return None
+    return _metadados_save(conteudo)
 
+
+def _metadados_save(conteudo: dict[str, Any]) -> dict[str, Any]:
+    """Resume um envelope de save nos campos exibidos pelo menu de slots."""
     dados = conteudo.get("dados", {}) or {}
     meta = conteudo.get("meta", {}) or {}
     jogador = dados.get("jogador", {}) or {}
-    salvo_iso = str(conteudo.get("salvo_em") or meta.get("salvo_em_utc") or "")
-    salvo_legivel = _formatar_data_local(salvo_iso)
+    return {
+        "personagem": str(meta.get("personagem") or jogador.get("nome") or "Desconhecido"),
+        "classe": str(meta.get("classe") or jogador.get("classe") or "?"),
+        "nivel": int(meta.get("nivel") or jogador.get("nivel") or 1),
+        "andar": int(meta.get("andar") or dados.get("nivel_masmorra") or 1),
+        "dificuldade": str(
+            meta.get("dificuldade") or dados.get("dificuldade") or config.DIFICULDADE_PADRAO
+        ),
+        "salvo_em_utc": str(conteudo.get("salvo_em") or meta.get("salvo_em_utc") or ""),
+        "versao": str(conteudo.get("versao") or "?"),
+    }
+
 
+def _info_de_metadados(path: Path, slot_id: str, metadados: dict[str, Any]) -> SaveInfo:
+    """Monta o `SaveInfo` a partir dos metadados (do índice ou do parse completo)."""
     return SaveInfo(
         slot_id=slot_id,
         caminho=path,
-        personagem=str(meta.get("personagem") or jogador.get("nome") or "Desconhecido"),
-        classe=str(meta.get("classe") or jogador.get("classe") or "?"),
-        nivel=int(meta.get("nivel") or jogador.get("nivel") or 1),
-        andar=int(meta.get("andar") or dados.get("nivel_masmorra") or 1),
-        dificuldade=str(
-            meta.get("dificuldade") or dados.get("dificuldade") or config.DIFICULDADE_PADRAO
-        ),
-        salvo_em=salvo_legivel,
-        versao=str(conteudo.get("versao") or "?"),
+        personagem=str(metadados.get("personagem") or "Desconhecido"),
+        classe=str(metadados.get("classe") or "?"),
+        nivel=int(metadados.get("nivel") or 1),
+        andar=int(metadados.get("andar") or 1),
+        dificuldade=str(metadados.get("dificuldade") or config.DIFICULDADE_PADRAO),
+        salvo_em=_formatar_data_local(str(metadados.get("salvo_em_utc") or "")),
+        versao=str(metadados.get("versao") or "?"),
+    )
+
+
+def _assinatura_de(caminho: Path) -> list[int] | None:
+    """Assinatura atual do arquivo em disco, ou `None` se ele não puder ser lido."""
+    try:
+        return _assinatura_arquivo(caminho.stat())
+    except OSError:
+        return None
+
+
+def _registrar_diario(caminho: Path, conteudo: dict[str, Any], entradas: int) -> None:
+    """Guarda o estado persistido do slot como base dos próximos saves incrementais."""
+    id_snapshot = conteudo.get("diario_id")
+    assinatura = _assinatura_de(caminho)
+    if not isinstance(id_snapshot, str) or assinatura is None:
+        _DIARIOS.pop(caminho, None)
+        return
+    # Cópia: os dados gravados ou devolvidos por `carregar_jogo` seguem com o chamador.
+    _DIARIOS[caminho] = _EstadoDiario(
+        id_snapshot, entradas, copy.deepcopy(conteudo["dados"]), assinatura
     )
 
 
+def _aplicar_diario(caminho: Path, conteudo: dict[str, Any]) -> int:
+    """Reaplica sobre o snapshot as entradas do diário dele; retorna quantas aplicou.
+
+    O diário do snapshot pode estar ao lado do save principal ou, se o snapshot
+    lido for o backup, ao lado do `.bak`; o `id` do snapshot separa um do outro.
+    """
+    id_snapshot = conteudo.get("diario_id")
+    if not isinstance(id_snapshot, str):
+        return 0
+    entradas = diario_save.ler_entradas(
+        diario_save.caminho_diario(caminho), id_snapshot
+    ) or diario_save.ler_entradas(diario_save.caminho_diario(_caminho_backup(caminho)), id_snapshot)
+    try:
+        for entrada in entradas:
+            diario_save.aplicar_delta(conteudo["dados"], entrada["delta"])
+            conteudo["meta"] = entrada.get("meta", conteudo.get("meta"))
+            conteudo["salvo_em"] = entrada.get("salvo_em", conteudo.get("salvo_em"))
+    except (KeyError, IndexError, TypeError, ValueError, AttributeError) as erro:
+        raise ErroCarregamento("Diário do save inconsistente.") from erro
+    return len(entradas)
+
+
+def _caminho_indice() -> Path:
+    """Retorna o caminho do índice de metadados dos saves."""
+    return _DIRETORIO_SALVAMENTO / _NOME_INDICE
+
+
+def _ler_indice() -> dict[str, dict[str, Any]]:
+    """Lê o índice de metadados; ausente, corrompido ou de outro schema vale vazio."""
+    try:
+        conteudo = json.loads(_caminho_indice().read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(conteudo, dict) or conteudo.get("versao") != INDICE_SCHEMA_VERSION:
+        return {}
+    slots = conteudo.get("slots")
+    if not isinstance(slots, dict):
+        return {}
+    return {nome: entrada for nome, entrada in slots.items() if isinstance(entrada, dict)}
+
+
+def _gravar_indice(slots: dict[str, dict[str, Any]]) -> None:
+    """Grava o índice por substituição atômica; falhas não afetam os saves."""
+    caminho = _caminho_indice()
+    temporario = _caminho_temporario(caminho)
+    try:
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        temporario.write_text(
+            json.dumps(
+                {"versao": INDICE_SCHEMA_VERSION, "slots": slots},
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ),
+            encoding="utf-8",
+        )
+        os.replace(temporario, caminho)
+    except OSError:
+        # O índice é só um cache: sem ele, o menu volta a ler os saves completos.
+        temporario.unlink(missing_ok=True)
+
+
+def _assinatura_arquivo(estado: os.stat_result) -> list[int]:
+    """Identifica a versão em disco de um save (mtime em ns e tamanho)."""
+    return [estado.st_mtime_ns, estado.st_size]
+
+
+def _atualizar_indice(caminho: Path, metadados: dict[str, Any]) -> None:
+    """Registra no índice os metadados do save recém-gravado em `caminho`."""
+    try:
+        assinatura = _assinatura_arquivo(caminho.stat())
+    except OSError:
+        return
+    indice = _ler_indice()
+    indice[caminho.name] = {**metadados, "assinatura": assinatura}
+    _gravar_indice(indice)
+
+
 def _caminho_backup(caminho: Path) -> Path:
     """Retorna o caminho do backup do save."""
     return caminho.with_suffix(f"{caminho.suffix}.bak")
@@ -185,13 +405,27 @@ def _escrever_save_atomico(caminho: Path, conteudo: dict[str, Any]) -> None:
     temporario = _caminho_temporario(caminho)
     backup = _caminho_backup(caminho)
 
+    corpo = json.dumps(conteudo, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if config.SAVE_COMPRESSAO is not None:
+        corpo = container_save.empacotar(
+            corpo,
+            _coagir_save_version(conteudo.get("save_version", SAVE_SCHEMA_VERSION)),
+            config.SAVE_COMPRESSAO,
+        )
+
     try:
-        with temporario.open("w", encoding="utf-8") as arquivo:
-            json.dump(conteudo, arquivo, ensure_ascii=False, separators=(",", ":"))
+        with temporario.open("wb") as arquivo:
+            arquivo.write(corpo)
             arquivo.flush()
             os.fsync(arquivo.fileno())
+        CONTADORES_IO.registrar(len(corpo))
         if caminho.exists():
             shutil.copy2(caminho, backup)
+            CONTADORES_IO.registrar(backup.stat().st_size)
+            diario = diario_save.caminho_diario(caminho)
+            if diario.exists():
+                # O diário pertence ao snapshot que virou backup: segue junto com ele.
+                os.replace(diario, diario_save.caminho_diario(backup))
         os.replace(temporario, caminho)
     finally:
         if temporario.exists():
@@ -199,9 +433,21 @@ def _escrever_save_atomico(caminho: Path, conteudo: dict[str, Any]) -> None:
 
 
 def _ler_json_save(caminho: Path) -> dict[str, Any]:
-    """Lê e decodifica um arquivo JSON de save."""
-    with caminho.open(encoding="utf-8") as arquivo:
-        conteudo = json.load(arquivo)
+    """Lê e decodifica um save, em JSON puro ou no contêiner binário comprimido.
+
+    No contêiner, tamanho e CRC32 são conferidos antes de descomprimir: um save
+    corrompido dispara `ErroCarregamento` de imediato e o fallback para `.bak`.
+    """
+    dados = caminho.read_bytes()
+    if container_save.eh_container(dados):
+        try:
+            dados = container_save.desempacotar(dados)
+        except ValueError as erro:
+            raise ErroCarregamento(str(erro)) from erro
+    try:
+        conteudo = json.loads(dados.decode("utf-8"))
+    except UnicodeDecodeError as erro:
+        raise ErroCarregamento("Arquivo de save com codificação inválida.") from erro
     if not isinstance(conteudo, dict):
         raise ErroCarregamento("Arquivo de save inválido.")
     return conteudo
@@ -209,13 +455,19 @@ def _ler_json_save(caminho: Path) -> dict[str, Any]:
 
 def _ler_save_com_fallback(caminho: Path) -> dict[str, Any]:
     """Lê o save principal e, em caso de corrupção, tenta restaurar a partir do backup."""
+    conteudo, _ = _ler_save_com_origem(caminho)
+    return conteudo
+
+
+def _ler_save_com_origem(caminho: Path) -> tuple[dict[str, Any], Path]:
+    """Como `_ler_save_com_fallback`, informando também qual arquivo foi lido."""
     try:
-        return _ler_json_save(caminho)
+        return _ler_json_save(caminho), caminho
     except (json.JSONDecodeError, OSError, ErroCarregamento) as erro:
         backup = _caminho_backup(caminho)
         if backup.exists():
             try:
-                return _ler_json_save(backup)
+                return _ler_json_save(backup), backup
             except (json.JSONDecodeError, OSError, ErroCarregamento) as erro_backup:
                 raise ErroCarregamento(
                     "Não foi possível ler nem o save principal nem o backup."
@@ -224,15 +476,19 @@ def _ler_save_com_fallback(caminho: Path) -> dict[str, Any]:
 
 
 def listar_saves() -> list[SaveInfo]:
-    """Lista todos os saves disponíveis, inclusive o legado."""
+    """Lista todos os saves disponíveis, inclusive o legado.
+
+    Os metadados vêm do índice (`index.json`); só os saves cuja assinatura em disco
+    (mtime e tamanho) não bate com a do índice são lidos por completo, e o índice é
+    regravado apenas quando algo mudou. A ordem é do save mais recente para o mais
+    antigo, pela data registrada no índice.
+    """
     _DIRETORIO_SALVAMENTO.mkdir(parents=True, exist_ok=True)
-    saves: list[SaveInfo] = []
+    candidatos: list[tuple[Path, str]] = []
 
     # Save legado
     if _ARQUIVO_SALVAMENTO.exists():
-        info = _extrair_info(_ARQUIVO_SALVAMENTO, "legacy")
-        if info:
-            saves.append(info)
+        candidatos.append((_ARQUIVO_SALVAMENTO, "legacy"))
 
     # Novos slots
     for path in sorted(_DIRETORIO_SALVAMENTO.glob("save_*.json")):
@@ -240,13 +496,49 @@ def listar_saves() -> list[SaveInfo]:
         slot_num = nome.removeprefix("save_").removesuffix(".json")
         if not slot_num.isdigit():
             continue
-        info = _extrair_info(path, slot_num)
-        if info:
-            saves.append(info)
+        candidatos.append((path, slot_num))
 
-    # Ordenar por data de modificação (mais recente primeiro)
-    saves.sort(key=lambda s: s.caminho.stat().st_mtime, reverse=True)
-    return saves
+    indice = _ler_indice()
+    novo_indice: dict[str, dict[str, Any]] = {}
+    saves: list[tuple[tuple[float, int], SaveInfo]] = []
+    for path, slot_id in candidatos:
+        try:
+            estado_arquivo = path.stat()
+        except OSError:
+            continue
+        assinatura = _assinatura_arquivo(estado_arquivo)
+        entrada = indice.get(path.name)
+        if entrada is None or entrada.get("assinatura") != assinatura:
+            metadados = _ler_metadados_save(path)
+            # Saves ilegíveis também ficam no índice, para não serem relidos a cada menu.
+            entrada = {**(metadados or {"invalido": True}), "assinatura": assinatura}
+        novo_indice[path.name] = entrada
+        if entrada.get("invalido"):
+            continue
+        saves.append(
+            (_momento_do_save(entrada, estado_arquivo), _info_de_metadados(path, slot_id, entrada))
+        )
+
+    if novo_indice != indice:
+        _gravar_indice(novo_indice)
+
+    # Mais recente primeiro, pela data do último save (snapshot ou entrada do diário)
+    saves.sort(key=lambda item: item[0], reverse=True)
+    return [info for _, info in saves]
+
+
+def _momento_do_save(metadados: dict[str, Any], estado: os.stat_result) -> tuple[float, int]:
+    """Chave de ordenação de um slot: `salvo_em_utc` indexado, com o mtime de desempate.
+
+    Saves incrementais só anexam ao diário e não tocam o snapshot, então o mtime
+    do `save_N.json` sozinho faria o slot parecer mais antigo do que é. Saves
+    sem data legível caem no mtime.
+    """
+    try:
+        momento = datetime.fromisoformat(str(metadados.get("salvo_em_utc") or "")).timestamp()
+    except ValueError:
+        momento = estado.st_mtime
+    return momento, estado.st_mtime_ns
 
 
 def proximo_slot_disponivel(max_slots: int = config.MAX_SAVE_SLOTS) -> int | None:
@@ -271,10 +563,15 @@ def _validar_estado(estado: EstadoJogo) -> None:
     if not isinstance(jogador, dict) or "nome" not in jogador:
         raise ErroCarregamento("Dados do jogador ausentes ou inválidos no save.")
 
-    if not isinstance(mapa, list) or not mapa:
+    if mapa_codificado(mapa):
+        try:
+            validar_mapa_codificado(mapa)
+        except ValueError as erro:
+            raise ErroCarregamento("Mapa corrompido no arquivo de save.") from erro
+    elif not isinstance(mapa, list) or not mapa:
         raise ErroCarregamento("Mapa inválido no arquivo de save.")
 
-    for linha in mapa:
+    for linha in mapa if isinstance(mapa, list) else ():
         if not isinstance(linha, list):
             raise ErroCarregamento("Mapa corrompido: linhas precisam ser listas.")
         for sala in linha:
@@ -317,27 +614,46 @@ def _normalizar_envelope_save(conteudo: object) -> dict[str, Any]:
 
 
 def _migrar_conteudo_save(conteudo: dict[str, Any]) -> tuple[dict[str, Any], bool]:
-    """Aplica migrações de schema até a versão atual."""
-    migrado = copy.deepcopy(conteudo)
-    versao_atual = _coagir_save_version(migrado.get("save_version", 1))
+    """Aplica migrações de schema até a versão atual, no próprio objeto recebido.
+
+    `conteudo` deve ser o dicionário recém-lido do disco: os migradores o alteram no
+    lugar. Um save já na versão atual volta intacto, sem cópia alguma.
+    """
+    versao_atual = _coagir_save_version(conteudo.get("save_version", 1))
     if versao_atual > SAVE_SCHEMA_VERSION:
         raise ErroCarregamento(
             f"Arquivo de save foi gerado por uma versão mais nova do jogo (schema {versao_atual})."
         )
+    if versao_atual == SAVE_SCHEMA_VERSION:
+        conteudo["save_version"] = SAVE_SCHEMA_VERSION
+        return conteudo, False
 
-    houve_migracao = False
+    migrado = conteudo
     while versao_atual < SAVE_SCHEMA_VERSION:
-        if versao_atual == 1:
-            migrado = _migrar_v1_para_v2(migrado)
-            versao_atual = 2
-            houve_migracao = True
-            continue
-        raise ErroCarregamento(
-            f"Não existe migrador para schema de save {versao_atual} -> {versao_atual + 1}."
-        )
+        migrador = _MIGRADORES.get(versao_atual)
+        if migrador is None:
+            raise ErroCarregamento(
+                f"Não existe migrador para schema de save {versao_atual} -> {versao_atual + 1}."
+            )
+        migrado = migrador(migrado)
+        versao_atual += 1
 
     migrado["save_version"] = SAVE_SCHEMA_VERSION
-    return migrado, houve_migracao
+    return migrado, True
+
+
+def _migrador(
+    versao_origem: int,
+) -> Callable[[MigradorSave], MigradorSave]:
+    """Registra o migrador do schema `versao_origem` para `versao_origem + 1`."""
+
+    def registrar(funcao: MigradorSave) -> MigradorSave:
+        if versao_origem in _MIGRADORES:
+            raise ValueError(f"Migrador do schema {versao_origem} já registrado.")
+        _MIGRADORES[versao_origem] = funcao
+        return funcao
+
+    return registrar
 
 
 def _coagir_save_version(valor: object) -> int:
@@ -349,6 +665,7 @@ def _coagir_save_version(valor: object) -> int:
     return max(1, versao)
 
 
+@_migrador(1)
 def _migrar_v1_para_v2(conteudo: dict[str, Any]) -> dict[str, Any]:
     """Migra saves sem schema explícito para o formato v2."""
     dados = conteudo.get("dados")
@@ -412,6 +729,22 @@ def _migrar_v1_para_v2(conteudo: dict[str, Any]) -> dict[str, Any]:
     return conteudo
 
 
+@_migrador(2)
+def _migrar_v2_para_v3(conteudo: dict[str, Any]) -> dict[str, Any]:
+    """Troca a grade de dicionários do mapa pelo formato do codec (`src.codec_mapa`)."""
+    dados = conteudo.get("dados")
+    mapa = dados.get("mapa") if isinstance(dados, dict) else None
+    if (
+        isinstance(mapa, list)
+        and mapa
+        and all(isinstance(linha, list) and linha for linha in mapa)
+        and all(isinstance(sala, dict) for linha in mapa for sala in linha)
+    ):
+        dados["mapa"] = codificar_linhas(mapa)  # type: ignore[index]
+    conteudo["save_version"] = 3
+    return conteudo
+
+
 def _formatar_data_local(iso_str: str) -> str:
     """Formata ISO para horário local legível."""
     if not iso_str:
@@ -424,27 +757,54 @@ def _formatar_data_local(iso_str: str) -> str:
         return iso_str
 
 
-def registrar_historico(entry: dict[str, Any], limite: int = 50) -> None:
-    """Acrescenta uma entrada de histórico de partidas (ignoradas pelo git)."""
-    _DIRETORIO_SALVAMENTO.mkdir(parents=True, exist_ok=True)
-    historico: list[dict[str, Any]] = []
+def abrir_historico() -> HistoricoRuns:
+    """Abre o histórico de runs, importando uma vez o `history.json` das versões antigas."""
+    banco = HistoricoRuns(_ARQUIVO_HISTORICO.with_suffix(".db"))
     if _ARQUIVO_HISTORICO.exists():
-        try:
-            historico = json.loads(_ARQUIVO_HISTORICO.read_text(encoding="utf-8"))
-            if not isinstance(historico, list):
-                historico = []
-        except (OSError, json.JSONDecodeError):
-            historico = []
-    historico.append(entry)
-    if len(historico) > limite:
-        historico = historico[-limite:]
-    _ARQUIVO_HISTORICO.write_text(
-        json.dumps(historico, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+        _importar_historico_legado(banco)
+    return banco
+
+
+def _importar_historico_legado(banco: HistoricoRuns) -> None:
+    """Copia as entradas do JSON antigo para o banco e renomeia o arquivo importado.
+
+    A renomeação acontece dentro da transação da importação: se ela falhar, o banco
+    desfaz a importação e a próxima abertura tenta de novo, sem duplicar runs.
+    """
+    try:
+        entradas = json.loads(_ARQUIVO_HISTORICO.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        entradas = []
+    if not isinstance(entradas, list):
+        entradas = []
+
+    def _marcar_importado() -> None:
+        # Renomear (em vez de apagar) deixa o original disponível.
+        os.replace(_ARQUIVO_HISTORICO, _ARQUIVO_HISTORICO.with_suffix(".json.importado"))
+
+    try:
+        banco.importar(
+            [entrada for entrada in entradas if isinstance(entrada, dict)],
+            antes_de_confirmar=_marcar_importado,
+        )
+    except (OSError, sqlite3.Error) as erro:
+        _LOGGER.warning("Histórico antigo não importado (%s); nova tentativa depois.", erro)
+
+
+def registrar_historico(entry: dict[str, Any]) -> bool:
+    """Acrescenta uma entrada ao histórico de partidas (ignorado pelo git).
+
+    Um banco corrompido ou travado não pode derrubar o fim da run: a falha é logada,
+    a entrada é descartada e o retorno é `False`.
+    """
+    try:
+        abrir_historico().registrar(entry)
+    except (OSError, sqlite3.Error) as erro:
+        _LOGGER.warning("Run não registrada no histórico: %s", erro)
+        return False
+    return True
 
 
 def limpar_historico() -> None:
-    """Remove o arquivo de histórico, se existir."""
-    if _ARQUIVO_HISTORICO.exists():
-        _ARQUIVO_HISTORICO.unlink()
+    """Apaga todas as runs do histórico."""
+    abrir_historico().limpar()
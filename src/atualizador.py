@@ -5,7 +5,8 @@ from __future__ import annotations
 import json
 import sys
 from collections.abc import Callable, Iterable
-from dataclasses import dataclass
+from contextlib import suppress
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any
@@ -30,7 +31,10 @@ DEFAULT_PREFERENCIAS = {
     "ultima_falha_iso": None,
     "tutorial_enabled": True,
     "combat_log_breakdown": False,
+    "combate_auto_resolver": False,
 }
+type ValorPreferencia = str | bool | int | None
+
 FREQUENCIA_DIAS = {"diaria": 1, "semanal": 7, "mensal": 30}
 
 
@@ -71,9 +75,7 @@ def carregar_preferencias(caminho: Path | None = None) -> dict[str, Any]:
         dados = json.loads(caminho.read_text(encoding="utf-8"))
     except (json.JSONDecodeError, OSError):
         return DEFAULT_PREFERENCIAS.copy()
-    prefs = DEFAULT_PREFERENCIAS.copy()
-    prefs.update({k: dados.get(k, v) for k, v in DEFAULT_PREFERENCIAS.items()})
-    return prefs
+    return _mesclar_com_defaults(dados)
 
 
 def salvar_preferencias(preferencias: dict[str, Any], caminho: Path | None = None) -> None:
@@ -82,6 +84,140 @@ def salvar_preferencias(preferencias: dict[str, Any], caminho: Path | None = Non
     caminho.write_text(json.dumps(preferencias, indent=2, ensure_ascii=False), encoding="utf-8")
 
 
+def _mesclar_com_defaults(dados: dict[str, Any]) -> dict[str, Any]:
+    prefs = DEFAULT_PREFERENCIAS.copy()
+    prefs.update({k: dados.get(k, v) for k, v in DEFAULT_PREFERENCIAS.items()})
+    return prefs
+
+
+@dataclass
+class ServicoPreferencias:
+    """Cache em memória do `settings.json`, compartilhado pelo processo inteiro.
+
+    O arquivo é lido uma única vez; depois disso `valor()` não toca o disco. `revalidar()`
+    compara o mtime do arquivo (um `stat`) para captar edições externas, e alterações
+    feitas por `definir()` ficam pendentes até `gravar()`, que escreve tudo de uma vez.
+    Sem `caminho` explícito, o serviço segue `SETTINGS_PATH` (inclusive quando trocado
+    em testes).
+    """
+
+    caminho: Path | None = None
+    leituras_disco: int = 0
+    escritas_disco: int = 0
+    _dados: dict[str, Any] | None = field(default=None, repr=False)
+    _caminho_carregado: Path | None = field(default=None, repr=False)
+    _mtime_ns: int | None = field(default=None, repr=False)
+    _pendente: bool = field(default=False, repr=False)
+
+    def _caminho_atual(self) -> Path:
+        return self.caminho or SETTINGS_PATH
+
+    def _garantir_carregado(self) -> dict[str, Any]:
+        caminho = self._caminho_atual()
+        if self._dados is None or self._caminho_carregado != caminho:
+            if self._pendente:
+                # O caminho mudou (ex.: testes trocando SETTINGS_PATH): entrega as
+                # pendências ao arquivo antigo antes de trocar de fonte.
+                with suppress(OSError):
+                    self.gravar()
+            self._carregar(caminho)
+        assert self._dados is not None
+        return self._dados
+
+    def _carregar(self, caminho: Path) -> None:
+        self._caminho_carregado = caminho
+        self._pendente = False
+        try:
+            self._mtime_ns = caminho.stat().st_mtime_ns
+        except OSError:
+            # Arquivo ausente: usa defaults e agenda a criação para o próximo `gravar()`.
+            self._mtime_ns = None
+            self._dados = DEFAULT_PREFERENCIAS.copy()
+            self._pendente = True
+            return
+        self.leituras_disco += 1
+        try:
+            dados = json.loads(caminho.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            self._dados = DEFAULT_PREFERENCIAS.copy()
+            return
+        self._dados = _mesclar_com_defaults(dados if isinstance(dados, dict) else {})
+
+    def obter(self) -> dict[str, Any]:
+        """Retorna uma cópia de todas as preferências."""
+        return self._garantir_carregado().copy()
+
+    def valor(self, chave: str, padrao: ValorPreferencia = None) -> ValorPreferencia:
+        """Retorna uma preferência sem I/O quando o cache já está carregado."""
+        return self._garantir_carregado().get(chave, padrao)
+
+    def definir(self, **valores: ValorPreferencia) -> None:
+        """Atualiza preferências em memória; a escrita fica para `gravar()`."""
+        dados = self._garantir_carregado()
+        for chave, valor in valores.items():
+            if dados.get(chave) != valor or chave not in dados:
+                dados[chave] = valor
+                self._pendente = True
+
+    @property
+    def pendente(self) -> bool:
+        """Indica se há alterações ainda não gravadas."""
+        return self._pendente
+
+    def revalidar(self) -> bool:
+        """Grava pendências e recarrega o arquivo se ele mudou no disco.
+
+        Retorna `True` quando o cache foi recarregado.
+        """
+        if self._dados is None or self._caminho_carregado != self._caminho_atual():
+            self._garantir_carregado()
+            return True
+        if self._pendente:
+            self.gravar()
+            return False
+        assert self._caminho_carregado is not None
+        try:
+            mtime_ns = self._caminho_carregado.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if mtime_ns == self._mtime_ns:
+            return False
+        self._carregar(self._caminho_carregado)
+        return True
+
+    def gravar(self) -> None:
+        """Escreve as alterações pendentes, se houver, numa única operação."""
+        if not self._pendente or self._dados is None or self._caminho_carregado is None:
+            return
+        salvar_preferencias(self._dados, self._caminho_carregado)
+        self.escritas_disco += 1
+        self._pendente = False
+        try:
+            self._mtime_ns = self._caminho_carregado.stat().st_mtime_ns
+        except OSError:
+            self._mtime_ns = None
+
+    def invalidar(self) -> None:
+        """Descarta o cache (sem gravar) para forçar nova leitura."""
+        self._dados = None
+        self._caminho_carregado = None
+        self._mtime_ns = None
+        self._pendente = False
+
+
+_SERVICO_PREFERENCIAS = ServicoPreferencias()
+
+
+def servico_preferencias() -> ServicoPreferencias:
+    """Retorna o serviço de preferências compartilhado pelo processo."""
+    return _SERVICO_PREFERENCIAS
+
+
+def preferencia(chave: str, padrao: ValorPreferencia = None) -> ValorPreferencia:
+    """Atalho para ler uma preferência do cache compartilhado."""
+    return _SERVICO_PREFERENCIAS.valor(chave, padrao)
+
+
 def _dias_de_intervalo(frequencia: str) -> int:
     return FREQUENCIA_DIAS.get(frequencia, FREQUENCIA_DIAS["semanal"])
 
@@ -173,7 +309,8 @@ def verificar_atualizacao(
     fetch_fn: Callable[[], Iterable[dict[str, Any]]] | None = None,
 ) -> AtualizacaoInfo | None:
     """Checa se existe release mais recente e retorna instruções para o jogador."""
-    preferencias = carregar_preferencias()
+    servico = servico_preferencias()
+    preferencias = servico.obter()
     agora = agora or datetime.now(UTC)
     if not forcar and not deve_verificar(preferencias, agora):
         return None
@@ -181,13 +318,12 @@ def verificar_atualizacao(
     try:
         release = buscar_release_mais_recente(preferencias.get("allow_prerelease", False), fetch_fn)
     except (URLError, OSError):
-        preferencias["ultima_falha_iso"] = agora.isoformat()
-        salvar_preferencias(preferencias)
+        servico.definir(ultima_falha_iso=agora.isoformat())
+        servico.gravar()
         return None
 
-    preferencias["last_check_iso"] = agora.isoformat()
-    preferencias["ultima_falha_iso"] = None
-    salvar_preferencias(preferencias)
+    servico.definir(last_check_iso=agora.isoformat(), ultima_falha_iso=None)
+    servico.gravar()
 
     if not release:
         return None
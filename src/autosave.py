@@ -0,0 +1,148 @@
+"""Política de autosave: quando salvar sozinho e quanto I/O isso pode custar.
+
+Três gatilhos marcam um autosave: descer de andar, derrotar um chefe e passar
+`AUTOSAVE_A_CADA_TURNOS` turnos desde o último. O pedido só sai se couber no orçamento
+de I/O: um intervalo mínimo entre autosaves e um teto de bytes gravados por minuto
+(janela deslizante de 60 s, estimando o próximo save pelo tamanho do anterior). Um
+gatilho barrado pelo orçamento fica pendente e é tentado de novo no turno seguinte.
+
+A gravação em si é do `GravadorSaves` (mesmo caminho atômico de `salvar_jogo`); esta
+classe só decide, reserva a vez e guarda as métricas de cada autosave concluído.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from src import config
+from src.gravador_saves import ResultadoGravacao
+
+MOTIVO_DESCIDA = "descida"
+MOTIVO_CHEFE = "chefe"
+MOTIVO_TURNOS = "turnos"
+JANELA_ORCAMENTO_S = 60.0
+
+
+@dataclass(frozen=True)
+class MetricaAutosave:
+    """Custo de um autosave concluído."""
+
+    motivo: str
+    turno: int
+    duracao_s: float
+    bytes_gravados: int
+    sucesso: bool
+
+
+class PoliticaAutosave:
+    """Decide os autosaves da run respeitando o orçamento de I/O."""
+
+    def __init__(
+        self,
+        *,
+        ativo: bool | None = None,
+        a_cada_turnos: int | None = None,
+        bytes_por_minuto: int | None = None,
+        intervalo_min_s: float | None = None,
+        agora: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ativo = config.AUTOSAVE_ATIVO if ativo is None else ativo
+        self.a_cada_turnos = (
+            config.AUTOSAVE_A_CADA_TURNOS if a_cada_turnos is None else a_cada_turnos
+        )
+        self.bytes_por_minuto = (
+            config.AUTOSAVE_BYTES_POR_MINUTO if bytes_por_minuto is None else bytes_por_minuto
+        )
+        self.intervalo_min_s = (
+            config.AUTOSAVE_INTERVALO_MIN_S if intervalo_min_s is None else intervalo_min_s
+        )
+        self._agora = agora
+        # `registrar` roda na thread do gravador; o resto, na thread do jogo.
+        self._trava = threading.Lock()
+        self._janela: deque[tuple[float, int]] = deque()
+        self._pendente: str | None = None
+        self._em_voo = False
+        self._ultimo_inicio: float | None = None
+        self._turno_base: int | None = None
+        self._estimativa_bytes = 0
+        self.metricas: list[MetricaAutosave] = []
+        self.adiados = 0
+
+    def marcar(self, motivo: str) -> None:
+        """Registra um gatilho de evento (descida, chefe) para o próximo `proximo_motivo`."""
+        if self.ativo:
+            self._pendente = motivo
+
+    def reiniciar(self) -> None:
+        """Esquece gatilhos e a contagem de turnos (nova run ou save carregado)."""
+        self._pendente = None
+        self._turno_base = None
+
+    def proximo_motivo(self, turno: int) -> str | None:
+        """Retorna o motivo do autosave a fazer agora e reserva a vez, ou `None`.
+
+        Quem recebe um motivo deve agendar o save e repassar o resultado a `registrar`.
+        """
+        if not self.ativo:
+            return None
+        if self._turno_base is None or turno < self._turno_base:
+            self._turno_base = turno
+        motivo = self._pendente
+        if (
+            motivo is None
+            and self.a_cada_turnos > 0
+            and turno - self._turno_base >= self.a_cada_turnos
+        ):
+            motivo = MOTIVO_TURNOS
+        if motivo is None:
+            return None
+        agora = self._agora()
+        with self._trava:
+            if self._em_voo or not self._dentro_do_orcamento(agora):
+                self._pendente = motivo
+                self.adiados += 1
+                return None
+            self._em_voo = True
+        self._ultimo_inicio = agora
+        self._pendente = None
+        self._turno_base = turno
+        return motivo
+
+    def registrar(self, motivo: str, turno: int, resultado: ResultadoGravacao) -> None:
+        """Guarda a métrica do autosave e lança os bytes gravados na janela do orçamento."""
+        metrica = MetricaAutosave(
+            motivo,
+            turno,
+            resultado.duracao_s,
+            resultado.bytes_gravados,
+            resultado.sucesso,
+        )
+        with self._trava:
+            self.metricas.append(metrica)
+            self._janela.append((self._agora(), resultado.bytes_gravados))
+            if resultado.bytes_gravados:
+                self._estimativa_bytes = resultado.bytes_gravados
+            self._em_voo = False
+
+    def bytes_na_janela(self) -> int:
+        """Bytes gravados por autosaves nos últimos `JANELA_ORCAMENTO_S` segundos."""
+        with self._trava:
+            self._descartar_antigos(self._agora())
+            return sum(tamanho for _, tamanho in self._janela)
+
+    def _dentro_do_orcamento(self, agora: float) -> bool:
+        if self._ultimo_inicio is not None and agora - self._ultimo_inicio < self.intervalo_min_s:
+            return False
+        self._descartar_antigos(agora)
+        if not self._janela:
+            return True  # janela vazia: mesmo um save maior que o teto pode sair
+        usados = sum(tamanho for _, tamanho in self._janela)
+        return usados + self._estimativa_bytes <= self.bytes_por_minuto
+
+    def _descartar_antigos(self, agora: float) -> None:
+        while self._janela and agora - self._janela[0][0] >= JANELA_ORCAMENTO_S:
+            self._janela.popleft()
@@ -0,0 +1,156 @@
+"""Codec do mapa no save: sala padrão, deltas por sala e paredes em run-length.
+
+Formato (`FORMATO_MAPA`):
+
+    {
+        "formato": "mapa-delta-v1",
+        "largura": 20, "altura": 20,
+        "padrao": {...},          # registro completo da parede compartilhada
+        "paredes": [12, 3, 40, 1, ...],
+        "salas": [{...}, ...],     # só os campos que diferem de "padrao"
+    }
+
+`paredes` percorre as células em ordem de linha alternando o tamanho de uma sequência
+de paredes e o de uma sequência de salas (sempre começando pelas paredes, mesmo que
+com 0). `salas` traz, na mesma ordem, um delta por célula que não é a parede padrão.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from src.entidades import PADROES_SALA, Sala
+from src.mapa_compacto import Mapa, MapaCompacto, criar_parede
+
+FORMATO_MAPA = "mapa-delta-v1"
+
+type MapaSerializado = dict[str, Any] | list[list[dict[str, Any]]]
+
+_AUSENTE = object()
+
+
+def mapa_codificado(valor: object) -> bool:
+    """Indica se `valor` está no formato do codec (e não na grade de dicionários)."""
+    return isinstance(valor, dict) and valor.get("formato") == FORMATO_MAPA
+
+
+def codificar_mapa(mapa: Mapa) -> dict[str, Any]:
+    """Codifica um mapa (compacto ou grade de `Sala`) no formato do save."""
+    if isinstance(mapa, MapaCompacto):
+        padrao = mapa.parede.to_dict()
+        celulas = ((y * mapa.largura + x, sala.to_dict()) for x, y, sala in mapa.salas())
+        return _montar(mapa.largura, mapa.altura, padrao, celulas)
+
+    parede = next((sala for linha in mapa for sala in linha if sala.tipo == "parede"), None)
+    padrao = (parede or criar_parede()).to_dict()
+    altura = len(mapa)
+    largura = len(mapa[0]) if altura else 0
+    celulas = (
+        (y * largura + x, sala.to_dict())
+        for y, linha in enumerate(mapa)
+        for x, sala in enumerate(linha)
+        if sala is not parede
+    )
+    return _montar(largura, altura, padrao, celulas)
+
+
+def codificar_linhas(linhas: list[list[dict[str, Any]]]) -> dict[str, Any]:
+    """Codifica a grade de dicionários dos saves antigos sem hidratar as salas.
+
+    Campos ausentes numa célula valem o padrão do dataclass `Sala`, como em
+    `Sala.from_dict`, para que o delta reproduza exatamente a sala de antes.
+    """
+    altura = len(linhas)
+    largura = len(linhas[0]) if altura else 0
+    dados_parede = next(
+        (dados for linha in linhas for dados in linha if dados.get("tipo") == "parede"),
+        None,
+    )
+    padrao = (
+        {**PADROES_SALA, **dados_parede} if dados_parede is not None else criar_parede().to_dict()
+    )
+    celulas = (
+        (y * largura + x, {**PADROES_SALA, **dados})
+        for y, linha in enumerate(linhas)
+        for x, dados in enumerate(linha)
+        if dados is not dados_parede
+    )
+    return _montar(largura, altura, padrao, celulas)
+
+
+def decodificar_mapa(dados: dict[str, Any]) -> MapaCompacto:
+    """Reconstrói o `MapaCompacto` a partir do formato do codec."""
+    validar_mapa_codificado(dados)
+    padrao: dict[str, Any] = dados["padrao"]
+    largura: int = dados["largura"]
+    mapa = MapaCompacto(largura, dados["altura"], Sala.from_dict(padrao))
+    deltas = iter(dados["salas"])
+    posicao = 0
+    for ordem, tamanho in enumerate(dados["paredes"]):
+        if ordem % 2 == 0:
+            posicao += tamanho
+            continue
+        for indice in range(posicao, posicao + tamanho):
+            y, x = divmod(indice, largura)
+            mapa.definir(x, y, Sala.from_dict({**padrao, **next(deltas)}))
+        posicao += tamanho
+    return mapa
+
+
+def validar_mapa_codificado(dados: object) -> None:
+    """Confere a estrutura do formato do codec, disparando `ValueError` se inválida."""
+    if not isinstance(dados, dict) or dados.get("formato") != FORMATO_MAPA:
+        raise ValueError("Mapa sem o formato do codec.")
+    largura = dados.get("largura")
+    altura = dados.get("altura")
+    if not _inteiro_positivo(largura) or not _inteiro_positivo(altura):
+        raise ValueError("Mapa codificado com dimensões inválidas.")
+    padrao = dados.get("padrao")
+    paredes = dados.get("paredes")
+    salas = dados.get("salas")
+    if not isinstance(padrao, dict) or not isinstance(paredes, list):
+        raise ValueError("Mapa codificado sem sala padrão ou sequências de paredes.")
+    if not isinstance(salas, list) or not all(isinstance(delta, dict) for delta in salas):
+        raise ValueError("Mapa codificado com salas inválidas.")
+    if not all(isinstance(tamanho, int) and tamanho >= 0 for tamanho in paredes):
+        raise ValueError("Mapa codificado com sequências de paredes inválidas.")
+    if sum(paredes) != largura * altura or sum(paredes[1::2]) != len(salas):
+        raise ValueError("Mapa codificado com células faltando ou sobrando.")
+
+
+def _montar(
+    largura: int,
+    altura: int,
+    padrao: dict[str, Any],
+    celulas: Iterable[tuple[int, dict[str, Any]]],
+) -> dict[str, Any]:
+    """Gera as sequências de paredes e os deltas a partir das células não-parede."""
+    paredes: list[int] = []
+    salas: list[dict[str, Any]] = []
+    posicao = 0
+    for indice, dados in celulas:
+        delta = {
+            chave: valor for chave, valor in dados.items() if padrao.get(chave, _AUSENTE) != valor
+        }
+        if not delta:
+            continue  # idêntica à parede padrão: fica implícita na sequência de paredes
+        if indice == posicao and paredes and len(paredes) % 2 == 0:
+            paredes[-1] += 1  # continua a sequência de salas em andamento
+        else:
+            paredes.extend((indice - posicao, 1))
+        salas.append(delta)
+        posicao = indice + 1
+    paredes.append(largura * altura - posicao)
+    return {
+        "formato": FORMATO_MAPA,
+        "largura": largura,
+        "altura": altura,
+        "padrao": padrao,
+        "paredes": paredes,
+        "salas": salas,
+    }
+
+
+def _inteiro_positivo(valor: object) -> bool:
+    return isinstance(valor, int) and not isinstance(valor, bool) and valor > 0
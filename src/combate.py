@@ -1,44 +1,50 @@
 import random
-import time
 from collections.abc import Callable
 
-from src import atualizador
+from src import atualizador, config
 from src.entidades import Inimigo, Personagem
-from src.ui import desenhar_log_completo, desenhar_tela_combate
+from src.motor_combate import (
+    AcaoCombate,
+    EstadoCombate,
+    ResultadoCombate,
+    calcular_dano,
+    resolver_combate,
+)
+from src.previsao_combate import prever_combate_entidades
+from src.relogio import RELOGIO_REAL, Relogio
+from src.ui import desenhar_log_completo, desenhar_tela_combate, desenhar_tela_evento
+
+__all__ = [
+    "auto_resolver_ativo",
+    "calcular_dano",
+    "combate_trivial",
+    "iniciar_combate",
+    "resolver_combate_automatico",
+]
+
+PAUSA_FEEDBACK = 1.0
+
+_ACOES_POR_ESCOLHA = {
+    "1": AcaoCombate.ATACAR,
+    "2": AcaoCombate.USAR_ITEM,
+    "3": AcaoCombate.FUGIR,
+}
 
 
-def calcular_dano(ataque: int, defesa: int, rng: random.Random | None = None) -> int:
-    """Calcula o dano de um ataque, com um fator de aleatoriedade."""
-    dano, _ = _calcular_dano_com_detalhes(ataque, defesa, rng=rng)
-    return dano
+def _breakdown_ativo() -> bool:
+    """Leia preferência de breakdown de dano para o log de combate (sem I/O)."""
+    return bool(atualizador.preferencia("combat_log_breakdown", False))
 
 
-def _calcular_dano_com_detalhes(
-    ataque: int,
-    defesa: int,
-    rng: random.Random | None = None,
-) -> tuple[int, str]:
-    """Retorne o dano e o breakdown do cálculo para logs detalhados."""
-    rng = rng or random
-    variacao = rng.uniform(0.8, 1.2)
-    dano_bruto = ataque * variacao
-    dano_sem_piso = max(0, int(dano_bruto - defesa))
-    piso_aplicado = dano_sem_piso <= 0 and ataque > 0
-    # Garante progresso no combate, evitando lutas infinitas por defesa alta.
-    dano_final = 1 if piso_aplicado else dano_sem_piso
-    detalhe = f"(ATK {ataque} x {variacao:.2f} - DEF {defesa} -> {dano_final}" + (
-        ", piso mínimo)" if piso_aplicado else ")"
-    )
-    return dano_final, detalhe
+def auto_resolver_ativo() -> bool:
+    """Leia a preferência que libera a auto-resolução de encontros triviais (sem I/O)."""
+    return bool(atualizador.preferencia("combate_auto_resolver", False))
 
 
-def _breakdown_ativo() -> bool:
-    """Leia preferência de breakdown de dano para o log de combate."""
-    try:
-        preferencias = atualizador.carregar_preferencias()
-    except (OSError, ValueError):
-        return False
-    return bool(preferencias.get("combat_log_breakdown", False))
+def combate_trivial(jogador: Personagem, inimigo: Inimigo) -> bool:
+    """Indica se a vitória é praticamente certa e a luta pode ser resolvida de uma vez."""
+    previsao = prever_combate_entidades(jogador, inimigo)
+    return previsao.chance_vitoria >= config.COMBATE_AUTO_RESOLVER_CHANCE_MIN
 
 
 def iniciar_combate(
@@ -46,90 +52,87 @@ def iniciar_combate(
     inimigo: Inimigo,
     usar_item_callback: Callable[[Personagem], bool],
     rng: random.Random | None = None,
+    relogio: Relogio | None = None,
 ) -> tuple[bool, Inimigo]:
-    """Inicia e gerencia um loop de combate por turnos com a nova UI."""
-    rng = rng or random
-    log_combate = [f"Um {inimigo.nome} selvagem aparece!"]
-    mostrar_breakdown = _breakdown_ativo()
+    """Conduz o combate pela UI, delegando as regras ao motor de combate.
+
+    As pausas de feedback passam por `relogio` (padrão: pausas reais), permitindo
+    que sessões roteirizadas e testes rodem sem esperar.
+    """
+    relogio = relogio or RELOGIO_REAL
+    estado = EstadoCombate(
+        jogador=jogador,
+        inimigo=inimigo,
+        rng=rng,
+        usar_item=usar_item_callback,
+        mostrar_breakdown=_breakdown_ativo(),
+    )
 
-    while jogador.esta_vivo() and inimigo.esta_vivo():
-        escolha = desenhar_tela_combate(jogador, inimigo, log_combate)
+    while not estado.encerrado:
+        escolha = desenhar_tela_combate(jogador, inimigo, estado.log)
 
         if escolha.lower() == "l":
-            desenhar_log_completo(log_combate)
+            desenhar_log_completo(estado.log)
+            continue
+
+        acao = _ACOES_POR_ESCOLHA.get(escolha)
+        if acao is None:
+            estado.registrar("Opção inválida! Tente novamente.")
+            relogio.pausar(PAUSA_FEEDBACK)
             continue
 
-        if escolha == "1":
-            # Turno do Jogador
-            dano_causado, detalhe_ataque = _calcular_dano_com_detalhes(
-                jogador.ataque, inimigo.defesa, rng=rng
-            )
-            inimigo.hp -= dano_causado
-            msg_ataque = f"Você ataca o {inimigo.nome} e causa {dano_causado} de dano!"
-            if mostrar_breakdown:
-                msg_ataque = f"{msg_ataque} {detalhe_ataque}"
-            log_combate.append(msg_ataque)
-
-            if not inimigo.esta_vivo():
-                log_combate.append(f"Você derrotou o {inimigo.nome}!")
-                break
-
-            # Turno do Inimigo
-            dano_recebido, detalhe_defesa = _calcular_dano_com_detalhes(
-                inimigo.ataque, jogador.defesa, rng=rng
-            )
-            jogador.hp -= dano_recebido
-            msg_defesa = f"O {inimigo.nome} ataca e causa {dano_recebido} de dano em você!"
-            if mostrar_breakdown:
-                msg_defesa = f"{msg_defesa} {detalhe_defesa}"
-            log_combate.append(msg_defesa)
-
-            if not jogador.esta_vivo():
-                log_combate.append("Você foi derrotado...")
-                break
-
-        elif escolha == "2":
-            if usar_item_callback(jogador):
-                log_combate.append("Você usou um item e recuperou vida!")
-                # Turno do Inimigo após usar item
-                dano_recebido, detalhe_defesa = _calcular_dano_com_detalhes(
-                    inimigo.ataque, jogador.defesa, rng=rng
-                )
-                jogador.hp -= dano_recebido
-                mensagem_ataque = (
-                    f"O {inimigo.nome} ataca enquanto você se curava e "
-                    f"causa {dano_recebido} de dano!"
-                )
-                if mostrar_breakdown:
-                    mensagem_ataque = f"{mensagem_ataque} {detalhe_defesa}"
-                log_combate.append(mensagem_ataque)
-            else:
-                log_combate.append("Você não tem itens consumíveis ou decidiu não usar.")
-                continue
-
-        elif escolha == "3":
-            chance_de_fuga = 0.5
-            if rng.random() < chance_de_fuga:
-                log_combate.append("Você conseguiu fugir!")
-                # Não pedimos nova entrada aqui; apenas mostramos feedback rápido
-                # para então retornar ao estado de exploração.
-                # (Desenhar a tela de combate novamente forçava o jogador a digitar
-                # outra ação mesmo após escapar.)
-                time.sleep(1)
-                return False, inimigo
-            log_combate.append("Você tentou fugir, mas falhou!")
-            # Turno do Inimigo após falha na fuga
-            dano_recebido, detalhe_defesa = _calcular_dano_com_detalhes(
-                inimigo.ataque, jogador.defesa, rng=rng
-            )
-            jogador.hp -= dano_recebido
-            msg_fuga = f"O {inimigo.nome} ataca e causa {dano_recebido} de dano!"
-            if mostrar_breakdown:
-                msg_fuga = f"{msg_fuga} {detalhe_defesa}"
-            log_combate.append(msg_fuga)
-
-        else:
-            log_combate.append("Opção inválida! Tente novamente.")
-            time.sleep(1)
+        if estado.step(acao) is ResultadoCombate.FUGA:
+            # Não pedimos nova entrada aqui; apenas mostramos feedback rápido
+            # para então retornar ao estado de exploração.
+            # (Desenhar a tela de combate novamente forçava o jogador a digitar
+            # outra ação mesmo após escapar.)
+            relogio.pausar(PAUSA_FEEDBACK)
+            return False, inimigo
 
     return jogador.esta_vivo(), inimigo
+
+
+def resolver_combate_automatico(
+    jogador: Personagem,
+    inimigo: Inimigo,
+    rng: random.Random | None = None,
+    usar_item_callback: Callable[[Personagem], bool] | None = None,
+    relogio: Relogio | None = None,
+) -> tuple[bool, Inimigo]:
+    """Resolve a luta inteira com as regras do motor e mostra só o resumo final.
+
+    Usa a política "sempre atacar" sobre o mesmo RNG da run, então o resultado é
+    idêntico ao de atacar em todos os turnos pela tela de combate. Se o limite de
+    turnos do motor chegar sem desfecho, a luta continua pela tela de combate a partir
+    do ponto em que parou (com `usar_item_callback` e `relogio`).
+    """
+    hp_antes = jogador.hp
+    estado = resolver_combate(jogador, inimigo, rng=rng)
+    if estado.resultado is None:
+        desenhar_tela_evento(
+            "COMBATE PROLONGADO",
+            f"A luta contra o {inimigo.nome} se arrasta por {estado.turnos} turnos sem "
+            f"desfecho.\nHP: {jogador.hp}/{jogador.hp_max}\nAssuma o controle do combate.",
+        )
+        return iniciar_combate(
+            jogador,
+            inimigo,
+            usar_item_callback or _sem_item_utilizavel,
+            rng=rng,
+            relogio=relogio,
+        )
+    venceu = estado.resultado is ResultadoCombate.VITORIA
+    linhas = [
+        f"Você enfrenta o {inimigo.nome} sem dificuldade."
+        if venceu
+        else f"O {inimigo.nome} surpreende você!",
+        f"Turnos: {estado.turnos}",
+        f"Dano recebido: {max(0, hp_antes - jogador.hp)}",
+        f"HP: {max(0, jogador.hp)}/{jogador.hp_max}",
+    ]
+    desenhar_tela_evento("COMBATE RESOLVIDO", "\n".join(linhas))
+    return venceu, inimigo
+
+
+def _sem_item_utilizavel(_jogador: Personagem) -> bool:
+    return False
@@ -5,6 +5,10 @@ from dataclasses import dataclass
 MAP_WIDTH = 10
 MAP_HEIGHT = 10
 MAP_SIDE_ROOMS_RATIO = 0.25
+MAP_TAMANHO_MIN = 5
+MAP_TAMANHO_MAX = 1024
+# Andares gerados mantidos no cache LRU (por sub-seed e parâmetros de geração)
+MAP_CACHE_ANDARES = 16
 MAP_ENEMY_PROBABILITY = 0.55
 MAP_ENEMY_PROBABILITY_ESCALONAMENTO = 0.07
 MAP_ENEMY_PROBABILITY_MIN = 0.35
@@ -51,6 +55,11 @@ CHEFE_XP_MULT_BASE = 1.7
 CHEFE_XP_MULT_STEP = 0.1
 CHEFE_XP_MULT_MAX = 2.2
 
+# Auto-resolução de encontros triviais (opt-in via `combate_auto_resolver` em settings.json)
+COMBATE_AUTO_RESOLVER_CHANCE_MIN = 0.999
+# Entradas do log de combate mantidas em memória antes de despejar as antigas em disco
+COMBATE_LOG_LIMITE_MEMORIA = 200
+
 
 @dataclass(frozen=True)
 class DificuldadePerfil:
@@ -105,6 +114,17 @@ DIFICULDADE_PADRAO = "normal"
 
 # Número máximo de slots de save suportados (pode ser ajustado futuramente).
 MAX_SAVE_SLOTS = 5
+# Compressão dos saves: None grava JSON puro; "zlib" ou "lzma" gravam o contêiner
+# binário com CRC32 (`src/container_save.py`). Os dois formatos são sempre lidos.
+SAVE_COMPRESSAO: str | None = None
+# Saves incrementais anexados ao diário do slot antes de compactá-lo num snapshot.
+SAVE_DIARIO_COMPACTAR_A_CADA = 20
+# Autosave (`src/autosave.py`): salva ao descer de andar, ao derrotar um chefe e a cada
+# N turnos, sem passar de um save por intervalo mínimo nem do teto de bytes por minuto.
+AUTOSAVE_ATIVO = True
+AUTOSAVE_A_CADA_TURNOS = 50
+AUTOSAVE_INTERVALO_MIN_S = 15.0
+AUTOSAVE_BYTES_POR_MINUTO = 1024 * 1024
 
 # Minimap e controles alternativos
 MINIMAPA_ATIVO = True
@@ -0,0 +1,89 @@
+"""Contêiner binário opcional para os saves: cabeçalho com CRC32 e corpo comprimido.
+
+Layout (big-endian):
+
+    magic (8 bytes) | versão do contêiner (u16) | schema do save (u16)
+    | algoritmo (u8) | tamanho do corpo (u32) | CRC32 do corpo (u32) | corpo
+
+O CRC cobre o corpo já comprimido, então um arquivo truncado ou corrompido é
+recusado antes de qualquer descompressão ou parse de JSON.
+"""
+
+from __future__ import annotations
+
+import lzma
+import struct
+import zlib
+from dataclasses import dataclass
+
+MAGIC = b"RPGSAVE\x00"
+VERSAO_CONTAINER = 1
+_CABECALHO = struct.Struct(">8sHHBII")
+TAMANHO_CABECALHO = _CABECALHO.size
+
+ALGORITMOS: dict[str, int] = {"nenhum": 0, "zlib": 1, "lzma": 2}
+_NOMES_ALGORITMO = {codigo: nome for nome, codigo in ALGORITMOS.items()}
+
+
+@dataclass(frozen=True)
+class CabecalhoSave:
+    """Campos do cabeçalho, legíveis sem descomprimir o corpo."""
+
+    versao: int
+    schema: int
+    algoritmo: str
+    tamanho: int
+    crc32: int
+
+
+def eh_container(dados: bytes) -> bool:
+    """Indica se `dados` começa com o magic do contêiner (e não com JSON puro)."""
+    return dados.startswith(MAGIC)
+
+
+def empacotar(corpo: bytes, schema: int, algoritmo: str = "zlib") -> bytes:
+    """Comprime `corpo` e o precede com o cabeçalho do contêiner."""
+    codigo = ALGORITMOS.get(algoritmo)
+    if codigo is None:
+        raise ValueError(f"Algoritmo de compressão desconhecido: {algoritmo!r}.")
+    if algoritmo == "zlib":
+        comprimido = zlib.compress(corpo, level=6)
+    elif algoritmo == "lzma":
+        comprimido = lzma.compress(corpo)
+    else:
+        comprimido = corpo
+    cabecalho = _CABECALHO.pack(
+        MAGIC, VERSAO_CONTAINER, schema, codigo, len(comprimido), zlib.crc32(comprimido)
+    )
+    return cabecalho + comprimido
+
+
+def ler_cabecalho(dados: bytes) -> CabecalhoSave:
+    """Decodifica e confere o cabeçalho, disparando `ValueError` se for inválido."""
+    if len(dados) < TAMANHO_CABECALHO or not eh_container(dados):
+        raise ValueError("Cabeçalho do save ausente ou truncado.")
+    _, versao, schema, codigo, tamanho, crc = _CABECALHO.unpack_from(dados)
+    if versao != VERSAO_CONTAINER:
+        raise ValueError(f"Versão do contêiner de save não suportada: {versao}.")
+    algoritmo = _NOMES_ALGORITMO.get(codigo)
+    if algoritmo is None:
+        raise ValueError(f"Algoritmo de compressão desconhecido no save: {codigo}.")
+    return CabecalhoSave(versao, schema, algoritmo, tamanho, crc)
+
+
+def desempacotar(dados: bytes) -> bytes:
+    """Confere tamanho e CRC32 e só então descomprime o corpo."""
+    cabecalho = ler_cabecalho(dados)
+    corpo = memoryview(dados)[TAMANHO_CABECALHO:]
+    if len(corpo) != cabecalho.tamanho:
+        raise ValueError("Save truncado: tamanho do corpo não confere com o cabeçalho.")
+    if zlib.crc32(corpo) != cabecalho.crc32:
+        raise ValueError("Save corrompido: CRC32 não confere.")
+    try:
+        if cabecalho.algoritmo == "zlib":
+            return zlib.decompress(corpo)
+        if cabecalho.algoritmo == "lzma":
+            return lzma.decompress(corpo)
+    except (zlib.error, lzma.LZMAError) as erro:
+        raise ValueError("Corpo do save não pôde ser descomprimido.") from erro
+    return bytes(corpo)
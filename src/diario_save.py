@@ -0,0 +1,142 @@
+"""Diário (journal) de saves incrementais: deltas do estado anexados a um arquivo.
+
+Cada save incremental grava só o que mudou desde o save anterior: campos do topo do
+estado, campos do jogador e salas do mapa codificado (`src.codec_mapa`). O diário é
+um arquivo de linhas `"<crc32 hex> <json>"` ao lado do snapshot; cada linha carrega o
+`id` do snapshot a que pertence, então linhas de um snapshot antigo (ou do `.bak`)
+nunca são aplicadas sobre outro. A leitura para na primeira linha truncada ou com CRC
+divergente: é o que sobra de uma escrita interrompida.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Any
+
+from src.codec_mapa import mapa_codificado
+
+_AUSENTE = object()
+# Chaves do mapa codificado que definem o layout; se mudarem, o mapa vai inteiro.
+_CHAVES_LAYOUT = ("formato", "largura", "altura", "padrao", "paredes")
+
+
+def caminho_diario(caminho_save: Path) -> Path:
+    """Retorna o arquivo de diário que acompanha o snapshot `caminho_save`."""
+    return caminho_save.with_suffix(f"{caminho_save.suffix}.journal")
+
+
+def diferenca_estado(anterior: dict[str, Any], atual: dict[str, Any]) -> dict[str, Any]:
+    """Calcula o delta que transforma `anterior` em `atual` (vazio se nada mudou)."""
+    delta: dict[str, Any] = {}
+    campos: dict[str, Any] = {}
+    for chave, valor in atual.items():
+        antigo = anterior.get(chave, _AUSENTE)
+        if chave == "jogador" and isinstance(antigo, dict) and isinstance(valor, dict):
+            delta_jogador = _diferenca_campos(antigo, valor)
+            if delta_jogador:
+                delta["jogador"] = delta_jogador
+        elif chave == "mapa" and _mesmo_layout(antigo, valor):
+            salas = {
+                str(indice): sala
+                for indice, (sala_antiga, sala) in enumerate(
+                    zip(antigo["salas"], valor["salas"], strict=True)  # type: ignore[index]
+                )
+                if sala_antiga != sala
+            }
+            if salas:
+                delta["salas"] = salas
+        elif antigo != valor:
+            campos[chave] = valor
+    if campos:
+        delta["campos"] = campos
+    removidos = [chave for chave in anterior if chave not in atual]
+    if removidos:
+        delta["removidos"] = removidos
+    return delta
+
+
+def aplicar_delta(estado: dict[str, Any], delta: dict[str, Any]) -> None:
+    """Aplica no lugar um delta gerado por `diferenca_estado`."""
+    estado.update(delta.get("campos", {}))
+    for chave in delta.get("removidos", []):
+        estado.pop(chave, None)
+    delta_jogador = delta.get("jogador")
+    if delta_jogador:
+        jogador = estado.setdefault("jogador", {})
+        jogador.update(delta_jogador.get("campos", {}))
+        for chave in delta_jogador.get("removidos", []):
+            jogador.pop(chave, None)
+    salas_alteradas = delta.get("salas")
+    if salas_alteradas:
+        salas = estado["mapa"]["salas"]
+        for indice, sala in salas_alteradas.items():
+            salas[int(indice)] = sala
+
+
+def codificar_entrada(entrada: dict[str, Any]) -> bytes:
+    """Serializa uma entrada do diário como uma linha `<crc32 hex> <json>`."""
+    corpo = json.dumps(entrada, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return b"%08x " % zlib.crc32(corpo) + corpo + b"\n"
+
+
+def anexar_entrada(caminho: Path, entrada: dict[str, Any]) -> int:
+    """Anexa a entrada ao diário, força a escrita em disco e retorna os bytes gravados."""
+    linha = codificar_entrada(entrada)
+    with caminho.open("ab") as arquivo:
+        arquivo.write(linha)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    return len(linha)
+
+
+def ler_entradas(caminho: Path, id_snapshot: str) -> list[dict[str, Any]]:
+    """Lê as entradas válidas do diário pertencentes ao snapshot `id_snapshot`."""
+    try:
+        conteudo = caminho.read_bytes()
+    except OSError:
+        return []
+    entradas: list[dict[str, Any]] = []
+    for linha in conteudo.split(b"\n"):
+        entrada = _decodificar_linha(linha)
+        if entrada is None:
+            break
+        if entrada.get("id") == id_snapshot:
+            entradas.append(entrada)
+    return entradas
+
+
+def _decodificar_linha(linha: bytes) -> dict[str, Any] | None:
+    crc_hex, _, corpo = linha.partition(b" ")
+    try:
+        if len(crc_hex) != 8 or int(crc_hex, 16) != zlib.crc32(corpo):
+            return None
+        entrada = json.loads(corpo.decode("utf-8"))
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return entrada if isinstance(entrada, dict) else None
+
+
+def _diferenca_campos(anterior: dict[str, Any], atual: dict[str, Any]) -> dict[str, Any]:
+    delta: dict[str, Any] = {}
+    campos = {
+        chave: valor for chave, valor in atual.items() if anterior.get(chave, _AUSENTE) != valor
+    }
+    if campos:
+        delta["campos"] = campos
+    removidos = [chave for chave in anterior if chave not in atual]
+    if removidos:
+        delta["removidos"] = removidos
+    return delta
+
+
+def _mesmo_layout(anterior: object, atual: object) -> bool:
+    if not isinstance(anterior, dict) or not isinstance(atual, dict):
+        return False
+    if not (mapa_codificado(anterior) and mapa_codificado(atual)):
+        return False
+    return all(anterior.get(chave) == atual.get(chave) for chave in _CHAVES_LAYOUT) and len(
+        anterior["salas"]
+    ) == len(atual["salas"])
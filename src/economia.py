@@ -16,7 +16,7 @@ BRONZE_POR_PRATA = 10
 BRONZE_POR_OURO = 100
 
 
-@dataclass
+@dataclass(slots=True)
 class Moeda:
     """Armazena valores monetários sempre em bronze."""
 
@@ -1,7 +1,21 @@
-"""Define as estruturas de dados centrais (dataclasses) do jogo."""
+"""Define as estruturas de dados centrais (dataclasses) do jogo.
 
-from collections.abc import Mapping
-from dataclasses import asdict, dataclass, field
+Os `to_dict` são escritos à mão, campo a campo, em vez de `dataclasses.asdict`: geram
+o mesmo JSON numa única passada, sem a cópia profunda recursiva por reflexão. Um campo
+novo precisa entrar também no `to_dict` da classe (os testes comparam com `asdict`).
+
+Todas as entidades usam `__slots__` (sem `__dict__` por instância), o que pesa em mapas
+grandes e inventários longos. `Item` e `Motivacao` nunca mudam depois de criados e são
+congelados; inimigos, salas, status e o personagem continuam mutáveis.
+
+Itens do catálogo são protótipos compartilhados (flyweight, ver `src.gerador_itens`), com
+`bonus`/`efeito` em `DicionarioCongelado` para que nenhum drop altere os demais; o
+`Inventario` guarda pilhas `(item, quantidade)` indexadas por `chave_item`, em vez de uma
+cópia por unidade; no save ele continua sendo a lista plana de itens de sempre.
+"""
+
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import MISSING, dataclass, field, fields
 from typing import Any
 
 from src.economia import Moeda
@@ -12,7 +26,30 @@ _TIPO_ITEM_CANONICO_POR_NOME = {
 }
 
 
-@dataclass
+class DicionarioCongelado(dict[str, int]):
+    """`dict` somente leitura para `Item.bonus`/`Item.efeito`.
+
+    Itens do catálogo são protótipos compartilhados por todos os drops; um `bonus`
+    alterado num deles mudaria todos os outros. Leitura, comparação, JSON, cópia e
+    pickle funcionam como num `dict`; qualquer alteração dispara `TypeError`.
+    """
+
+    __slots__ = ()
+
+    def _imutavel(self, *_args: object, **_kwargs: object) -> None:
+        raise TypeError("Bônus e efeitos de itens são imutáveis.")
+
+    __setitem__ = __delitem__ = __ior__ = _imutavel  # type: ignore[assignment]
+    clear = pop = popitem = setdefault = update = _imutavel  # type: ignore[assignment]
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        return hash(frozenset(self.items()))
+
+    def __reduce__(self) -> tuple[object, ...]:
+        return (type(self), (dict(self),))
+
+
+@dataclass(frozen=True, slots=True)
 class Item:
     """Representa um item no jogo, seja equipável ou consumível."""
 
@@ -23,9 +60,23 @@ class Item:
     efeito: dict[str, int] = field(default_factory=dict)  # {"hp": 20}
     preco_bronze: int = 0
 
+    def __post_init__(self) -> None:
+        """Congela `bonus` e `efeito`, que podem ser compartilhados entre drops."""
+        for campo in ("bonus", "efeito"):
+            valor = getattr(self, campo)
+            if not isinstance(valor, DicionarioCongelado):
+                object.__setattr__(self, campo, DicionarioCongelado(valor or {}))
+
     def to_dict(self) -> dict[str, Any]:
         """Retorna o dicionário da instância."""
-        return asdict(self)
+        return {
+            "nome": self.nome,
+            "tipo": self.tipo,
+            "descricao": self.descricao,
+            "bonus": dict(self.bonus),
+            "efeito": dict(self.efeito),
+            "preco_bronze": self.preco_bronze,
+        }
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Item":
@@ -42,7 +93,127 @@ class Item:
         return cls(**payload)
 
 
-@dataclass
+type ChaveItem = tuple[str, str, str, int, tuple[tuple[str, int], ...], tuple[tuple[str, int], ...]]
+
+
+def chave_item(item: Item) -> ChaveItem:
+    """Retorna a chave que identifica itens intercambiáveis (mesmos campos)."""
+    return (
+        item.nome,
+        item.tipo,
+        item.descricao,
+        item.preco_bronze,
+        tuple(sorted((item.bonus or {}).items())),
+        tuple(sorted((item.efeito or {}).items())),
+    )
+
+
+class Inventario:
+    """Itens do personagem agrupados em pilhas `(item, quantidade)` indexadas pela chave.
+
+    Aceita o uso de lista que o jogo faz (`append`, `remove`, iteração, `len`, `in`,
+    índice), mas guarda um único `Item` por pilha. A iteração devolve cada unidade,
+    pilha a pilha, na ordem em que cada pilha apareceu; unidades iguais ficam juntas.
+    """
+
+    __slots__ = ("_itens", "_quantidades", "_total")
+
+    def __init__(self, itens: Iterable[Item] = ()) -> None:
+        self._itens: dict[ChaveItem, Item] = {}
+        self._quantidades: dict[ChaveItem, int] = {}
+        self._total = 0
+        self.extend(itens)
+
+    def append(self, item: Item, quantidade: int = 1) -> None:
+        """Adiciona unidades do item, empilhando com as iguais já presentes."""
+        chave = chave_item(item)
+        if chave in self._quantidades:
+            self._quantidades[chave] += quantidade
+        else:
+            self._itens[chave] = item
+            self._quantidades[chave] = quantidade
+        self._total += quantidade
+
+    def extend(self, itens: Iterable[Item]) -> None:
+        """Adiciona cada item de `itens`."""
+        for item in itens:
+            self.append(item)
+
+    def remove(self, item: Item) -> None:
+        """Remove uma unidade igual a `item`; `ValueError` se não houver (como em `list`)."""
+        self.remover_chave(chave_item(item))
+
+    def remover_chave(self, chave: ChaveItem) -> Item:
+        """Remove e retorna uma unidade da pilha `chave` em O(1)."""
+        quantidade = self._quantidades.get(chave)
+        if quantidade is None:
+            raise ValueError("Item não encontrado no inventário para a chave informada.")
+        item = self._itens[chave]
+        if quantidade == 1:
+            del self._quantidades[chave], self._itens[chave]
+        else:
+            self._quantidades[chave] = quantidade - 1
+        self._total -= 1
+        return item
+
+    def quantidade(self, chave: ChaveItem) -> int:
+        """Retorna quantas unidades a pilha `chave` tem (0 se não existir)."""
+        return self._quantidades.get(chave, 0)
+
+    def pilhas(self) -> Iterator[tuple[ChaveItem, Item, int]]:
+        """Percorre as pilhas como `(chave, item, quantidade)`."""
+        for chave, quantidade in self._quantidades.items():
+            yield chave, self._itens[chave], quantidade
+
+    def clear(self) -> None:
+        """Esvazia o inventário."""
+        self._itens.clear()
+        self._quantidades.clear()
+        self._total = 0
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __iter__(self) -> Iterator[Item]:
+        for chave, quantidade in self._quantidades.items():
+            item = self._itens[chave]
+            for _ in range(quantidade):
+                yield item
+
+    def __contains__(self, item: object) -> bool:
+        return isinstance(item, Item) and chave_item(item) in self._quantidades
+
+    def __getitem__(self, indice: int) -> Item:
+        if indice < 0:
+            indice += self._total
+        if not 0 <= indice < self._total:
+            raise IndexError("Índice fora do inventário.")
+        for chave, quantidade in self._quantidades.items():
+            if indice < quantidade:
+                return self._itens[chave]
+            indice -= quantidade
+        raise IndexError("Índice fora do inventário.")
+
+    def __eq__(self, outro: object) -> bool:
+        if isinstance(outro, Inventario):
+            return self._quantidades == outro._quantidades
+        if isinstance(outro, list):
+            return list(self) == outro
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        pilhas = ", ".join(f"{item.nome} x{quantidade}" for _, item, quantidade in self.pilhas())
+        return f"Inventario([{pilhas}])"
+
+
+def como_inventario(itens: Iterable[Item]) -> Inventario:
+    """Retorna `itens` se já for um `Inventario`; senão empilha os itens num novo."""
+    return itens if isinstance(itens, Inventario) else Inventario(itens)
+
+
+@dataclass(slots=True)
 class Entidade:
     """Classe base para Jogador e Inimigo."""
 
@@ -57,7 +228,7 @@ class Entidade:
         return self.hp > 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Inimigo(Entidade):
     """Representa um inimigo no jogo."""
 
@@ -67,17 +238,24 @@ class Inimigo(Entidade):
 
     def to_dict(self) -> dict[str, Any]:
         """Retorna o dicionário da instância."""
-        return asdict(self)
+        return {
+            "nome": self.nome,
+            "hp": self.hp,
+            "hp_max": self.hp_max,
+            "ataque": self.ataque,
+            "defesa": self.defesa,
+            "xp_recompensa": self.xp_recompensa,
+            "drop_raridade": self.drop_raridade,
+            "drop_item_nome": self.drop_item_nome,
+        }
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Inimigo":
         """Cria uma instância de Inimigo a partir de um dicionário."""
-        payload = data.copy()
-        payload.setdefault("drop_item_nome", None)
-        return cls(**payload)
+        return cls(**{"drop_item_nome": None, **data})
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Motivacao:
     """Motivação narrativa do personagem."""
 
@@ -87,10 +265,10 @@ class Motivacao:
 
     def to_dict(self) -> dict[str, Any]:
         """Serializa a motivação."""
-        return asdict(self)
+        return {"id": self.id, "titulo": self.titulo, "descricao": self.descricao}
 
 
-@dataclass
+@dataclass(slots=True)
 class StatusTemporario:
     """Bônus ou penalidade que dura um número limitado de combates."""
 
@@ -99,8 +277,17 @@ class StatusTemporario:
     combates_restantes: int
     descricao: str = ""
 
+    def to_dict(self) -> dict[str, Any]:
+        """Serializa o status temporário."""
+        return {
+            "atributo": self.atributo,
+            "valor": self.valor,
+            "combates_restantes": self.combates_restantes,
+            "descricao": self.descricao,
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class Personagem(Entidade):
     """Representa o personagem do jogador."""
 
@@ -112,7 +299,7 @@ class Personagem(Entidade):
     nivel: int
     xp_atual: int
     xp_para_proximo_nivel: int
-    inventario: list[Item] = field(default_factory=list)
+    inventario: Inventario = field(default_factory=Inventario)
     equipamento: dict[str, Item | None] = field(
         default_factory=lambda: {"arma": None, "armadura": None, "escudo": None}
     )
@@ -120,35 +307,37 @@ class Personagem(Entidade):
     status_temporarios: list[StatusTemporario] = field(default_factory=list)
     motivacao: Motivacao | None = None
 
+    def __post_init__(self) -> None:
+        """Empilha o inventário recebido como lista."""
+        self.inventario = como_inventario(self.inventario)
+
     def to_dict(self) -> dict[str, Any]:
         """Retorna o dicionário da instância.
 
-        Inclui equipamento e inventário.
+        Inclui equipamento e inventário (a lista plana de itens, uma entrada por unidade).
         """
-        data = asdict(self)
-        data["equipamento"]["arma"] = (
-            self.equipamento["arma"].to_dict() if self.equipamento["arma"] else None
-        )
-        data["equipamento"]["armadura"] = (
-            self.equipamento["armadura"].to_dict() if self.equipamento["armadura"] else None
-        )
-        data["equipamento"]["escudo"] = (
-            self.equipamento["escudo"].to_dict() if self.equipamento["escudo"] else None
-        )
-        data["inventario"] = [item.to_dict() for item in self.inventario]
-        data["carteira"] = self.carteira.to_dict()
-        data["status_temporarios"] = [
-            {
-                "atributo": s.atributo,
-                "valor": s.valor,
-                "combates_restantes": s.combates_restantes,
-                "descricao": s.descricao,
-            }
-            for s in self.status_temporarios
-        ]
-        if self.motivacao:
-            data["motivacao"] = self.motivacao.to_dict()
-        return data
+        return {
+            "nome": self.nome,
+            "hp": self.hp,
+            "hp_max": self.hp_max,
+            "ataque": self.ataque,
+            "defesa": self.defesa,
+            "classe": self.classe,
+            "ataque_base": self.ataque_base,
+            "defesa_base": self.defesa_base,
+            "x": self.x,
+            "y": self.y,
+            "nivel": self.nivel,
+            "xp_atual": self.xp_atual,
+            "xp_para_proximo_nivel": self.xp_para_proximo_nivel,
+            "inventario": [item.to_dict() for item in self.inventario],
+            "equipamento": {
+                slot: item.to_dict() if item else None for slot, item in self.equipamento.items()
+            },
+            "carteira": self.carteira.to_dict(),
+            "status_temporarios": [status.to_dict() for status in self.status_temporarios],
+            "motivacao": self.motivacao.to_dict() if self.motivacao else None,
+        }
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Personagem":
@@ -174,7 +363,7 @@ class Personagem(Entidade):
         status_raw = payload.pop("status_temporarios", [])
         motivacao_raw = payload.pop("motivacao", None)
 
-        inventario: list[Item] = []
+        inventario = Inventario()
         for item_data in inventario_raw:
             item = _hidratar_item(item_data)
             if item:
@@ -220,7 +409,7 @@ class Personagem(Entidade):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Sala:
     """Representa uma sala do mapa."""
 
@@ -253,40 +442,50 @@ class Sala:
 
     def to_dict(self) -> dict[str, Any]:
         """Serializa a sala para dicionário, convertendo inimigos se necessário."""
-        data = asdict(self)
-        if self.inimigo_atual:
-            data["inimigo_atual"] = self.inimigo_atual.to_dict()
-        return data
+        return {
+            "tipo": self.tipo,
+            "nome": self.nome,
+            "descricao": self.descricao,
+            "pode_ter_inimigo": self.pode_ter_inimigo,
+            "visitada": self.visitada,
+            "inimigo_derrotado": self.inimigo_derrotado,
+            "inimigo_atual": self.inimigo_atual.to_dict() if self.inimigo_atual else None,
+            "chefe": self.chefe,
+            "chefe_id": self.chefe_id,
+            "chefe_tipo": self.chefe_tipo,
+            "chefe_nome": self.chefe_nome,
+            "chefe_descricao": self.chefe_descricao,
+            "chefe_titulo": self.chefe_titulo,
+            "chefe_historia": self.chefe_historia,
+            "chefe_intro_exibida": self.chefe_intro_exibida,
+            "trama_id": self.trama_id,
+            "trama_nome": self.trama_nome,
+            "trama_desfecho": self.trama_desfecho,
+            "trama_texto": self.trama_texto,
+            "trama_resolvida": self.trama_resolvida,
+            "trama_inimigo_tipo": self.trama_inimigo_tipo,
+            "trama_consequencia_aplicada": self.trama_consequencia_aplicada,
+            "trama_consequencia_texto": self.trama_consequencia_texto,
+            "nivel_area": self.nivel_area,
+            "evento_id": self.evento_id,
+            "evento_resolvido": self.evento_resolvido,
+        }
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Sala":
-        """Restaura uma sala a partir do dicionário serializado."""
-        payload = data.copy()
-        inimigo_raw = payload.get("inimigo_atual")
-        if isinstance(inimigo_raw, dict):
-            payload["inimigo_atual"] = Inimigo.from_dict(inimigo_raw)
-        else:
-            payload["inimigo_atual"] = None
-        payload.setdefault("visitada", False)
-        payload.setdefault("inimigo_derrotado", False)
-        payload.setdefault("pode_ter_inimigo", False)
-        payload.setdefault("chefe", False)
-        payload.setdefault("chefe_id", None)
-        payload.setdefault("chefe_tipo", None)
-        payload.setdefault("chefe_nome", None)
-        payload.setdefault("chefe_descricao", None)
-        payload.setdefault("chefe_titulo", None)
-        payload.setdefault("chefe_historia", None)
-        payload.setdefault("chefe_intro_exibida", False)
-        payload.setdefault("trama_id", None)
-        payload.setdefault("trama_nome", None)
-        payload.setdefault("trama_desfecho", None)
-        payload.setdefault("trama_texto", None)
-        payload.setdefault("trama_resolvida", False)
-        payload.setdefault("trama_inimigo_tipo", None)
-        payload.setdefault("trama_consequencia_aplicada", False)
-        payload.setdefault("trama_consequencia_texto", None)
-        payload.setdefault("nivel_area", 1)
-        payload.setdefault("evento_id", None)
-        payload.setdefault("evento_resolvido", False)
+        """Restaura uma sala a partir do dicionário serializado.
+
+        Campos ausentes (saves antigos, deltas do codec) valem o padrão de `PADROES_SALA`.
+        """
+        payload = {**PADROES_SALA, **data}
+        inimigo_raw = payload["inimigo_atual"]
+        payload["inimigo_atual"] = (
+            Inimigo.from_dict(inimigo_raw) if isinstance(inimigo_raw, dict) else None
+        )
         return cls(**payload)
+
+
+# Valor de cada campo opcional de `Sala` quando ausente no dicionário (todos imutáveis).
+PADROES_SALA: dict[str, Any] = {
+    campo.name: campo.default for campo in fields(Sala) if campo.default is not MISSING
+}
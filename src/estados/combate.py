@@ -5,6 +5,7 @@ from contextlib import suppress
 from enum import Enum
 from typing import Protocol
 
+from src.autosave import MOTIVO_CHEFE
 from src.entidades import Inimigo, Item, Personagem, Sala
 from src.gerador_itens import obter_item_por_nome
 from src.ui import desenhar_tela_evento, tela_game_over
@@ -66,6 +67,8 @@ def executar_estado_combate(
         ):
             contexto.chefe_mais_profundo_nivel = contexto.nivel_masmorra
             contexto.chefe_mais_profundo_nome = sala.chefe_nome or inimigo.nome
+        if sala.chefe and hasattr(contexto, "autosave"):
+            contexto.autosave.marcar(MOTIVO_CHEFE)
         item_dropado: Item | None = None
         if getattr(inimigo_atualizado, "drop_item_nome", None):
             item_dropado = obter_item_por_nome(inimigo_atualizado.drop_item_nome or "")
@@ -4,14 +4,20 @@ from __future__ import annotations
 
 import random
 from collections.abc import Callable
+from functools import partial
 from typing import Any, Protocol
 
 from src import config, eventos
+from src.aleatoriedade import fluxo_rng
 from src.chefes import obter_chefe_por_id
 from src.entidades import Personagem, Sala
 from src.gerador_inimigos import gerar_inimigo
-from src.gerador_mapa import gerar_mapa
-from src.tramas import gerar_pista_trama
+from src.gerador_mapa import chave_trama, gerar_mapa
+from src.gerador_mapa import gerar_andar as gerar_andar_da_seed
+from src.mapa_compacto import Mapa
+from src.pregeracao import ChaveAndar, PreGeradorAndares
+from src.previsao_combate import prever_combate_entidades
+from src.tramas import TramaAtiva, gerar_pista_trama
 from src.ui import (
     desenhar_evento_interativo,
     desenhar_tela_evento,
@@ -24,8 +30,13 @@ class ContextoExploracao(Protocol):
     """Interface mínima do contexto esperada pelos helpers de exploração."""
 
     jogador: Personagem | None
-    mapa_atual: list[list[Sala]] | None
+    mapa_atual: Mapa | None
     nivel_masmorra: int
+    dificuldade: str
+    largura_mapa: int
+    altura_mapa: int
+    seed_run: int | None
+    pregerador: PreGeradorAndares
     posicao_anterior: tuple[int, int] | None
     sala_em_combate: Sala | None
     inimigo_em_combate: Any
@@ -62,22 +73,23 @@ class ContextoExploracao(Protocol):
 
 def preparar_andar_exploracao(
     contexto: ContextoExploracao,
-    posicionar_na_entrada: Callable[[Personagem, list[list[Sala]]], None],
+    posicionar_na_entrada: Callable[[Personagem, Mapa], None],
     desenhar_tela_evento_fn: Callable[[str, str], None] = desenhar_tela_evento,
 ) -> None:
     """Gera o mapa do andar atual e exibe tutoriais/pistas pendentes."""
     jogador = contexto.jogador
-    if jogador is None or contexto.mapa_atual is not None:
+    if jogador is None:
+        return
+    if contexto.mapa_atual is not None:
+        agendar_proximo_andar(contexto)
         return
 
     contexto.resetar_estatisticas()
-    contexto.mapa_atual = gerar_mapa(
-        contexto.nivel_masmorra,
-        contexto.obter_perfil_dificuldade(),
-        trama_ativa=contexto.trama_ativa,
-        rng=contexto.rng,
-    )
+    nivel = contexto.nivel_masmorra
+    mapa = contexto.pregerador.obter(chave_andar(contexto, nivel))
+    contexto.mapa_atual = mapa if mapa is not None else gerar_andar(contexto, nivel)
     posicionar_na_entrada(jogador, contexto.mapa_atual)
+    agendar_proximo_andar(contexto)
     contexto.tutorial.mostrar(
         "exploracao_basica",
         "Dica: Exploração",
@@ -93,7 +105,7 @@ def preparar_andar_exploracao(
         pista = gerar_pista_trama(
             contexto.trama_ativa,
             contexto.nivel_masmorra,
-            rng=contexto.rng,
+            rng=fluxo_rng(contexto.rng, "tramas"),
         )
         desenhar_tela_evento_fn("PISTA DA TRAMA", pista)
         contexto.trama_pistas_exibidas.add(contexto.nivel_masmorra)
@@ -162,7 +174,7 @@ def resolver_sala_trama(
                 dificuldade=contexto.obter_perfil_dificuldade(),
                 chefe=False,
                 tema=tema_trama,
-                rng=contexto.rng,
+                rng=fluxo_rng(contexto.rng, "combate"),
             )
         desenhar_tela_evento_fn(
             "DESFECHO DA TRAMA",
@@ -251,7 +263,7 @@ def preparar_encontro_sala(
             chefe=sala.chefe,
             perfil_chefe=perfil_chefe,
             tema=tema_trama,
-            rng=contexto.rng,
+            rng=fluxo_rng(contexto.rng, "combate"),
         )
         sala.inimigo_atual = inimigo
 
@@ -278,14 +290,75 @@ def preparar_encontro_sala(
 
     contexto.sala_em_combate = sala
     contexto.inimigo_em_combate = inimigo
-    desenhar_tela_evento_fn("ENCONTRO!", f"CUIDADO! Um {inimigo.nome} está na sala!")
+    mensagem_encontro = f"CUIDADO! Um {inimigo.nome} está na sala!"
+    if contexto.jogador is not None:
+        previsao = prever_combate_entidades(contexto.jogador, inimigo)
+        mensagem_encontro += f"\nChance estimada de vitória: {previsao.chance_vitoria:.0%}"
+    desenhar_tela_evento_fn("ENCONTRO!", mensagem_encontro)
     contexto.turnos_totais += 1
     return "combate"
 
 
+def chave_andar(contexto: ContextoExploracao, nivel: int) -> ChaveAndar:
+    """Reúne tudo o que determina a geração do andar `nivel` nesta run."""
+    return (
+        contexto.seed_run,
+        nivel,
+        contexto.dificuldade,
+        contexto.largura_mapa,
+        contexto.altura_mapa,
+        chave_trama(contexto.trama_ativa),
+    )
+
+
+def gerar_andar(contexto: ContextoExploracao, nivel: int) -> Mapa:
+    """Gera o andar `nivel` pela sub-seed da run (ou pelo RNG da run, se não houver seed)."""
+    if contexto.seed_run is not None:
+        return gerar_andar_da_seed(
+            contexto.seed_run,
+            nivel,
+            contexto.dificuldade,
+            contexto.trama_ativa,
+            contexto.largura_mapa,
+            contexto.altura_mapa,
+        )
+    return gerar_mapa(
+        nivel,
+        contexto.obter_perfil_dificuldade(),
+        trama_ativa=contexto.trama_ativa,
+        rng=fluxo_rng(contexto.rng, "mapa"),
+        largura=contexto.largura_mapa,
+        altura=contexto.altura_mapa,
+    )
+
+
+def agendar_proximo_andar(contexto: ContextoExploracao) -> None:
+    """Pede a pré-geração do próximo andar; só faz sentido com seed de run definida."""
+    if contexto.seed_run is None:
+        return
+    proximo = contexto.nivel_masmorra + 1
+    chave = chave_andar(contexto, proximo)
+    if contexto.pregerador.chave_agendada == chave:
+        return
+    # A thread recebe cópias do que lê: o andar atual pode alterar a trama enquanto gera.
+    trama = contexto.trama_ativa
+    contexto.pregerador.agendar(
+        chave,
+        partial(
+            gerar_andar_da_seed,
+            contexto.seed_run,
+            proximo,
+            contexto.dificuldade,
+            TramaAtiva.from_dict(trama.to_dict()) if trama is not None else None,
+            contexto.largura_mapa,
+            contexto.altura_mapa,
+        ),
+    )
+
+
 def montar_opcoes_exploracao(
     jogador: Personagem,
-    mapa: list[list[Sala]],
+    mapa: Mapa,
     sala_atual: Sala,
 ) -> list[str]:
     """Monta a lista de ações disponíveis na exploração."""
@@ -3,7 +3,7 @@
 from collections.abc import Callable, Iterable
 from typing import Any
 
-from src.entidades import Item, Personagem
+from src.entidades import ChaveItem, Inventario, Item, Personagem, chave_item, como_inventario
 from src.ui import (
     desenhar_tela_equipar,
     desenhar_tela_evento,
@@ -15,17 +15,14 @@ TIPO_ORDENACAO = {"arma": 0, "armadura": 1, "escudo": 2}
 
 
 def agrupar_itens_equipaveis(itens: Iterable[Item]) -> list[dict[str, Any]]:
-    """Agrupa itens equipáveis por atributos para facilitar a listagem."""
-    grupos: dict[tuple, dict[str, Any]] = {}
-    for item in itens:
-        if item.tipo not in {"arma", "armadura", "escudo"}:
-            continue
-        chave = _chave_item(item)
-        if chave not in grupos:
-            grupos[chave] = {"item": item, "quantidade": 0, "chave": chave}
-        grupos[chave]["quantidade"] += 1
+    """Lista as pilhas de itens equipáveis para facilitar a seleção."""
+    grupos = [
+        {"item": item, "quantidade": quantidade, "chave": chave}
+        for chave, item, quantidade in como_inventario(itens).pilhas()
+        if item.tipo in {"arma", "armadura", "escudo"}
+    ]
     return sorted(
-        grupos.values(),
+        grupos,
         key=lambda grupo: (
             TIPO_ORDENACAO.get(grupo["item"].tipo, 99),
             grupo["item"].nome,
@@ -33,16 +30,12 @@ def agrupar_itens_equipaveis(itens: Iterable[Item]) -> list[dict[str, Any]]:
     )
 
 
-def _chave_item(item: Item) -> tuple:
-    bonus = tuple(sorted(item.bonus.items()))
-    efeito = tuple(sorted(item.efeito.items()))
-    return (item.nome, item.tipo, bonus, efeito)
-
-
-def remover_item_por_chave(inventario: list[Item], chave: tuple) -> Item:
-    """Remove e retorna o item correspondente à chave de agrupamento."""
+def remover_item_por_chave(inventario: Inventario | list[Item], chave: ChaveItem) -> Item:
+    """Remove e retorna uma unidade da pilha correspondente à chave de agrupamento."""
+    if isinstance(inventario, Inventario):
+        return inventario.remover_chave(chave)
     for idx, item in enumerate(inventario):
-        if _chave_item(item) == chave:
+        if chave_item(item) == chave:
             return inventario.pop(idx)
     raise ValueError("Item não encontrado no inventário para a chave informada.")
 
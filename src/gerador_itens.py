@@ -1,4 +1,5 @@
 import random
+from functools import cache
 from typing import Any
 
 from src import config
@@ -45,46 +46,49 @@ def obter_itens_por_raridade() -> ItensPorRaridade:
     return ITENS_POR_RARIDADE
 
 
+@cache
+def _prototipos() -> tuple[dict[str, list[Item]], dict[str, Item]]:
+    """Retorna os itens do catálogo, criados uma única vez e compartilhados entre drops.
+
+    O resultado vale para o catálogo carregado no import; quem trocar o catálogo
+    chama `_prototipos.cache_clear()`. Compartilhar é seguro porque `Item` é congelado
+    e seus `bonus`/`efeito` são `DicionarioCongelado`.
+    """
+    por_raridade = {
+        raridade: [Item.from_dict(item) for item in lista]
+        for raridade, lista in obter_itens_por_raridade().items()
+    }
+    por_nome: dict[str, Item] = {}
+    for prototipos in por_raridade.values():
+        for prototipo in prototipos:
+            por_nome.setdefault(prototipo.nome.strip().lower(), prototipo)
+    return por_raridade, por_nome
+
+
 def gerar_item_aleatorio(
     raridade: str = "comum",
     permitir_consumivel: bool = True,
     bonus_consumivel: float = 0.0,
     rng: random.Random | None = None,
 ) -> Item | None:
-    """Gera um item aleatório e pode trocar por consumíveis se configurado."""
+    """Sorteia um protótipo do catálogo e pode trocar por consumíveis se configurado."""
     rng = rng or random
-    itens_por_raridade = obter_itens_por_raridade()
-    candidatos: list[dict[str, Any]] = list(itens_por_raridade.get(raridade, []))
+    prototipos = _prototipos()[0]
+    candidatos = prototipos.get(raridade, [])
 
-    if permitir_consumivel and "consumivel" in itens_por_raridade:
+    if permitir_consumivel and "consumivel" in prototipos:
         chance_base = config.DROP_CONSUMIVEL_CHANCE.get(raridade, 0.0)
         chance = min(1.0, max(0.0, chance_base + bonus_consumivel))
         if (candidatos and chance > 0 and rng.random() < chance) or not candidatos:
-            candidatos = list(itens_por_raridade["consumivel"])
+            candidatos = prototipos["consumivel"]
 
     if not candidatos:
         return None
-
-    item_data: dict[str, Any] = rng.choice(candidatos).copy()
-
-    # Garante que os campos opcionais existam antes de criar a instância
-    item_data.setdefault("bonus", {})
-    item_data.setdefault("efeito", {})
-
-    return Item.from_dict(item_data)
+    return rng.choice(candidatos)
 
 
 def obter_item_por_nome(nome: str) -> Item | None:
     """Busca um item pelo nome em qualquer raridade."""
     if not nome:
         return None
-    catalogo = obter_itens_por_raridade()
-    nome_normalizado = nome.strip().lower()
-    for lista in catalogo.values():
-        for item in lista:
-            if item.get("nome", "").strip().lower() == nome_normalizado:
-                item_data = item.copy()
-                item_data.setdefault("bonus", {})
-                item_data.setdefault("efeito", {})
-                return Item.from_dict(item_data)
-    return None
+    return _prototipos()[1].get(nome.strip().lower())
@@ -1,50 +1,136 @@
 # src/gerador_mapa.py
 
+import json
 import random
 from collections import defaultdict
-from typing import TYPE_CHECKING
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 
 from src import config, eventos
+from src.aleatoriedade import derivar_seed_andar
 from src.chefes import ChefeConfig, sortear_chefe_para_andar
 from src.entidades import Sala
+from src.mapa_compacto import MapaCompacto, criar_parede
 from src.salas import sortear_sala_template
+from src.tramas import TramaAtiva
 
-if TYPE_CHECKING:
-    from src.tramas import TramaAtiva
+Mapa = MapaCompacto
 
-Mapa = list[list[Sala]]
+
+def chave_trama(trama_ativa: TramaAtiva | None) -> str | None:
+    """Representação estável (e hashable) da trama para chavear andares gerados."""
+    if trama_ativa is None:
+        return None
+    return json.dumps(trama_ativa.to_dict(), sort_keys=True, ensure_ascii=False)
+
+
+def gerar_andar(
+    seed_run: int,
+    nivel: int,
+    dificuldade: str = config.DIFICULDADE_PADRAO,
+    trama_ativa: TramaAtiva | None = None,
+    largura: int | None = None,
+    altura: int | None = None,
+) -> Mapa:
+    """Gera o andar `nivel` da run `seed_run` sem depender dos andares anteriores.
+
+    O RNG do andar vem de `derivar_seed_andar(seed_run, nivel)`, então qualquer andar
+    pode ser regenerado isoladamente. Resultados ficam num cache LRU e cada chamada
+    devolve uma cópia, livre para ser alterada durante o jogo.
+    """
+    mapa = _gerar_andar_em_cache(
+        derivar_seed_andar(seed_run, nivel),
+        nivel,
+        dificuldade,
+        chave_trama(trama_ativa),
+        largura or config.MAP_WIDTH,
+        altura or config.MAP_HEIGHT,
+    )
+    return mapa.copiar()
+
+
+def gerar_andares(
+    seed_run: int,
+    niveis: Iterable[int],
+    dificuldade: str = config.DIFICULDADE_PADRAO,
+    trama_ativa: TramaAtiva | None = None,
+    largura: int | None = None,
+    altura: int | None = None,
+    processos: int | None = None,
+) -> dict[int, Mapa]:
+    """Gera vários andares de uma run de uma vez, opcionalmente em processos paralelos.
+
+    Útil para ferramentas de análise de seeds: o andar N sai direto, sem simular os
+    andares 1..N-1. Com `processos` maior que 1 o trabalho é dividido entre processos.
+    """
+    niveis = list(niveis)
+    gerar = partial(
+        gerar_andar,
+        seed_run,
+        dificuldade=dificuldade,
+        trama_ativa=trama_ativa,
+        largura=largura,
+        altura=altura,
+    )
+    if not processos or processos <= 1 or len(niveis) <= 1:
+        return {nivel: gerar(nivel) for nivel in niveis}
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        return dict(zip(niveis, executor.map(gerar, niveis), strict=True))
+
+
+@lru_cache(maxsize=config.MAP_CACHE_ANDARES)
+def _gerar_andar_em_cache(
+    seed_andar: int,
+    nivel: int,
+    dificuldade: str,
+    trama_serializada: str | None,
+    largura: int,
+    altura: int,
+) -> Mapa:
+    trama = (
+        TramaAtiva.from_dict(json.loads(trama_serializada))
+        if trama_serializada is not None
+        else None
+    )
+    return gerar_mapa(
+        nivel,
+        config.DIFICULDADES.get(dificuldade),
+        trama_ativa=trama,
+        rng=random.Random(seed_andar),
+        largura=largura,
+        altura=altura,
+    )
 
 
 def gerar_mapa(
     nivel: int = 1,
     perfil_dificuldade: config.DificuldadePerfil | None = None,
-    trama_ativa: "TramaAtiva | None" = None,
+    trama_ativa: TramaAtiva | None = None,
     rng: random.Random | None = None,
+    largura: int | None = None,
+    altura: int | None = None,
 ) -> Mapa:
-    """Gera um novo mapa com um caminho principal garantido da entrada até a saída."""
+    """Gera um novo mapa com um caminho principal garantido da entrada até a saída.
+
+    `largura` e `altura` definem o tamanho do andar (padrão: `config.MAP_WIDTH` x
+    `config.MAP_HEIGHT`). O custo é linear no número de salas criadas.
+    """
     rng = rng or random
+    largura = largura or config.MAP_WIDTH
+    altura = altura or config.MAP_HEIGHT
+    validar_dimensoes_mapa(largura, altura)
     prob_inimigo = config.probabilidade_inimigo_por_nivel(nivel, perfil_dificuldade)
     tema_trama = _tema_trama_ativa(trama_ativa)
     templates_usados: dict[str, set[str]] = defaultdict(set)
 
-    mapa: Mapa = [
-        [
-            Sala(
-                tipo="parede",
-                nome="Parede",
-                descricao="Pedra maciça bloqueando a passagem.",
-                pode_ter_inimigo=False,
-                nivel_area=nivel,
-            )
-            for _ in range(config.MAP_WIDTH)
-        ]
-        for _ in range(config.MAP_HEIGHT)
-    ]
+    # Paredes não guardam estado próprio: todas as células compartilham uma instância.
+    mapa = MapaCompacto(largura, altura, criar_parede(nivel))
 
-    x, y = rng.randint(1, config.MAP_WIDTH - 2), 0
+    x, y = rng.randint(1, largura - 2), 0
     caminho_principal: list[tuple[int, int]] = []
 
-    while y < config.MAP_HEIGHT - 1:
+    while y < altura - 1:
         mapa[y][x] = _criar_sala(
             "caminho", nivel, prob_inimigo, templates_usados, tema_trama, rng=rng
         )
@@ -53,7 +139,7 @@ def gerar_mapa(
         direcao = rng.choice(["esquerda", "direita", "baixo", "baixo", "baixo"])
         if direcao == "esquerda" and x > 1:
             x -= 1
-        elif direcao == "direita" and x < config.MAP_WIDTH - 2:
+        elif direcao == "direita" and x < largura - 2:
             x += 1
         else:
             y += 1
@@ -81,32 +167,50 @@ def gerar_mapa(
         "escada", nivel, prob_inimigo, templates_usados, tema_trama, rng=rng
     )
 
-    for _ in range(int(config.MAP_WIDTH * config.MAP_HEIGHT * config.MAP_SIDE_ROOMS_RATIO)):
-        px, py = rng.choice(caminho_principal)
-        direcoes = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-        rng.shuffle(direcoes)
-
-        for dx, dy in direcoes:
-            nx, ny = px + dx, py + dy
-            if (
-                0 <= nx < config.MAP_WIDTH
-                and 0 <= ny < config.MAP_HEIGHT
-                and mapa[ny][nx].tipo == "parede"
-            ):
-                mapa[ny][nx] = _criar_sala(
-                    "secundaria",
-                    nivel,
-                    prob_inimigo,
-                    templates_usados,
-                    tema_trama,
-                    rng=rng,
-                )
-                break
+    fronteira = _fronteira_do_caminho(mapa, caminho_principal)
+    tentativas = int(largura * altura * config.MAP_SIDE_ROOMS_RATIO)
+    for _ in range(min(tentativas, len(fronteira))):
+        # Sorteio O(1) sem reposição: troca o escolhido com o último e remove.
+        indice = rng.randrange(len(fronteira))
+        fronteira[indice], fronteira[-1] = fronteira[-1], fronteira[indice]
+        nx, ny = fronteira.pop()
+        mapa[ny][nx] = _criar_sala(
+            "secundaria",
+            nivel,
+            prob_inimigo,
+            templates_usados,
+            tema_trama,
+            rng=rng,
+        )
 
     _injetar_sala_trama(mapa, caminho_principal, nivel, trama_ativa, rng=rng)
     return mapa
 
 
+def validar_dimensoes_mapa(largura: int, altura: int) -> None:
+    """Garante que o andar comporta entrada, chefe e escada no caminho principal."""
+    for nome, valor in (("largura", largura), ("altura", altura)):
+        if not config.MAP_TAMANHO_MIN <= valor <= config.MAP_TAMANHO_MAX:
+            raise ValueError(
+                f"A {nome} do mapa deve ficar entre {config.MAP_TAMANHO_MIN} e "
+                f"{config.MAP_TAMANHO_MAX} (recebido: {valor})."
+            )
+
+
+def _fronteira_do_caminho(
+    mapa: MapaCompacto,
+    caminho_principal: list[tuple[int, int]],
+) -> list[tuple[int, int]]:
+    """Lista, em ordem determinística, as paredes vizinhas ao caminho principal."""
+    vistos: dict[tuple[int, int], None] = {}
+    for px, py in caminho_principal:
+        for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+            nx, ny = px + dx, py + dy
+            if 0 <= nx < mapa.largura and 0 <= ny < mapa.altura and mapa.eh_parede(nx, ny):
+                vistos[(nx, ny)] = None
+    return list(vistos)
+
+
 def _criar_sala(
     tipo: str,
     nivel: int,
@@ -208,7 +312,7 @@ def _atribuir_evento_randomico(
         sala.evento_id = evento_id
 
 
-def _tema_trama_ativa(trama_ativa: "TramaAtiva | None") -> str | None:
+def _tema_trama_ativa(trama_ativa: TramaAtiva | None) -> str | None:
     """Retorna o tema da trama ativa para orientar sorteios de conteúdo."""
     if trama_ativa is None or trama_ativa.concluida:
         return None
@@ -219,7 +323,7 @@ def _injetar_sala_trama(
     mapa: Mapa,
     caminho_principal: list[tuple[int, int]],
     nivel: int,
-    trama_ativa: "TramaAtiva | None",
+    trama_ativa: TramaAtiva | None,
     rng: random.Random | None = None,
 ) -> None:
     """Converta uma sala comum em sala narrativa da trama ativa."""
@@ -231,9 +335,10 @@ def _injetar_sala_trama(
     if not candidatos:
         candidatos = [
             (x, y)
-            for y in range(1, len(mapa) - 1)
-            for x in range(1, len(mapa[0]) - 1)
-            if mapa[y][x].tipo not in {"parede", "entrada", "chefe", "escada"}
+            for x, y, sala in mapa.salas()
+            if 0 < y < mapa.altura - 1
+            and 0 < x < mapa.largura - 1
+            and sala.tipo not in {"parede", "entrada", "chefe", "escada"}
         ]
     if not candidatos:
         return
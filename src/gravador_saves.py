@@ -0,0 +1,205 @@
+"""Gravação de saves numa thread de fundo, agrupando pedidos seguidos do mesmo slot.
+
+A tela de exploração monta o estado (já uma cópia independente: dicionários novos
+de `to_dict` e do codec do mapa) e o entrega ao `GravadorSaves`, que serializa,
+faz o fsync e o backup fora da thread da UI. Se o jogador salvar de novo antes da
+gravação começar, só o pedido mais recente daquele slot vai para o disco. O
+resultado volta para o HUD por `status_para_hud`, e `aguardar`/`encerrar` garantem
+que nada fique pendente ao carregar um save ou sair do jogo.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src import armazenamento
+from src.armazenamento import EstadoJogo
+
+type SlotSave = str | int | None
+type FuncaoGravar = Callable[[EstadoJogo, SlotSave, bool], Path]
+type AoConcluir = Callable[["ResultadoGravacao"], None]
+
+
+@dataclass(frozen=True)
+class ResultadoGravacao:
+    """Desfecho de uma gravação: o caminho salvo ou a mensagem de erro, com custo medido."""
+
+    slot_id: SlotSave
+    caminho: Path | None = None
+    erro: str | None = None
+    duracao_s: float = 0.0
+    bytes_gravados: int = 0
+
+    @property
+    def sucesso(self) -> bool:
+        """Indica se o save chegou ao disco."""
+        return self.erro is None
+
+
+@dataclass
+class _Pedido:
+    estado: EstadoJogo
+    incremental: bool
+    ao_concluir: list[AoConcluir] = field(default_factory=list)
+
+
+def _gravar_padrao(estado: EstadoJogo, slot_id: SlotSave, incremental: bool) -> Path:
+    # Resolvido na hora da chamada para respeitar diretórios trocados em testes.
+    return armazenamento.salvar_jogo(estado, slot_id, incremental=incremental)
+
+
+class GravadorSaves:
+    """Fila de saves com uma única thread de trabalho e agrupamento por slot."""
+
+    def __init__(self, gravar: FuncaoGravar | None = None) -> None:
+        self._gravar = gravar or _gravar_padrao
+        self._condicao = threading.Condition()
+        self._pendentes: dict[SlotSave, _Pedido] = {}
+        self._em_andamento = False
+        self._thread: threading.Thread | None = None
+        self._encerrando = False
+        self._ultimo: ResultadoGravacao | None = None
+        self._ultimo_exibido = True
+        self.gravacoes = 0
+        self.agrupadas = 0
+        self.falhas = 0
+        self.erros_callback = 0
+
+    @property
+    def ultimo_resultado(self) -> ResultadoGravacao | None:
+        """Resultado da gravação concluída mais recente."""
+        return self._ultimo
+
+    def agendar(
+        self,
+        estado: EstadoJogo,
+        slot_id: SlotSave = None,
+        *,
+        incremental: bool = False,
+        ao_concluir: AoConcluir | None = None,
+    ) -> None:
+        """Enfileira o save; um pedido ainda não iniciado do mesmo slot é substituído.
+
+        `ao_concluir` é chamado na thread de trabalho com o resultado da gravação que
+        levou o estado ao disco, mesmo que o pedido tenha sido agrupado com outro.
+        """
+        pedido = _Pedido(estado, incremental)
+        if ao_concluir is not None:
+            pedido.ao_concluir.append(ao_concluir)
+        with self._condicao:
+            anterior = self._pendentes.get(slot_id)
+            if anterior is not None:
+                self.agrupadas += 1
+                # Um save completo pendente não pode virar incremental ao ser agrupado.
+                pedido.incremental = incremental and anterior.incremental
+                pedido.ao_concluir[:0] = anterior.ao_concluir
+            self._pendentes[slot_id] = pedido
+            self._encerrando = False
+            self._garantir_thread()
+            self._condicao.notify_all()
+
+    def pendente(self) -> bool:
+        """Indica se há saves na fila ou sendo gravados."""
+        with self._condicao:
+            return bool(self._pendentes) or self._em_andamento
+
+    def aguardar(self, timeout: float | None = None) -> bool:
+        """Bloqueia até a fila esvaziar; retorna `False` se o `timeout` estourar."""
+        with self._condicao:
+            return self._condicao.wait_for(
+                lambda: not self._pendentes and not self._em_andamento, timeout
+            )
+
+    def status_para_hud(self) -> str | None:
+        """Mensagem curta para o HUD: gravação em curso ou resultado ainda não exibido."""
+        with self._condicao:
+            if self._pendentes or self._em_andamento:
+                return "💾 Salvando..."
+            if self._ultimo is None or self._ultimo_exibido:
+                return None
+            self._ultimo_exibido = True
+            if self._ultimo.sucesso:
+                return f"💾 Jogo salvo em {self._ultimo.caminho}."
+            return f"⚠️ Não foi possível salvar: {self._ultimo.erro}."
+
+    def encerrar(self) -> None:
+        """Grava tudo o que estiver pendente e finaliza a thread de trabalho."""
+        with self._condicao:
+            self._encerrando = True
+            self._condicao.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        with self._condicao:
+            self._thread = None
+
+    def _garantir_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._trabalhar, name="gravador-saves", daemon=True
+            )
+            self._thread.start()
+
+    def _trabalhar(self) -> None:
+        while True:
+            with self._condicao:
+                self._condicao.wait_for(lambda: self._pendentes or self._encerrando)
+                if not self._pendentes:
+                    return
+                lote, self._pendentes = self._pendentes, {}
+                self._em_andamento = True
+            resultados: list[ResultadoGravacao] = []
+            try:
+                for slot_id, pedido in lote.items():
+                    resultado = self._gravar_pedido(slot_id, pedido)
+                    resultados.append(resultado)
+                    self._notificar(pedido, resultado)
+            finally:
+                with self._condicao:
+                    self._em_andamento = False
+                    self._registrar(resultados)
+                    self._condicao.notify_all()
+
+    def _notificar(self, pedido: _Pedido, resultado: ResultadoGravacao) -> None:
+        # Um callback com defeito não pode derrubar a thread nem calar os demais.
+        for callback in pedido.ao_concluir:
+            try:
+                callback(resultado)
+            except Exception:
+                with self._condicao:
+                    self.erros_callback += 1
+
+    def _registrar(self, resultados: list[ResultadoGravacao]) -> None:
+        if not resultados:
+            return
+        self.gravacoes += len(resultados)
+        self.falhas += sum(not resultado.sucesso for resultado in resultados)
+        # Com vários slots no mesmo lote, uma falha tem prioridade no aviso do HUD.
+        self._ultimo = next(
+            (resultado for resultado in resultados if not resultado.sucesso), resultados[-1]
+        )
+        self._ultimo_exibido = False
+
+    def _gravar_pedido(self, slot_id: SlotSave, pedido: _Pedido) -> ResultadoGravacao:
+        # Só esta thread grava saves, então a diferença do contador é desta gravação.
+        bytes_antes = armazenamento.CONTADORES_IO.bytes_gravados
+        inicio = time.perf_counter()
+        caminho: Path | None = None
+        erro: str | None = None
+        try:
+            caminho = self._gravar(pedido.estado, slot_id, pedido.incremental)
+        except Exception as falha:
+            # Qualquer erro (slot inválido, estado não serializável, disco) vira uma
+            # falha do pedido; deixá-lo escapar mataria a thread e calaria a fila.
+            erro = str(falha) or type(falha).__name__
+        return ResultadoGravacao(
+            slot_id,
+            caminho=caminho,
+            erro=erro,
+            duracao_s=time.perf_counter() - inicio,
+            bytes_gravados=armazenamento.CONTADORES_IO.bytes_gravados - bytes_antes,
+        )
@@ -0,0 +1,401 @@
+"""Histórico de runs em SQLite: inserção O(1) por run, consultas paginadas e agregados.
+
+Cada run vira uma linha da tabela `runs`, com o registro completo em JSON (`dados`) e
+as colunas usadas em filtros e agregados extraídas para índices: classe, dificuldade,
+seed da run e andar alcançado. Não há limite de entradas; a tela de histórico lê só a
+página exibida. Cada operação abre e fecha a própria conexão, então vários processos
+(instalação compartilhada) podem registrar runs no mesmo arquivo. Um banco ilegível
+ou travado dispara `sqlite3.Error`; quem chama trata como histórico indisponível.
+
+As estatísticas ficam em tabelas agregadas atualizadas na mesma transação da inserção:
+totais por classe (`estat_classe`), histograma de andares por classe (`estat_andar`,
+base dos percentis) e mortes por andar e inimigo (`estat_letalidade`). Ler qualquer
+estatística custa o número de classes, andares ou inimigos distintos, nunca o de runs.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from collections.abc import Callable, Iterator
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+SCHEMA_HISTORICO = 2
+POR_PAGINA_PADRAO = 20
+CLASSE_DESCONHECIDA = "?"
+
+type EntradaHistorico = dict[str, Any]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    registrado_em TEXT,
+    motivo TEXT,
+    personagem TEXT,
+    classe TEXT,
+    dificuldade TEXT,
+    andar_alcancado INTEGER,
+    seed_run INTEGER,
+    inimigo_causa_morte TEXT,
+    dados TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_classe_andar ON runs (classe, andar_alcancado);
+CREATE INDEX IF NOT EXISTS idx_runs_dificuldade ON runs (dificuldade);
+CREATE INDEX IF NOT EXISTS idx_runs_seed ON runs (seed_run);
+CREATE INDEX IF NOT EXISTS idx_runs_andar ON runs (andar_alcancado);
+"""
+
+_SCHEMA_ESTATISTICAS = """
+CREATE TABLE IF NOT EXISTS estat_classe (
+    classe TEXT PRIMARY KEY,
+    runs INTEGER NOT NULL,
+    mortes INTEGER NOT NULL,
+    saidas INTEGER NOT NULL,
+    soma_andar INTEGER NOT NULL,
+    melhor_andar INTEGER NOT NULL,
+    soma_turnos INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS estat_andar (
+    classe TEXT NOT NULL,
+    andar INTEGER NOT NULL,
+    runs INTEGER NOT NULL,
+    PRIMARY KEY (classe, andar)
+);
+CREATE TABLE IF NOT EXISTS estat_letalidade (
+    andar INTEGER NOT NULL,
+    inimigo TEXT NOT NULL,
+    mortes INTEGER NOT NULL,
+    PRIMARY KEY (andar, inimigo)
+);
+"""
+
+_ACUMULAR_CLASSE = """
+INSERT INTO estat_classe VALUES (?, 1, ?, ?, ?, ?, ?)
+ON CONFLICT (classe) DO UPDATE SET
+    runs = runs + 1,
+    mortes = mortes + excluded.mortes,
+    saidas = saidas + excluded.saidas,
+    soma_andar = soma_andar + excluded.soma_andar,
+    melhor_andar = MAX(melhor_andar, excluded.melhor_andar),
+    soma_turnos = soma_turnos + excluded.soma_turnos
+"""
+
+_ACUMULAR_ANDAR = """
+INSERT INTO estat_andar VALUES (?, ?, 1)
+ON CONFLICT (classe, andar) DO UPDATE SET runs = runs + 1
+"""
+
+_ACUMULAR_LETALIDADE = """
+INSERT INTO estat_letalidade VALUES (?, ?, 1)
+ON CONFLICT (andar, inimigo) DO UPDATE SET mortes = mortes + 1
+"""
+
+# Reconstrói os agregados a partir de `runs` (migração do schema 1 e bancos antigos).
+_RECALCULAR_ESTATISTICAS = """
+DELETE FROM estat_classe;
+DELETE FROM estat_andar;
+DELETE FROM estat_letalidade;
+INSERT INTO estat_classe
+SELECT COALESCE(classe, '?'), COUNT(*),
+       SUM(motivo = 'morte'), SUM(motivo = 'saida'),
+       SUM(COALESCE(andar_alcancado, 0)), MAX(COALESCE(andar_alcancado, 0)),
+       SUM(COALESCE(json_extract(dados, '$.turnos_totais'), 0))
+FROM runs GROUP BY COALESCE(classe, '?');
+INSERT INTO estat_andar
+SELECT COALESCE(classe, '?'), andar_alcancado, COUNT(*)
+FROM runs WHERE andar_alcancado IS NOT NULL
+GROUP BY COALESCE(classe, '?'), andar_alcancado;
+INSERT INTO estat_letalidade
+SELECT andar_alcancado, inimigo_causa_morte, COUNT(*)
+FROM runs
+WHERE motivo = 'morte' AND inimigo_causa_morte IS NOT NULL AND andar_alcancado IS NOT NULL
+GROUP BY andar_alcancado, inimigo_causa_morte;
+"""
+
+_INSERIR = """
+INSERT INTO runs (
+    registrado_em, motivo, personagem, classe, dificuldade,
+    andar_alcancado, seed_run, inimigo_causa_morte, dados
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+@dataclass(frozen=True)
+class EstatisticaClasse:
+    """Totais agregados das runs de uma classe."""
+
+    classe: str
+    runs: int
+    mortes: int
+    saidas: int
+    melhor_andar: int
+    andar_medio: float
+    turnos_medios: float
+
+    @property
+    def taxa_morte(self) -> float:
+        """Fração das runs encerradas por morte."""
+        return self.mortes / self.runs if self.runs else 0.0
+
+    @property
+    def taxa_sobrevivencia(self) -> float:
+        """Fração das runs em que o herói saiu vivo da masmorra."""
+        return self.saidas / self.runs if self.runs else 0.0
+
+
+class HistoricoRuns:
+    """Acesso ao arquivo SQLite do histórico de runs."""
+
+    def __init__(self, caminho: Path) -> None:
+        self.caminho = caminho
+
+    def registrar(self, entrada: EntradaHistorico) -> int:
+        """Acrescenta uma run e retorna o id dela."""
+        with self._conectar() as conexao:
+            cursor = conexao.execute(_INSERIR, _linha_de(entrada))
+            _acumular(conexao, [entrada])
+            return int(cursor.lastrowid or 0)
+
+    def importar(
+        self,
+        entradas: list[EntradaHistorico],
+        antes_de_confirmar: Callable[[], None] | None = None,
+    ) -> int:
+        """Acrescenta várias runs numa única transação, na ordem dada.
+
+        `antes_de_confirmar` roda dentro da transação, logo antes do commit: se ele
+        falhar, nada é gravado (útil para marcar a origem como importada).
+        """
+        with self._conectar() as conexao:
+            conexao.executemany(_INSERIR, (_linha_de(entrada) for entrada in entradas))
+            _acumular(conexao, entradas)
+            if antes_de_confirmar is not None:
+                antes_de_confirmar()
+        return len(entradas)
+
+    def consultar(
+        self,
+        *,
+        pagina: int = 0,
+        por_pagina: int = POR_PAGINA_PADRAO,
+        classe: str | None = None,
+        dificuldade: str | None = None,
+        seed_run: int | None = None,
+        andar_minimo: int | None = None,
+    ) -> list[EntradaHistorico]:
+        """Retorna uma página de runs, da mais recente para a mais antiga."""
+        where, parametros = _filtros(classe, dificuldade, seed_run, andar_minimo)
+        with self._conectar() as conexao:
+            linhas = conexao.execute(
+                f"SELECT dados FROM runs {where} ORDER BY id DESC LIMIT ? OFFSET ?",
+                (*parametros, por_pagina, max(0, pagina) * por_pagina),
+            ).fetchall()
+        return [json.loads(dados) for (dados,) in linhas]
+
+    def contar(
+        self,
+        *,
+        classe: str | None = None,
+        dificuldade: str | None = None,
+        seed_run: int | None = None,
+        andar_minimo: int | None = None,
+    ) -> int:
+        """Conta as runs que passam pelos filtros (sem filtros, pelos agregados)."""
+        where, parametros = _filtros(classe, dificuldade, seed_run, andar_minimo)
+        with self._conectar() as conexao:
+            if not where:
+                (total,) = conexao.execute(
+                    "SELECT COALESCE(SUM(runs), 0) FROM estat_classe"
+                ).fetchone()
+                return int(total)
+            (total,) = conexao.execute(
+                f"SELECT COUNT(*) FROM runs {where}",
+                parametros,
+            ).fetchone()
+        return int(total)
+
+    def ranking(self, limite: int = 10, classe: str | None = None) -> list[EntradaHistorico]:
+        """Lista as runs que desceram mais fundo (empates: a mais recente primeiro)."""
+        where, parametros = _filtros(classe, None, None, None)
+        with self._conectar() as conexao:
+            linhas = conexao.execute(
+                f"SELECT dados FROM runs {where} ORDER BY andar_alcancado DESC, id DESC LIMIT ?",
+                (*parametros, limite),
+            ).fetchall()
+        return [json.loads(dados) for (dados,) in linhas]
+
+    def estatisticas_por_classe(self) -> list[EstatisticaClasse]:
+        """Resume runs, mortes, saídas e profundidade por classe, da mais jogada à menos."""
+        with self._conectar() as conexao:
+            linhas = conexao.execute(
+                "SELECT classe, runs, mortes, saidas, melhor_andar, soma_andar, soma_turnos "
+                "FROM estat_classe ORDER BY runs DESC, classe"
+            ).fetchall()
+        return [
+            EstatisticaClasse(
+                classe,
+                runs,
+                mortes,
+                saidas,
+                melhor_andar,
+                soma_andar / runs if runs else 0.0,
+                soma_turnos / runs if runs else 0.0,
+            )
+            for classe, runs, mortes, saidas, melhor_andar, soma_andar, soma_turnos in linhas
+        ]
+
+    def percentis_andar(
+        self, percentis: tuple[int, ...] = (50, 90, 99), classe: str | None = None
+    ) -> dict[int, int]:
+        """Percentis (posto mais próximo) do andar alcançado, pelo histograma agregado."""
+        with self._conectar() as conexao:
+            if classe is None:
+                linhas = conexao.execute(
+                    "SELECT andar, SUM(runs) FROM estat_andar GROUP BY andar ORDER BY andar"
+                ).fetchall()
+            else:
+                linhas = conexao.execute(
+                    "SELECT andar, runs FROM estat_andar WHERE classe = ? ORDER BY andar",
+                    (classe,),
+                ).fetchall()
+        return _percentis_de_histograma(linhas, percentis)
+
+    def inimigo_mais_letal_por_andar(self) -> dict[int, tuple[str, int]]:
+        """Para cada andar com mortes, o inimigo que mais matou ali e quantas vezes."""
+        with self._conectar() as conexao:
+            linhas = conexao.execute(
+                "SELECT andar, inimigo, mortes FROM estat_letalidade "
+                "ORDER BY andar, mortes DESC, inimigo"
+            ).fetchall()
+        letais: dict[int, tuple[str, int]] = {}
+        for andar, inimigo, mortes in linhas:
+            letais.setdefault(andar, (inimigo, mortes))
+        return letais
+
+    def melhor_andar_por_classe(self) -> dict[str, int]:
+        """Andar mais profundo alcançado por classe."""
+        with self._conectar() as conexao:
+            linhas = conexao.execute(
+                "SELECT classe, melhor_andar FROM estat_classe "
+                "WHERE classe != ? AND melhor_andar > 0 ORDER BY 2 DESC, 1",
+                (CLASSE_DESCONHECIDA,),
+            ).fetchall()
+        return {classe: int(andar) for classe, andar in linhas}
+
+    def causas_de_morte(self, limite: int = 5) -> list[tuple[str, int]]:
+        """Inimigos que mais encerraram runs, com a contagem de mortes."""
+        with self._conectar() as conexao:
+            linhas = conexao.execute(
+                "SELECT inimigo, SUM(mortes) FROM estat_letalidade "
+                "GROUP BY inimigo ORDER BY 2 DESC, 1 LIMIT ?",
+                (limite,),
+            ).fetchall()
+        return [(causa, int(total)) for causa, total in linhas]
+
+    def limpar(self) -> None:
+        """Apaga todas as runs registradas e as estatísticas delas."""
+        if not self.caminho.exists():
+            return
+        with self._conectar() as conexao:
+            for tabela in ("runs", "estat_classe", "estat_andar", "estat_letalidade"):
+                conexao.execute(f"DELETE FROM {tabela}")
+
+    @contextmanager
+    def _conectar(self) -> Iterator[sqlite3.Connection]:
+        """Abre o banco, garante o schema e faz commit (ou rollback) ao sair."""
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self.caminho, timeout=5.0)) as conexao:
+            with conexao:
+                versao = conexao.execute("PRAGMA user_version").fetchone()[0]
+                if versao < SCHEMA_HISTORICO:
+                    conexao.executescript(_SCHEMA)
+                    conexao.executescript(_SCHEMA_ESTATISTICAS)
+                    if versao >= 1:
+                        conexao.executescript(_RECALCULAR_ESTATISTICAS)
+                    conexao.execute(f"PRAGMA user_version = {SCHEMA_HISTORICO}")
+            with conexao:
+                yield conexao
+
+
+def _filtros(
+    classe: str | None,
+    dificuldade: str | None,
+    seed_run: int | None,
+    andar_minimo: int | None,
+) -> tuple[str, tuple[object, ...]]:
+    """Monta a cláusula WHERE (só colunas indexadas) e os parâmetros dela."""
+    condicoes: list[str] = []
+    parametros: list[object] = []
+    for coluna, valor in (("classe", classe), ("dificuldade", dificuldade), ("seed_run", seed_run)):
+        if valor is not None:
+            condicoes.append(f"{coluna} = ?")
+            parametros.append(valor)
+    if andar_minimo is not None:
+        condicoes.append("andar_alcancado >= ?")
+        parametros.append(andar_minimo)
+    where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+    return where, tuple(parametros)
+
+
+def _acumular(conexao: sqlite3.Connection, entradas: list[EntradaHistorico]) -> None:
+    """Soma as runs às tabelas agregadas (na transação da inserção)."""
+    classes: list[tuple[object, ...]] = []
+    andares: list[tuple[object, ...]] = []
+    mortes: list[tuple[object, ...]] = []
+    for entrada in entradas:
+        classe = entrada.get("classe") or CLASSE_DESCONHECIDA
+        andar = _inteiro_ou_none(entrada.get("andar_alcancado"))
+        motivo = entrada.get("motivo")
+        turnos = _inteiro_ou_none(entrada.get("turnos_totais")) or 0
+        classes.append(
+            (classe, motivo == "morte", motivo == "saida", andar or 0, andar or 0, turnos)
+        )
+        if andar is not None:
+            andares.append((classe, andar))
+            causa = entrada.get("inimigo_causa_morte")
+            if motivo == "morte" and causa:
+                mortes.append((andar, causa))
+    conexao.executemany(_ACUMULAR_CLASSE, classes)
+    conexao.executemany(_ACUMULAR_ANDAR, andares)
+    conexao.executemany(_ACUMULAR_LETALIDADE, mortes)
+
+
+def _percentis_de_histograma(
+    histograma: list[tuple[int, int]], percentis: tuple[int, ...]
+) -> dict[int, int]:
+    """Percentis pelo posto mais próximo sobre pares `(andar, runs)` em ordem crescente."""
+    total = sum(runs for _, runs in histograma)
+    if not total:
+        return {}
+    resultado: dict[int, int] = {}
+    for percentil in percentis:
+        posto = max(1, -(-percentil * total // 100))
+        acumulado = 0
+        for andar, runs in histograma:
+            acumulado += runs
+            if acumulado >= posto:
+                resultado[percentil] = andar
+                break
+    return resultado
+
+
+def _inteiro_ou_none(valor: object) -> int | None:
+    return valor if isinstance(valor, int) and not isinstance(valor, bool) else None
+
+
+def _linha_de(entrada: EntradaHistorico) -> tuple[object, ...]:
+    """Extrai as colunas indexadas de uma entrada, mantendo o registro completo em JSON."""
+    return (
+        entrada.get("timestamp_local"),
+        entrada.get("motivo"),
+        entrada.get("personagem"),
+        entrada.get("classe"),
+        entrada.get("dificuldade"),
+        _inteiro_ou_none(entrada.get("andar_alcancado")),
+        _inteiro_ou_none(entrada.get("seed_run")),
+        entrada.get("inimigo_causa_morte"),
+        json.dumps(entrada, ensure_ascii=False, separators=(",", ":")),
+    )
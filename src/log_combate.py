@@ -0,0 +1,104 @@
+"""Log de combate em buffer circular, com formatação preguiçosa.
+
+Cada entrada guarda apenas um modelo (`str.format` posicional) e os argumentos do
+evento; o texto só é montado quando a tela precisa exibi-lo. Quando o buffer em
+memória enche, a metade mais antiga é formatada e despejada num arquivo temporário,
+de modo que lutas muito longas (chefes) ocupam memória constante sem perder o
+histórico mostrado em `desenhar_log_completo`.
+"""
+
+from __future__ import annotations
+
+import json
+import tempfile
+from collections import deque
+from collections.abc import Iterator, Sequence
+from typing import IO, overload
+
+from src import config
+
+type EntradaLog = tuple[str, tuple[object, ...]]
+
+
+def formatar_entrada(modelo: str, argumentos: tuple[object, ...]) -> str:
+    """Monta o texto de uma entrada; modelos sem argumentos são usados literalmente."""
+    return modelo.format(*argumentos) if argumentos else modelo
+
+
+class LogCombate(Sequence[str]):
+    """Sequência de mensagens de combate com limite de memória e transbordo em disco."""
+
+    def __init__(self, limite_memoria: int | None = None) -> None:
+        self.limite_memoria = max(2, limite_memoria or config.COMBATE_LOG_LIMITE_MEMORIA)
+        self._entradas: deque[EntradaLog] = deque()
+        self._transbordo: IO[str] | None = None
+        self._transbordadas = 0
+
+    def registrar(self, modelo: str, *argumentos: object) -> None:
+        """Acrescenta um evento sem formatá-lo."""
+        if len(self._entradas) >= self.limite_memoria:
+            self._transbordar()
+        self._entradas.append((modelo, argumentos))
+
+    def append(self, mensagem: str) -> None:
+        """Compatibilidade com `list.append` para mensagens já prontas."""
+        self.registrar(mensagem)
+
+    @property
+    def transbordadas(self) -> int:
+        """Quantidade de entradas que já foram despejadas em disco."""
+        return self._transbordadas
+
+    def _transbordar(self) -> None:
+        """Despeja a metade mais antiga do buffer no arquivo temporário, de uma vez."""
+        if self._transbordo is None:
+            # Vive enquanto o log existir; o arquivo some sozinho ao ser coletado.
+            self._transbordo = tempfile.TemporaryFile("w+", encoding="utf-8")  # noqa: SIM115
+        quantidade = len(self._entradas) // 2
+        linhas = [
+            json.dumps(formatar_entrada(*self._entradas.popleft()), ensure_ascii=False) + "\n"
+            for _ in range(quantidade)
+        ]
+        self._transbordo.seek(0, 2)
+        self._transbordo.writelines(linhas)
+        self._transbordadas += quantidade
+
+    def _ler_transbordo(self) -> list[str]:
+        if self._transbordo is None:
+            return []
+        self._transbordo.flush()
+        self._transbordo.seek(0)
+        return [json.loads(linha) for linha in self._transbordo]
+
+    def __len__(self) -> int:
+        return self._transbordadas + len(self._entradas)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._ler_transbordo()
+        for modelo, argumentos in self._entradas:
+            yield formatar_entrada(modelo, argumentos)
+
+    @overload
+    def __getitem__(self, indice: int) -> str: ...
+
+    @overload
+    def __getitem__(self, indice: slice) -> list[str]: ...
+
+    def __getitem__(self, indice: int | slice) -> str | list[str]:
+        if isinstance(indice, slice):
+            posicoes = range(len(self))[indice]
+            if not posicoes:
+                return []
+            em_disco = self._ler_transbordo() if min(posicoes) < self._transbordadas else []
+            return [self._mensagem(posicao, em_disco) for posicao in posicoes]
+        posicao = range(len(self))[indice]
+        em_disco = self._ler_transbordo() if posicao < self._transbordadas else []
+        return self._mensagem(posicao, em_disco)
+
+    def _mensagem(self, posicao: int, em_disco: list[str]) -> str:
+        if posicao < self._transbordadas:
+            return em_disco[posicao]
+        return formatar_entrada(*self._entradas[posicao - self._transbordadas])
+
+    def __repr__(self) -> str:
+        return f"LogCombate({len(self)} entradas, {self._transbordadas} em disco)"
@@ -0,0 +1,193 @@
+"""Representação compacta do mapa de um andar.
+
+A maior parte de um andar é parede. Em vez de uma `Sala` completa por célula, o
+`MapaCompacto` guarda um `bytearray` com o tipo de cada célula (parede ou sala) e um
+dicionário esparso só com as salas de verdade; todas as paredes apontam para uma
+mesma instância compartilhada. Para o resto do jogo nada muda: `mapa[y][x]` lê e
+escreve salas, `len(mapa)`, `len(mapa[0])` e a iteração por linhas seguem valendo.
+"""
+
+from __future__ import annotations
+
+import copy
+from collections.abc import Iterable, Iterator
+from typing import Any, overload
+
+from src.entidades import Sala
+
+CELULA_PAREDE = 0
+CELULA_SALA = 1
+
+type Mapa = MapaCompacto | list[list[Sala]]
+
+
+def criar_parede(nivel: int = 1) -> Sala:
+    """Cria a parede padrão de um andar (compartilhada por todas as células de parede)."""
+    return Sala(
+        tipo="parede",
+        nome="Parede",
+        descricao="Pedra maciça bloqueando a passagem.",
+        pode_ter_inimigo=False,
+        nivel_area=nivel,
+    )
+
+
+class LinhaMapa:
+    """Visão de uma linha do mapa, compatível com `list[Sala]` para leitura e escrita."""
+
+    __slots__ = ("_mapa", "_y")
+
+    def __init__(self, mapa: MapaCompacto, y: int) -> None:
+        self._mapa = mapa
+        self._y = y
+
+    def __len__(self) -> int:
+        return self._mapa.largura
+
+    @overload
+    def __getitem__(self, x: int) -> Sala: ...
+
+    @overload
+    def __getitem__(self, x: slice) -> list[Sala]: ...
+
+    def __getitem__(self, x: int | slice) -> Sala | list[Sala]:
+        if isinstance(x, slice):
+            return [self._mapa.obter(i, self._y) for i in range(self._mapa.largura)[x]]
+        return self._mapa.obter(range(self._mapa.largura)[x], self._y)
+
+    def __setitem__(self, x: int, sala: Sala) -> None:
+        self._mapa.definir(range(self._mapa.largura)[x], self._y, sala)
+
+    def __iter__(self) -> Iterator[Sala]:
+        obter = self._mapa.obter
+        for x in range(self._mapa.largura):
+            yield obter(x, self._y)
+
+
+class MapaCompacto:
+    """Grade `largura x altura` com paredes compartilhadas e salas esparsas."""
+
+    __slots__ = ("_celulas", "_linhas", "_salas", "altura", "largura", "parede")
+
+    def __init__(self, largura: int, altura: int, parede: Sala | None = None) -> None:
+        if largura <= 0 or altura <= 0:
+            raise ValueError("O mapa precisa ter largura e altura positivas.")
+        self.largura = largura
+        self.altura = altura
+        self.parede = parede or criar_parede()
+        self._celulas = bytearray(largura * altura)
+        self._salas: dict[int, Sala] = {}
+        self._linhas = [LinhaMapa(self, y) for y in range(altura)]
+
+    @classmethod
+    def de_linhas(cls, linhas: Iterable[Iterable[Sala]]) -> MapaCompacto:
+        """Converta uma grade `list[list[Sala]]`, deduplicando paredes idênticas."""
+        grade = [list(linha) for linha in linhas]
+        if not grade or not grade[0]:
+            raise ValueError("O mapa precisa ter largura e altura positivas.")
+        parede = next(
+            (sala for linha in grade for sala in linha if sala.tipo == "parede"),
+            None,
+        )
+        mapa = cls(len(grade[0]), len(grade), parede)
+        for y, linha in enumerate(grade):
+            for x, sala in enumerate(linha):
+                if sala is not mapa.parede and sala != mapa.parede:
+                    mapa.definir(x, y, sala)
+        return mapa
+
+    @classmethod
+    def de_dicts(cls, linhas: list[list[dict[str, Any]]]) -> MapaCompacto:
+        """Hidrata o formato serializado sem criar uma `Sala` por parede repetida."""
+        if not linhas or not linhas[0]:
+            raise ValueError("O mapa precisa ter largura e altura positivas.")
+        parede_dados = next(
+            (dados for linha in linhas for dados in linha if dados.get("tipo") == "parede"),
+            None,
+        )
+        parede = Sala.from_dict(parede_dados) if parede_dados is not None else None
+        mapa = cls(len(linhas[0]), len(linhas), parede)
+        for y, linha in enumerate(linhas):
+            for x, dados in enumerate(linha):
+                if dados is parede_dados or dados == parede_dados:
+                    continue
+                mapa.definir(x, y, Sala.from_dict(dados))
+        return mapa
+
+    def copiar(self) -> MapaCompacto:
+        """Cópia independente: cada sala é copiada; a parede compartilhada também."""
+        novo = MapaCompacto(self.largura, self.altura, copy.copy(self.parede))
+        novo._celulas[:] = self._celulas
+        novo._salas = {indice: _copiar_sala(sala) for indice, sala in self._salas.items()}
+        return novo
+
+    def _indice(self, x: int, y: int) -> int:
+        if not (0 <= x < self.largura and 0 <= y < self.altura):
+            raise IndexError(f"Posição fora do mapa: ({x}, {y}).")
+        return y * self.largura + x
+
+    def obter(self, x: int, y: int) -> Sala:
+        """Retorna a sala em `(x, y)` (a parede compartilhada, se for parede)."""
+        indice = self._indice(x, y)
+        if self._celulas[indice] == CELULA_PAREDE:
+            return self.parede
+        return self._salas[indice]
+
+    def definir(self, x: int, y: int, sala: Sala) -> None:
+        """Coloca `sala` em `(x, y)`; a parede compartilhada volta a ser implícita."""
+        indice = self._indice(x, y)
+        if sala is self.parede:
+            self._celulas[indice] = CELULA_PAREDE
+            self._salas.pop(indice, None)
+            return
+        self._celulas[indice] = CELULA_SALA
+        self._salas[indice] = sala
+
+    def eh_parede(self, x: int, y: int) -> bool:
+        """Consulta rápida que não materializa a sala."""
+        indice = self._indice(x, y)
+        return self._celulas[indice] == CELULA_PAREDE or self._salas[indice].tipo == "parede"
+
+    def salas(self) -> Iterator[tuple[int, int, Sala]]:
+        """Itera `(x, y, sala)` apenas pelas células que não são a parede compartilhada."""
+        for indice in sorted(self._salas):
+            y, x = divmod(indice, self.largura)
+            yield x, y, self._salas[indice]
+
+    @property
+    def quantidade_salas(self) -> int:
+        """Número de células com sala própria."""
+        return len(self._salas)
+
+    def __len__(self) -> int:
+        return self.altura
+
+    def __getitem__(self, y: int) -> LinhaMapa:
+        return self._linhas[y]
+
+    def __iter__(self) -> Iterator[LinhaMapa]:
+        return iter(self._linhas)
+
+    def __repr__(self) -> str:
+        return f"MapaCompacto({self.largura}x{self.altura}, {len(self._salas)} salas)"
+
+
+def _copiar_sala(sala: Sala) -> Sala:
+    """Cópia rasa basta para os campos imutáveis; só o inimigo precisa de cópia própria."""
+    nova = copy.copy(sala)
+    if sala.inimigo_atual is not None:
+        nova.inimigo_atual = copy.deepcopy(sala.inimigo_atual)
+    return nova
+
+
+def iterar_salas(mapa: Mapa) -> Iterator[tuple[int, int, Sala]]:
+    """Itera `(x, y, sala)` pelas salas que não são parede, em ordem de linha."""
+    if isinstance(mapa, MapaCompacto):
+        for x, y, sala in mapa.salas():
+            if sala.tipo != "parede":
+                yield x, y, sala
+        return
+    for y, linha in enumerate(mapa):
+        for x, sala in enumerate(linha):
+            if sala.tipo != "parede":
+                yield x, y, sala
@@ -0,0 +1,231 @@
+"""Motor de combate por turnos sem dependência de UI.
+
+O motor resolve um turno por vez (`EstadoCombate.step`) com as mesmas regras de dano
+usadas no jogo interativo, permitindo rodar lutas em lote, em testes ou em simulações
+de balanceamento sem passar pela renderização do `rich`.
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import Enum, auto
+
+from src.entidades import Inimigo, Personagem
+from src.log_combate import LogCombate
+
+CHANCE_DE_FUGA = 0.5
+LIMITE_TURNOS_PADRAO = 1000
+
+# Modelos do log: {0} = nome do inimigo, {1} = dano e, no breakdown, {2} = ataque,
+# {3} = variação, {4} = defesa, {5} = sufixo do piso mínimo.
+_MODELO_DETALHE_DANO = "(ATK {2} x {3:.2f} - DEF {4} -> {1}{5})"
+_SUFIXO_PISO = ", piso mínimo"
+_GOLPE_JOGADOR = "Você ataca o {0} e causa {1} de dano!"
+_REVIDE_INIMIGO = "O {0} ataca e causa {1} de dano em você!"
+_REVIDE_DURANTE_CURA = "O {0} ataca enquanto você se curava e causa {1} de dano!"
+_REVIDE_APOS_FUGA = "O {0} ataca e causa {1} de dano!"
+_COM_DETALHE = {
+    modelo: f"{modelo} {_MODELO_DETALHE_DANO}"
+    for modelo in (_GOLPE_JOGADOR, _REVIDE_INIMIGO, _REVIDE_DURANTE_CURA, _REVIDE_APOS_FUGA)
+}
+
+
+class AcaoCombate(Enum):
+    """Ações que um combatente pode escolher no seu turno."""
+
+    ATACAR = auto()
+    USAR_ITEM = auto()
+    FUGIR = auto()
+
+
+class ResultadoCombate(Enum):
+    """Desfechos possíveis de uma luta."""
+
+    VITORIA = auto()
+    DERROTA = auto()
+    FUGA = auto()
+
+
+PoliticaCombate = Callable[["EstadoCombate"], AcaoCombate]
+UsarItemCallback = Callable[[Personagem], bool | None]
+
+
+def rolar_dano(
+    ataque: int,
+    defesa: int,
+    rng: random.Random | None = None,
+) -> tuple[int, float, bool]:
+    """Sorteia o dano de um ataque e retorna `(dano, variacao, piso_aplicado)`."""
+    rng = rng or random
+    variacao = rng.uniform(0.8, 1.2)
+    dano_bruto = ataque * variacao
+    dano_sem_piso = max(0, int(dano_bruto - defesa))
+    piso_aplicado = dano_sem_piso <= 0 and ataque > 0
+    # Garante progresso no combate, evitando lutas infinitas por defesa alta.
+    dano_final = 1 if piso_aplicado else dano_sem_piso
+    return dano_final, variacao, piso_aplicado
+
+
+def formatar_detalhe_dano(
+    ataque: int,
+    defesa: int,
+    variacao: float,
+    dano: int,
+    piso_aplicado: bool,
+) -> str:
+    """Monta o texto de breakdown do cálculo de dano."""
+    sufixo = _SUFIXO_PISO if piso_aplicado else ""
+    return _MODELO_DETALHE_DANO.format(None, dano, ataque, variacao, defesa, sufixo)
+
+
+def calcular_dano(ataque: int, defesa: int, rng: random.Random | None = None) -> int:
+    """Calcula o dano de um ataque, com um fator de aleatoriedade."""
+    dano, _, _ = rolar_dano(ataque, defesa, rng=rng)
+    return dano
+
+
+def _calcular_dano_com_detalhes(
+    ataque: int,
+    defesa: int,
+    rng: random.Random | None = None,
+) -> tuple[int, str]:
+    """Retorne o dano e o breakdown do cálculo para logs detalhados."""
+    dano, variacao, piso_aplicado = rolar_dano(ataque, defesa, rng=rng)
+    return dano, formatar_detalhe_dano(ataque, defesa, variacao, dano, piso_aplicado)
+
+
+def politica_sempre_atacar(_estado: EstadoCombate) -> AcaoCombate:
+    """Política padrão: ataca em todos os turnos."""
+    return AcaoCombate.ATACAR
+
+
+@dataclass
+class EstadoCombate:
+    """Estado mutável de uma luta entre o jogador e um inimigo.
+
+    As entidades são alteradas no próprio objeto (HP); quem precisar preservar os
+    originais deve passar cópias.
+    """
+
+    jogador: Personagem
+    inimigo: Inimigo
+    rng: random.Random | None = None
+    politica_inimigo: PoliticaCombate = politica_sempre_atacar
+    usar_item: UsarItemCallback | None = None
+    mostrar_breakdown: bool = False
+    registrar_log: bool = True
+    log: LogCombate = field(default_factory=LogCombate)
+    turnos: int = 0
+    resultado: ResultadoCombate | None = None
+
+    def __post_init__(self) -> None:
+        if self.registrar_log and not self.log:
+            self.log.registrar("Um {0} selvagem aparece!", self.inimigo.nome)
+
+    @property
+    def encerrado(self) -> bool:
+        """Indica se a luta já tem desfecho."""
+        return self.resultado is not None
+
+    def registrar(self, modelo: str, *argumentos: object) -> None:
+        """Acrescenta um evento ao log, se o registro estiver ativo (formatado só ao exibir)."""
+        if self.registrar_log:
+            self.log.registrar(modelo, *argumentos)
+
+    def step(self, acao: AcaoCombate) -> ResultadoCombate | None:
+        """Resolve um turno completo a partir da ação do jogador.
+
+        Retorna o desfecho quando a luta termina neste turno, ou `None`.
+        """
+        if self.encerrado:
+            return self.resultado
+
+        if acao is AcaoCombate.ATACAR:
+            self.turnos += 1
+            dano = self._golpear(self.jogador.ataque, self.inimigo.defesa, _GOLPE_JOGADOR)
+            self.inimigo.hp -= dano
+            if not self.inimigo.esta_vivo():
+                self.registrar("Você derrotou o {0}!", self.inimigo.nome)
+                self.resultado = ResultadoCombate.VITORIA
+                return self.resultado
+            self._turno_inimigo(_REVIDE_INIMIGO, anunciar_derrota=True)
+
+        elif acao is AcaoCombate.USAR_ITEM:
+            if self.usar_item is None or not self.usar_item(self.jogador):
+                self.registrar("Você não tem itens consumíveis ou decidiu não usar.")
+                return None
+            self.turnos += 1
+            self.registrar("Você usou um item e recuperou vida!")
+            self._turno_inimigo(_REVIDE_DURANTE_CURA)
+
+        elif acao is AcaoCombate.FUGIR:
+            self.turnos += 1
+            rng = self.rng or random
+            if rng.random() < CHANCE_DE_FUGA:
+                self.registrar("Você conseguiu fugir!")
+                self.resultado = ResultadoCombate.FUGA
+                return self.resultado
+            self.registrar("Você tentou fugir, mas falhou!")
+            self._turno_inimigo(_REVIDE_APOS_FUGA)
+
+        return self.resultado
+
+    def _golpear(self, ataque: int, defesa: int, modelo: str) -> int:
+        """Sorteia um golpe, registra o evento no log e devolve o dano."""
+        dano, variacao, piso = rolar_dano(ataque, defesa, rng=self.rng)
+        if self.registrar_log:
+            if self.mostrar_breakdown:
+                self.log.registrar(
+                    _COM_DETALHE[modelo],
+                    self.inimigo.nome,
+                    dano,
+                    ataque,
+                    variacao,
+                    defesa,
+                    _SUFIXO_PISO if piso else "",
+                )
+            else:
+                self.log.registrar(modelo, self.inimigo.nome, dano)
+        return dano
+
+    def _turno_inimigo(self, modelo: str, anunciar_derrota: bool = False) -> None:
+        """Executa a ação do inimigo e verifica a derrota do jogador."""
+        if self.politica_inimigo(self) is AcaoCombate.ATACAR:
+            self.jogador.hp -= self._golpear(self.inimigo.ataque, self.jogador.defesa, modelo)
+        else:
+            self.registrar("O {0} hesita e não ataca.", self.inimigo.nome)
+        if not self.jogador.esta_vivo():
+            if anunciar_derrota:
+                self.registrar("Você foi derrotado...")
+            self.resultado = ResultadoCombate.DERROTA
+
+
+def resolver_combate(
+    jogador: Personagem,
+    inimigo: Inimigo,
+    politica_jogador: PoliticaCombate = politica_sempre_atacar,
+    politica_inimigo: PoliticaCombate = politica_sempre_atacar,
+    rng: random.Random | None = None,
+    usar_item: UsarItemCallback | None = None,
+    registrar_log: bool = False,
+    limite_turnos: int = LIMITE_TURNOS_PADRAO,
+) -> EstadoCombate:
+    """Roda uma luta inteira sem UI e devolve o estado final.
+
+    Se `limite_turnos` for atingido sem desfecho, o estado volta com `resultado` `None`.
+    """
+    estado = EstadoCombate(
+        jogador=jogador,
+        inimigo=inimigo,
+        rng=rng,
+        politica_inimigo=politica_inimigo,
+        usar_item=usar_item,
+        registrar_log=registrar_log,
+    )
+    tentativas = 0
+    while not estado.encerrado and tentativas < limite_turnos:
+        tentativas += 1
+        estado.step(politica_jogador(estado))
+    return estado
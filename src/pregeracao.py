@@ -0,0 +1,78 @@
+"""Pré-geração especulativa do próximo andar numa thread de fundo.
+
+Enquanto o jogador explora, o próximo andar é gerado em paralelo a partir de uma
+seed derivada de `seed_run` e do número do andar. A chave do pedido inclui tudo o
+que influencia a geração (dificuldade, tamanho, trama); se algo mudar até a
+descida, o resultado antecipado é descartado e o andar é gerado na hora, com o
+mesmo resultado que teria sem a pré-geração.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from src.erros import ErroDadosError
+from src.mapa_compacto import MapaCompacto
+
+type ChaveAndar = tuple[Hashable, ...]
+
+
+class PreGeradorAndares:
+    """Mantém no máximo um andar sendo gerado em segundo plano."""
+
+    def __init__(self) -> None:
+        self._executor: ThreadPoolExecutor | None = None
+        self._chave: ChaveAndar | None = None
+        self._futuro: Future[MapaCompacto] | None = None
+        self.aproveitados = 0
+        self.descartados = 0
+
+    @property
+    def chave_agendada(self) -> ChaveAndar | None:
+        """Chave do andar em pré-geração, se houver."""
+        return self._chave
+
+    def agendar(self, chave: ChaveAndar, gerar: Callable[[], MapaCompacto]) -> None:
+        """Começa a gerar o andar de `chave`, trocando qualquer pedido diferente."""
+        if self._futuro is not None and self._chave == chave:
+            return
+        self.descartar()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="pregeracao-andar"
+            )
+        self._chave = chave
+        self._futuro = self._executor.submit(gerar)
+
+    def obter(self, chave: ChaveAndar) -> MapaCompacto | None:
+        """Entrega o andar pré-gerado se a chave bater (esperando terminar), senão `None`."""
+        futuro, chave_agendada = self._futuro, self._chave
+        self._futuro = self._chave = None
+        if futuro is None:
+            return None
+        if chave_agendada != chave:
+            futuro.cancel()
+            self.descartados += 1
+            return None
+        try:
+            mapa = futuro.result()
+        except (ErroDadosError, OSError, ValueError):
+            # A geração síncrona vai repetir o erro no fluxo normal, com a UI de erro.
+            return None
+        self.aproveitados += 1
+        return mapa
+
+    def descartar(self) -> None:
+        """Abandona o pedido em andamento (o resultado, se vier, é ignorado)."""
+        if self._futuro is not None:
+            self._futuro.cancel()
+            self.descartados += 1
+        self._futuro = self._chave = None
+
+    def encerrar(self) -> None:
+        """Descarta pedidos e libera a thread de trabalho."""
+        self.descartar()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
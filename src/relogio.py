@@ -0,0 +1,63 @@
+"""Relógios de ritmo do jogo: pausas reais, instantâneas ou aceleradas.
+
+O fluxo do jogo nunca chama `time.sleep` diretamente; ele pede uma pausa ao relógio
+guardado em `ContextoJogo.relogio`. O jogo interativo usa `RelogioReal`, enquanto
+sessões roteirizadas, replays e testes usam `RelogioInstantaneo` (sem espera) ou
+`RelogioAcelerado` (esperas divididas por um fator).
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Protocol
+
+
+class Relogio(Protocol):
+    """Interface mínima de ritmo usada pela UI."""
+
+    def pausar(self, segundos: float) -> None:
+        """Segura o fluxo por `segundos` (ou pelo equivalente deste relógio)."""
+        ...
+
+
+@dataclass
+class RelogioReal:
+    """Pausas de verdade, para o jogador conseguir ler o feedback."""
+
+    def pausar(self, segundos: float) -> None:
+        """Dorme pelo tempo pedido."""
+        if segundos > 0:
+            time.sleep(segundos)
+
+
+@dataclass
+class RelogioInstantaneo:
+    """Não espera nada; apenas contabiliza o tempo virtual que teria passado."""
+
+    tempo_virtual: float = 0.0
+    pausas: int = 0
+
+    def pausar(self, segundos: float) -> None:
+        """Registra a pausa sem bloquear."""
+        self.pausas += 1
+        self.tempo_virtual += max(0.0, segundos)
+
+
+@dataclass
+class RelogioAcelerado:
+    """Mantém o ritmo relativo das pausas, mas `fator` vezes mais rápido."""
+
+    fator: float = 10.0
+
+    def __post_init__(self) -> None:
+        if self.fator <= 0:
+            raise ValueError("O fator de aceleração deve ser positivo.")
+
+    def pausar(self, segundos: float) -> None:
+        """Dorme uma fração do tempo pedido."""
+        if segundos > 0:
+            time.sleep(segundos / self.fator)
+
+
+RELOGIO_REAL = RelogioReal()
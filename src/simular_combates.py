@@ -0,0 +1,143 @@
+"""Simulação Monte Carlo vetorizada de combates para checagens de balanceamento.
+
+Resolve N lutas "sempre atacar" em paralelo com NumPy, usando a mesma regra de dano de
+`src.motor_combate.rolar_dano` (variação `uniform(0.8, 1.2)`, truncamento e piso de 1).
+NumPy é uma dependência opcional: o jogo não precisa dela, apenas esta ferramenta.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike, NDArray
+
+LIMITE_TURNOS_PADRAO = 1000
+
+
+@dataclass(frozen=True)
+class ResultadoSimulacao:
+    """Resultados por luta de uma simulação em lote."""
+
+    vitorias: NDArray[Any]
+    encerradas: NDArray[Any]
+    turnos: NDArray[Any]
+    hp_jogador: NDArray[Any]
+    hp_inimigo: NDArray[Any]
+
+    @property
+    def total(self) -> int:
+        """Quantidade de lutas simuladas."""
+        return int(self.vitorias.size)
+
+    @property
+    def taxa_vitoria(self) -> float:
+        """Fração de lutas vencidas pelo jogador."""
+        return float(self.vitorias.mean()) if self.total else 0.0
+
+    def distribuicao_turnos(self) -> dict[int, int]:
+        """Histograma de turnos até o fim das lutas encerradas."""
+        return _histograma(self.turnos[self.encerradas])
+
+    def distribuicao_hp_restante(self) -> dict[int, int]:
+        """Histograma do HP que sobra ao jogador nas vitórias."""
+        return _histograma(self.hp_jogador[self.vitorias])
+
+
+def numpy_disponivel() -> bool:
+    """Informa se a simulação vetorizada pode ser usada neste ambiente."""
+    return np is not None
+
+
+def simular_combates(
+    ataque_jogador: ArrayLike,
+    defesa_jogador: ArrayLike,
+    hp_jogador: ArrayLike,
+    ataque_inimigo: ArrayLike,
+    defesa_inimigo: ArrayLike,
+    hp_inimigo: ArrayLike,
+    quantidade: int | None = None,
+    rng: np.random.Generator | int | None = None,
+    limite_turnos: int = LIMITE_TURNOS_PADRAO,
+) -> ResultadoSimulacao:
+    """Resolve várias lutas em lockstep, turno a turno, vetorizando entre as lutas.
+
+    Cada atributo pode ser escalar ou array; todos são difundidos para `quantidade`
+    lutas (ou para o maior array informado). A ordem de cada turno é a mesma do jogo:
+    o jogador ataca e, se o inimigo sobreviver, o inimigo revida.
+    """
+    if np is None:
+        raise ImportError("A simulação vetorizada de combates requer NumPy (pip install numpy).")
+
+    gerador = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+    atributos = np.broadcast_arrays(
+        *(
+            np.asarray(valor, dtype=np.int64)
+            for valor in (
+                ataque_jogador,
+                defesa_jogador,
+                hp_jogador,
+                ataque_inimigo,
+                defesa_inimigo,
+                hp_inimigo,
+            )
+        )
+    )
+    if quantidade is not None:
+        atributos = [np.broadcast_to(valor, (quantidade,)) for valor in atributos]
+    atk_j, def_j, hp_j, atk_i, def_i, hp_i = (
+        np.array(valor, dtype=np.int64).reshape(-1) for valor in atributos
+    )
+
+    total = hp_j.size
+    vitorias = np.zeros(total, dtype=bool)
+    encerradas = np.zeros(total, dtype=bool)
+    turnos = np.zeros(total, dtype=np.int64)
+    ativas = np.arange(total)
+
+    for _ in range(limite_turnos):
+        if ativas.size == 0:
+            break
+        turnos[ativas] += 1
+
+        variacao = gerador.uniform(0.8, 1.2, ativas.size)
+        hp_i[ativas] -= _dano_vetorizado(atk_j[ativas], def_i[ativas], variacao)
+        inimigo_caiu = hp_i[ativas] <= 0
+        vencidas = ativas[inimigo_caiu]
+        vitorias[vencidas] = True
+        encerradas[vencidas] = True
+
+        revide = ativas[~inimigo_caiu]
+        variacao = gerador.uniform(0.8, 1.2, revide.size)
+        hp_j[revide] -= _dano_vetorizado(atk_i[revide], def_j[revide], variacao)
+        jogador_caiu = hp_j[revide] <= 0
+        encerradas[revide[jogador_caiu]] = True
+
+        ativas = revide[~jogador_caiu]
+
+    return ResultadoSimulacao(
+        vitorias=vitorias,
+        encerradas=encerradas,
+        turnos=turnos,
+        hp_jogador=hp_j,
+        hp_inimigo=hp_i,
+    )
+
+
+def _dano_vetorizado(
+    ataque: NDArray[Any], defesa: NDArray[Any], variacao: NDArray[Any]
+) -> NDArray[Any]:
+    """Versão vetorizada de `rolar_dano`, com truncamento e piso mínimo de 1."""
+    dano = np.maximum(0, np.trunc(ataque * variacao - defesa)).astype(np.int64)
+    return np.where((dano <= 0) & (ataque > 0), 1, dano)
+
+
+def _histograma(valores: NDArray[Any]) -> dict[int, int]:
+    chaves, contagens = np.unique(valores, return_counts=True)
+    return {int(chave): int(contagem) for chave, contagem in zip(chaves, contagens, strict=True)}
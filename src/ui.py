@@ -1,7 +1,6 @@
-import json
+import sqlite3
 import unicodedata
 from collections.abc import Sequence
-from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 from rich import box
@@ -10,10 +9,11 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
-from src.armazenamento import limpar_historico
+from src.armazenamento import abrir_historico, limpar_historico
 from src.config import DificuldadePerfil
 from src.economia import formatar_preco
-from src.entidades import Item, Personagem
+from src.entidades import Item, Personagem, como_inventario
+from src.historico import HistoricoRuns
 from src.ui_base import (
     CLASSE_CORES,
     CLASSE_EMOJIS,
@@ -49,6 +49,7 @@ __all__ = [
     "desenhar_hud_exploracao",
     "desenhar_log_completo",
     "desenhar_menu_principal",
+    "desenhar_ranking",
     "desenhar_selecao_save",
     "desenhar_tela_combate",
     "desenhar_tela_equipar",
@@ -210,71 +211,178 @@ def desenhar_selecao_save(
 
 
 def desenhar_historico(limite: int = 20) -> None:
-    """Mostra histórico de runs gravado em saves/history.json."""
-    limpar_tela()
-    historico = []
-    caminho_hist = Path("saves/history.json")
-    if caminho_hist.exists():
-        try:
-            historico = json.loads(caminho_hist.read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError):
-            historico = []
-
-    tabela = Table(box=box.SIMPLE, border_style="cyan", expand=True)
-    tabela.add_column("Data/Hora", style="dim white")
-    tabela.add_column("Personagem", style="bold white")
-    tabela.add_column("Classe", style="white")
-    tabela.add_column("Motivo", style="white")
-    tabela.add_column("Andar", justify="right", style="yellow")
-    tabela.add_column("Dificuldade", style="white")
-    tabela.add_column("Inimigos", justify="right", style="white")
-    tabela.add_column("Itens", justify="right", style="white")
-    tabela.add_column("Chefe + profundo", style="white")
-    tabela.add_column("Marca da trama", style="white")
-
-    historico = (historico or [])[-limite:]
-    historico = list(reversed(historico))  # mais recente primeiro
+    """Mostra o histórico de runs, `limite` por página, com agregados de todas as runs."""
+    historico = abrir_historico()
+    pagina = 0
 
     def _cut(txt: object, limite: int = 18) -> str:
         s = str(txt)
         return s if len(s) <= limite else s[: limite - 1] + "…"
 
-    for entrada in historico:
-        chefe_info = ""
-        if entrada.get("chefe_mais_profundo_nivel"):
-            chefe_info = (
-                f"A{entrada.get('chefe_mais_profundo_nivel')} "
-                f"- {entrada.get('chefe_mais_profundo_nome', '')}"
+    while True:
+        limpar_tela()
+        resumo: str | None = None
+        try:
+            total = historico.contar()
+            paginas = max(1, -(-total // limite))
+            pagina = min(pagina, paginas - 1)
+            entradas = historico.consultar(pagina=pagina, por_pagina=limite)  # recentes antes
+            if total:
+                resumo = _resumo_historico(historico)
+            vazio = "Nenhuma run registrada"
+        except sqlite3.Error:
+            # Banco corrompido ou travado: mostra um histórico vazio em vez de encerrar.
+            total, paginas, pagina, entradas = 0, 1, 0, []
+            vazio = "Histórico indisponível"
+
+        tabela = Table(box=box.SIMPLE, border_style="cyan", expand=True)
+        tabela.add_column("Data/Hora", style="dim white")
+        tabela.add_column("Personagem", style="bold white")
+        tabela.add_column("Classe", style="white")
+        tabela.add_column("Motivo", style="white")
+        tabela.add_column("Andar", justify="right", style="yellow")
+        tabela.add_column("Dificuldade", style="white")
+        tabela.add_column("Inimigos", justify="right", style="white")
+        tabela.add_column("Itens", justify="right", style="white")
+        tabela.add_column("Chefe + profundo", style="white")
+        tabela.add_column("Marca da trama", style="white")
+
+        for entrada in entradas:
+            chefe_info = ""
+            if entrada.get("chefe_mais_profundo_nivel"):
+                chefe_info = (
+                    f"A{entrada.get('chefe_mais_profundo_nivel')} "
+                    f"- {entrada.get('chefe_mais_profundo_nome', '')}"
+                )
+            tabela.add_row(
+                _cut(entrada.get("timestamp_local", "?"), 19),
+                _cut(entrada.get("personagem", "?")),
+                _cut(entrada.get("classe", "?")),
+                _cut(entrada.get("motivo", "?")),
+                str(entrada.get("andar_alcancado", "?")),
+                _cut(entrada.get("dificuldade", "?"), 14),
+                str(entrada.get("inimigos_derrotados", 0)),
+                str(entrada.get("itens_obtidos", 0)),
+                chefe_info,
+                _cut(entrada.get("trama_consequencia", "-"), 26),
             )
-        tabela.add_row(
-            _cut(entrada.get("timestamp_local", "?"), 19),
-            _cut(entrada.get("personagem", "?")),
-            _cut(entrada.get("classe", "?")),
-            _cut(entrada.get("motivo", "?")),
-            str(entrada.get("andar_alcancado", "?")),
-            _cut(entrada.get("dificuldade", "?"), 14),
-            str(entrada.get("inimigos_derrotados", 0)),
-            str(entrada.get("itens_obtidos", 0)),
-            chefe_info,
-            _cut(entrada.get("trama_consequencia", "-"), 26),
-        )
 
-    if not historico:
-        tabela.add_row("—", "Nenhuma run registrada", "", "", "", "", "", "", "", "")
+        if not entradas:
+            tabela.add_row("—", vazio, "", "", "", "", "", "", "", "")
 
-    console.print(Panel(tabela, title="Histórico de Aventuras", border_style="blue"))
-    console.print(
-        Panel(
-            "Enter: voltar | L: limpar histórico",
-            border_style="magenta",
-            width=40,
+        console.print(
+            Panel(
+                tabela,
+                title="Histórico de Aventuras",
+                subtitle=f"Página {pagina + 1}/{paginas} · {total} runs",
+                border_style="blue",
+            )
         )
+        if resumo:
+            console.print(Panel(resumo, title="Resumo", border_style="cyan"))
+        console.print(
+            Panel(
+                "Enter: voltar | N/P: próxima/anterior | R: ranking | L: limpar histórico",
+                border_style="magenta",
+                width=76,
+            )
+        )
+        escolha = console.input("[bold yellow](Enter/N/P/R/L): [/]").strip().lower()
+        if escolha == "n":
+            pagina += 1
+        elif escolha == "p":
+            pagina = max(0, pagina - 1)
+        elif escolha == "r":
+            desenhar_ranking()
+        elif escolha == "l":
+            try:
+                limpar_historico()
+                console.print("[bold green]Histórico apagado.[/]")
+            except sqlite3.Error:
+                console.print("[bold red]Não foi possível apagar o histórico.[/]")
+            console.input("[bold yellow]Pressione Enter para voltar... [/]")
+            return
+        else:
+            return
+
+
+def _resumo_historico(historico: HistoricoRuns) -> str:
+    melhores = ", ".join(
+        f"{classe} A{andar}" for classe, andar in historico.melhor_andar_por_classe().items()
+    )
+    causas = ", ".join(f"{causa} ({mortes})" for causa, mortes in historico.causas_de_morte(3))
+    return (
+        f"Melhor andar por classe: {melhores or '-'}\nCausas de morte mais comuns: {causas or '-'}"
     )
-    escolha = console.input("[bold yellow](Enter/L): [/]").strip().lower()
-    if escolha == "l":
-        limpar_historico()
-        console.print("[bold green]Histórico apagado.[/]")
-        console.input("[bold yellow]Pressione Enter para voltar... [/]")
+
+
+def desenhar_ranking(limite: int = 10) -> None:
+    """Mostra as runs mais profundas e as estatísticas agregadas de todo o histórico."""
+    limpar_tela()
+    historico = abrir_historico()
+    try:
+        melhores_runs = historico.ranking(limite)
+        estatisticas = [
+            (estat, historico.percentis_andar((50, 90), classe=estat.classe))
+            for estat in historico.estatisticas_por_classe()
+        ]
+        mais_letais = historico.inimigo_mais_letal_por_andar()
+        vazio = "Nenhuma run registrada"
+    except sqlite3.Error:
+        melhores_runs, estatisticas, mais_letais = [], [], {}
+        vazio = "Histórico indisponível"
+
+    ranking = Table(box=box.SIMPLE, border_style="cyan", expand=True)
+    ranking.add_column("#", justify="right", style="bold yellow")
+    ranking.add_column("Personagem", style="bold white")
+    ranking.add_column("Classe", style="white")
+    ranking.add_column("Andar", justify="right", style="yellow")
+    ranking.add_column("Dificuldade", style="white")
+    ranking.add_column("Turnos", justify="right", style="white")
+    ranking.add_column("Desfecho", style="white")
+    for posicao, entrada in enumerate(melhores_runs, start=1):
+        ranking.add_row(
+            str(posicao),
+            str(entrada.get("personagem", "?")),
+            str(entrada.get("classe", "?")),
+            str(entrada.get("andar_alcancado", "?")),
+            str(entrada.get("dificuldade", "?")),
+            str(entrada.get("turnos_totais", "?")),
+            "morreu" if entrada.get("motivo") == "morte" else "saiu vivo",
+        )
+    if not ranking.row_count:
+        ranking.add_row("—", vazio, "", "", "", "", "")
+
+    classes = Table(box=box.SIMPLE, border_style="cyan", expand=True)
+    classes.add_column("Classe", style="bold white")
+    classes.add_column("Runs", justify="right")
+    classes.add_column("Mortes", justify="right", style="red")
+    classes.add_column("Saiu vivo", justify="right", style="green")
+    classes.add_column("Andar médio", justify="right")
+    classes.add_column("P50/P90", justify="right")
+    classes.add_column("Melhor", justify="right", style="yellow")
+    for estat, percentis in estatisticas:
+        classes.add_row(
+            estat.classe,
+            str(estat.runs),
+            f"{estat.taxa_morte:.0%}",
+            f"{estat.taxa_sobrevivencia:.0%}",
+            f"{estat.andar_medio:.1f}",
+            f"{percentis.get(50, '-')}/{percentis.get(90, '-')}",
+            str(estat.melhor_andar),
+        )
+
+    letais = Table(box=box.SIMPLE, border_style="cyan", expand=True)
+    letais.add_column("Andar", justify="right", style="yellow")
+    letais.add_column("Inimigo mais letal", style="bold white")
+    letais.add_column("Mortes", justify="right", style="red")
+    for andar, (inimigo, mortes) in mais_letais.items():
+        letais.add_row(str(andar), inimigo, str(mortes))
+
+    console.print(Panel(ranking, title="Ranking: runs mais profundas", border_style="blue"))
+    console.print(Panel(classes, title="Desempenho por classe", border_style="blue"))
+    console.print(Panel(letais, title="Letalidade por andar", border_style="blue"))
+    console.input("[bold yellow]Pressione Enter para voltar... [/]")
 
 
 def desenhar_tela_escolha_classe(classes: ClassesConfig) -> str:
@@ -621,21 +729,13 @@ def desenhar_tela_inventario(jogador: Personagem) -> str:
     """Desenha a tela de inventário do jogador."""
     limpar_tela()
 
-    def _chave_item(item: Item) -> tuple:
-        bonus = tuple(sorted((item.bonus or {}).items()))
-        efeito = tuple(sorted((item.efeito or {}).items()))
-        return (item.nome, item.tipo, bonus, efeito)
-
-    def _agrupar_itens(itens: list[Item]) -> list[dict[str, Any]]:
-        grupos: dict[tuple, dict[str, Any]] = {}
-        for item in itens:
-            chave = _chave_item(item)
-            if chave not in grupos:
-                grupos[chave] = {"item": item, "quantidade": 0}
-            grupos[chave]["quantidade"] += 1
-        return sorted(grupos.values(), key=lambda g: (g["item"].tipo, g["item"].nome))
-
-    grupos_itens = _agrupar_itens(jogador.inventario)
+    grupos_itens = sorted(
+        (
+            {"item": item, "quantidade": quantidade}
+            for _, item, quantidade in como_inventario(jogador.inventario).pilhas()
+        ),
+        key=lambda g: (g["item"].tipo, g["item"].nome),
+    )
 
     tabela_inventario = Table(
         title=Text("INVENTÁRIO", style="bold yellow"),
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import Any
 
 from rich import box
@@ -32,10 +33,14 @@ def limpar_tela() -> None:
     console.clear()
 
 
-def limitar_log(mensagens: list[str], limite: int = 10) -> list[str]:
-    """Retorna apenas as últimas entradas do log, com cabeçalho de truncamento."""
+def limitar_log(mensagens: Sequence[str], limite: int = 10) -> list[str]:
+    """Retorna apenas as últimas entradas do log, com cabeçalho de truncamento.
+
+    Só as entradas exibidas são lidas, então logs preguiçosos (`LogCombate`) formatam
+    apenas a cauda visível.
+    """
     if len(mensagens) <= limite:
-        return mensagens
+        return list(mensagens)
     ocultos = len(mensagens) - limite
     return [f"(… +{ocultos} eventos anteriores)", *mensagens[-limite:]]
 
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
+
 from rich import box
 from rich.bar import Bar
 from rich.panel import Panel
@@ -15,7 +17,7 @@ from src.ui_base import console, limitar_log, limpar_tela
 def desenhar_tela_combate(
     jogador: Personagem,
     inimigo: Inimigo,
-    mensagem: list[str] | None = None,
+    mensagem: Sequence[str] | None = None,
 ) -> str:
     """Desenha a tela de combate com informações do jogador, inimigo e mensagens."""
     mensagem = mensagem or []
@@ -67,7 +69,7 @@ def desenhar_tela_combate(
     )
 
 
-def desenhar_log_completo(log: list[str]) -> None:
+def desenhar_log_completo(log: Sequence[str]) -> None:
     """Mostra o log completo do combate em uma tela separada."""
     limpar_tela()
     texto = "\n".join(log) if log else "Sem eventos registrados."
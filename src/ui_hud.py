@@ -10,6 +10,7 @@ from rich.text import Text
 
 from src import config
 from src.entidades import Personagem, Sala
+from src.mapa_compacto import Mapa
 from src.ui_base import console, limpar_tela
 
 
@@ -19,9 +20,14 @@ def desenhar_hud_exploracao(
     opcoes: list[str],
     nivel_masmorra: int,
     dificuldade_nome: str,
-    mapa: list[list[Sala]] | None = None,
+    mapa: Mapa | None = None,
+    status_save: str | None = None,
 ) -> str:
-    """Desenha o HUD de exploração com informações do jogador, sala e opções."""
+    """Desenha o HUD de exploração com informações do jogador, sala e opções.
+
+    `status_save` é a linha de estado da gravação em segundo plano (em curso, salvo
+    ou erro), exibida acima das ações quando houver.
+    """
     limpar_tela()
 
     hp_percent = (jogador.hp / jogador.hp_max) * 100
@@ -109,12 +115,15 @@ def desenhar_hud_exploracao(
         console.print(hud_jogador)
 
     console.print(hud_sala)
+    if status_save:
+        estilo = "bold red" if status_save.startswith("⚠️") else "bold green"
+        console.print(Text(status_save, style=estilo))
     console.print(hud_opcoes)
 
     return console.input("[bold yellow]> [/]")
 
 
-def _render_minimapa(mapa: list[list[Sala]], jogador: Personagem) -> Panel:
+def _render_minimapa(mapa: Mapa, jogador: Personagem) -> Panel:
     """Gera um painel textual simples de minimapa ao redor do jogador."""
     alcance = max(1, config.MINIMAPA_TAMANHO // 2)
     linhas = []
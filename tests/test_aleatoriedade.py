@@ -1,8 +1,11 @@
+import json
 import random
 
+import pytest
+
 from src import config
 from src.aleatoriedade import criar_rng, restaurar_rng, serializar_estado_rng
-from src.gerador_mapa import gerar_mapa
+from src.gerador_mapa import _gerar_andar_em_cache, gerar_andar, gerar_andares, gerar_mapa
 from src.tramas import gerar_pista_trama, sortear_trama_para_motivacao
 
 
@@ -55,3 +58,177 @@ def test_gerar_mapa_com_mesma_seed_reproduz_layout() -> None:
     mapa_b = gerar_mapa(2, config.DIFICULDADES["normal"], rng=rng_b)
 
     assert _resumo_mapa(mapa_a) == _resumo_mapa(mapa_b)
+
+
+def test_gerar_andar_direto_pela_seed_da_run() -> None:
+    """O andar N sai direto de (seed_run, N), sem gerar os andares anteriores."""
+    _gerar_andar_em_cache.cache_clear()
+    andar = gerar_andar(2024, 5, "normal")
+    _gerar_andar_em_cache.cache_clear()
+
+    assert _resumo_mapa(andar) == _resumo_mapa(gerar_andar(2024, 5, "normal"))
+    assert _resumo_mapa(andar) != _resumo_mapa(gerar_andar(2024, 6, "normal"))
+
+
+def test_cache_de_andares_devolve_copias_independentes() -> None:
+    """Alterar um andar devolvido não contamina o cache nem outras cópias."""
+    _gerar_andar_em_cache.cache_clear()
+    primeiro = gerar_andar(31337, 3, "normal")
+    entrada = next(sala for linha in primeiro for sala in linha if sala.tipo == "entrada")
+    entrada.visitada = True
+
+    segundo = gerar_andar(31337, 3, "normal")
+
+    assert _gerar_andar_em_cache.cache_info().hits == 1
+    assert all(not sala.visitada for linha in segundo for sala in linha)
+
+
+def test_gerar_andares_em_paralelo_reproduz_sequencial() -> None:
+    """Ferramentas de análise podem gerar vários andares em processos separados."""
+    sequencial = gerar_andares(555, [1, 4, 7], "dificil")
+    paralelo = gerar_andares(555, [1, 4, 7], "dificil", processos=2)
+
+    assert {n: _resumo_mapa(m) for n, m in sequencial.items()} == {
+        n: _resumo_mapa(m) for n, m in paralelo.items()
+    }
+
+
+def test_fluxos_sao_independentes_entre_subsistemas() -> None:
+    """Consumir o fluxo de saque não altera a sequência do fluxo de combate."""
+    _, rng_a = criar_rng(777)
+    _, rng_b = criar_rng(777)
+
+    for _ in range(50):
+        rng_a.saque.random()
+
+    assert [rng_a.combate.random() for _ in range(5)] == [rng_b.combate.random() for _ in range(5)]
+    assert rng_a.mapa.random() != rng_a.combate.random()
+
+
+def test_fluxo_desconhecido_gera_erro() -> None:
+    """Nomes de fluxo fora da hierarquia são rejeitados."""
+    _, rng = criar_rng(1)
+    with pytest.raises(ValueError):
+        rng.fluxo("clima")
+
+
+def test_serializacao_preserva_raiz_e_fluxos() -> None:
+    """Salvar e restaurar retoma raiz e fluxos exatamente do ponto salvo."""
+    seed, rng = criar_rng(2024)
+    rng.random()
+    rng.combate.random()
+    rng.saque.randint(1, 10)
+
+    _, restaurado = restaurar_rng(seed, serializar_estado_rng(rng))
+
+    assert restaurado.random() == rng.random()
+    assert restaurado.combate.random() == rng.combate.random()
+    assert restaurado.saque.random() == rng.saque.random()
+    assert restaurado.tramas.random() == rng.tramas.random()
+
+
+def test_estado_legado_em_lista_continua_carregando() -> None:
+    """Saves antigos guardavam só o estado de um `random.Random` como lista."""
+    legado = random.Random(99)
+    legado.random()
+    estado = [list(parte) if isinstance(parte, tuple) else parte for parte in legado.getstate()]
+
+    _, restaurado = restaurar_rng(99, estado)
+
+    assert restaurado.random() == legado.random()
+
+
+def test_formato_de_estado_desconhecido_gera_erro() -> None:
+    """Estados com formato de outra versão não são carregados silenciosamente."""
+    with pytest.raises(ValueError):
+        restaurar_rng(1, {"formato": "fluxos-v99", "raiz": None, "fluxos": {}})
+
+
+def test_estado_compacto_guarda_so_contadores() -> None:
+    """Fluxos nascidos da seed vão ao save como contadores de palavras consumidas."""
+    seed, rng = criar_rng(4321)
+    for _ in range(300):
+        rng.combate.random()
+    rng.saque.randint(1, 6)
+
+    estado = serializar_estado_rng(rng)
+
+    assert estado == {
+        "formato": "fluxos-v2",
+        "raiz": 0,
+        "fluxos": {"combate": 600, "saque": 1},
+    }
+    assert len(json.dumps(estado)) < 200
+    _, restaurado = restaurar_rng(seed, estado)
+    assert restaurado.combate.random() == rng.combate.random()
+
+
+def test_fluxo_longo_continua_como_contador() -> None:
+    """Runs longas (50 mil sorteios por fluxo) ainda vão ao save como contadores."""
+    seed, rng = criar_rng(77)
+    for _ in range(50_000):
+        rng.combate.random()
+        rng.saque.randint(1, 100)
+    rng.combate.shuffle(list(range(10)))
+
+    estado = serializar_estado_rng(rng)
+    assert isinstance(estado, dict)
+    assert isinstance(estado["fluxos"]["combate"], int)
+    assert estado["fluxos"]["combate"] > 100_000
+    assert len(json.dumps(estado)) < 200
+
+    _, restaurado = restaurar_rng(seed, json.loads(json.dumps(estado)))
+    assert restaurado.combate.getstate() == rng.combate.getstate()
+    assert restaurado.saque.getstate() == rng.saque.getstate()
+    assert restaurado.combate.random() == rng.combate.random()
+
+
+def test_origem_desconhecida_ou_gauss_pendente_vai_empacotado() -> None:
+    """Estado aplicado com `setstate` (ou com gauss pendente) vai em base64."""
+    seed, rng = criar_rng(99)
+    rng.mapa.setstate(random.Random(5).getstate())
+    rng.mapa.random()
+    rng.tramas.gauss(0, 1)
+
+    estado = serializar_estado_rng(rng)
+    assert isinstance(estado, dict)
+    assert isinstance(estado["fluxos"]["mapa"], str)
+    assert isinstance(estado["fluxos"]["tramas"], str)
+
+    _, restaurado = restaurar_rng(seed, json.loads(json.dumps(estado)))
+    assert restaurado.mapa.random() == rng.mapa.random()
+    assert restaurado.tramas.gauss(0, 1) == rng.tramas.gauss(0, 1)
+
+
+def test_saves_seguidos_continuam_a_contagem() -> None:
+    """O contador avança junto com o RNG entre um save e outro."""
+    seed, rng = criar_rng(2468)
+    for rodada in range(1, 4):
+        for _ in range(500):
+            rng.random()
+        assert serializar_estado_rng(rng)["raiz"] == rodada * 1000  # type: ignore[index]
+
+    _, restaurado = restaurar_rng(seed, serializar_estado_rng(rng))
+    assert restaurado.random() == rng.random()
+
+
+def test_estado_v1_com_listas_continua_carregando() -> None:
+    """Saves com fluxos em listas (formato anterior) carregam e voltam compactos."""
+    seed, rng = criar_rng(13579)
+    rng.combate.random()
+    estado_v1 = {
+        "formato": "fluxos-v1",
+        "raiz": json.loads(json.dumps(rng.getstate())),
+        "fluxos": {"combate": json.loads(json.dumps(rng.combate.getstate()))},
+    }
+
+    _, restaurado = restaurar_rng(seed, estado_v1)
+
+    assert restaurado.combate.random() == rng.combate.random()
+    assert restaurado.random() == rng.random()
+
+
+def test_estado_empacotado_invalido_gera_erro() -> None:
+    """Textos que não são um estado do Mersenne Twister são rejeitados."""
+    with pytest.raises(ValueError):
+        restaurar_rng(1, {"formato": "fluxos-v2", "raiz": "bm9wZQ==", "fluxos": {}})
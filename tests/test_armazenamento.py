@@ -1,4 +1,6 @@
 import json
+import os
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
@@ -206,3 +208,327 @@ def test_carregar_save_envelope_antigo_sem_save_version_migra(
 
     migrado = json.loads(arquivo_save.read_text(encoding="utf-8"))
     assert migrado["save_version"] == armazenamento.SAVE_SCHEMA_VERSION
+
+
+def _estado_minimo(nome: str, andar: int = 1) -> EstadoJogo:
+    return {
+        "jogador": {"nome": nome, "classe": "Mago", "nivel": 4},
+        "mapa": [[{"tipo": "entrada"}]],
+        "nivel_masmorra": andar,
+    }
+
+
+def test_listar_saves_usa_indice_sem_reler_saves(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Com o índice em dia, listar os slots não faz parse de nenhum save."""
+    configurar_diretorio(tmp_path, monkeypatch)
+    armazenamento.salvar_jogo(_estado_minimo("Ana", andar=3), slot_id=1)
+    armazenamento.salvar_jogo(_estado_minimo("Bia"), slot_id=2)
+
+    def falhar(_: Path) -> None:
+        raise AssertionError("listar_saves não deveria ler o save completo")
+
+    monkeypatch.setattr(armazenamento, "_ler_metadados_save", falhar)
+    saves = armazenamento.listar_saves()
+
+    assert {(s.slot_id, s.personagem, s.andar) for s in saves} == {("1", "Ana", 3), ("2", "Bia", 1)}
+    assert armazenamento.proximo_slot_disponivel() == 3
+
+
+def test_listar_saves_rele_save_com_indice_desatualizado(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Saves alterados fora do jogo (ou sem índice) são relidos e voltam ao índice."""
+    configurar_diretorio(tmp_path, monkeypatch)
+    caminho = armazenamento.salvar_jogo(_estado_minimo("Ana"), slot_id=1)
+    conteudo = json.loads(caminho.read_text(encoding="utf-8"))
+    conteudo["meta"]["personagem"] = "Editado à mão"
+    caminho.write_text(json.dumps(conteudo), encoding="utf-8")
+
+    assert [s.personagem for s in armazenamento.listar_saves()] == ["Editado à mão"]
+
+    armazenamento._caminho_indice().unlink()
+    assert [s.personagem for s in armazenamento.listar_saves()] == ["Editado à mão"]
+    indice = json.loads(armazenamento._caminho_indice().read_text(encoding="utf-8"))
+    assert indice["slots"]["save_1.json"]["personagem"] == "Editado à mão"
+
+
+def test_indice_ignora_saves_corrompidos_e_removidos(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Saves ilegíveis não aparecem na lista e remover um slot limpa sua entrada."""
+    configurar_diretorio(tmp_path, monkeypatch)
+    armazenamento.salvar_jogo(_estado_minimo("Ana"), slot_id=1)
+    (tmp_path / "save_2.json").write_text("{quebrado", encoding="utf-8")
+    armazenamento._caminho_indice().write_text("também quebrado", encoding="utf-8")
+
+    assert [s.slot_id for s in armazenamento.listar_saves()] == ["1"]
+
+    armazenamento.remover_save(1)
+    indice = json.loads(armazenamento._caminho_indice().read_text(encoding="utf-8"))
+    assert "save_1.json" not in indice["slots"]
+    assert not armazenamento.existe_save()
+
+
+def test_migracao_de_save_atual_nao_copia_nada() -> None:
+    """Saves já no schema atual voltam como o mesmo objeto, sem deepcopy."""
+    conteudo: dict[str, Any] = {
+        "save_version": armazenamento.SAVE_SCHEMA_VERSION,
+        "versao": "1.6.8",
+        "dados": _estado_minimo("Ana"),
+    }
+    mapa = conteudo["dados"]["mapa"]
+
+    migrado, migrou = armazenamento._migrar_conteudo_save(conteudo)
+
+    assert migrado is conteudo
+    assert migrado["dados"]["mapa"] is mapa
+    assert not migrou
+
+
+def test_registro_de_migradores_encadeia_versoes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Migradores registrados rodam em sequência, alterando o objeto no lugar."""
+    atual = armazenamento.SAVE_SCHEMA_VERSION
+    monkeypatch.setattr(armazenamento, "SAVE_SCHEMA_VERSION", atual + 1)
+    chamadas: list[int] = []
+
+    def migrar_para_proxima(conteudo: dict[str, Any]) -> dict[str, Any]:
+        chamadas.append(conteudo["save_version"])
+        conteudo["dados"]["novo_campo"] = True
+        return conteudo
+
+    monkeypatch.setitem(armazenamento._MIGRADORES, atual, migrar_para_proxima)
+    conteudo: dict[str, Any] = {"versao": "legacy", "dados": _estado_minimo("Ana")}
+
+    migrado, migrou = armazenamento._migrar_conteudo_save(conteudo)
+
+    assert migrou
+    assert migrado is conteudo
+    assert chamadas == [atual]
+    assert migrado["save_version"] == atual + 1
+    assert migrado["dados"]["novo_campo"] is True
+
+
+def test_schema_sem_migrador_registrado_gera_erro(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Uma lacuna no registro de migradores é um erro de carregamento explícito."""
+    atual = armazenamento.SAVE_SCHEMA_VERSION
+    monkeypatch.setattr(armazenamento, "SAVE_SCHEMA_VERSION", atual + 1)
+    conteudo: dict[str, Any] = {"save_version": atual, "dados": _estado_minimo("Ana")}
+
+    with pytest.raises(armazenamento.ErroCarregamento):
+        armazenamento._migrar_conteudo_save(conteudo)
+
+
+def test_save_v2_com_grade_de_mapa_migra_para_o_codec(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Saves do schema 2 (mapa como grade de dicionários) carregam e são regravados."""
+    arquivo_save = configurar_diretorio(tmp_path, monkeypatch)
+    parede = {"tipo": "parede", "nome": "Parede", "descricao": "Pedra."}
+    conteudo_v2 = {
+        "save_version": 2,
+        "versao": "1.6.8",
+        "meta": {},
+        "dados": {
+            "jogador": {"nome": "Ana"},
+            "mapa": [[parede, {"tipo": "entrada", "nome": "Entrada", "descricao": ""}]],
+            "nivel_masmorra": 1,
+        },
+    }
+    arquivo_save.write_text(json.dumps(conteudo_v2), encoding="utf-8")
+
+    estado = armazenamento.carregar_jogo()
+
+    assert estado["mapa"]["formato"] == "mapa-delta-v1"
+    assert estado["mapa"]["paredes"] == [1, 1, 0]
+    regravado = json.loads(arquivo_save.read_text(encoding="utf-8"))
+    assert regravado["save_version"] == armazenamento.SAVE_SCHEMA_VERSION
+    assert regravado["dados"]["mapa"] == estado["mapa"]
+
+
+@pytest.mark.parametrize("compressao", ["zlib", "lzma"])
+def test_save_comprimido_e_carregado_e_listado(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, compressao: str
+) -> None:
+    """Com `SAVE_COMPRESSAO` ligado, o save vira o contêiner binário e segue legível."""
+    configurar_diretorio(tmp_path, monkeypatch)
+    monkeypatch.setattr(armazenamento.config, "SAVE_COMPRESSAO", compressao)
+    estado = _estado_minimo("Ana", andar=2)
+
+    caminho = armazenamento.salvar_jogo(estado, slot_id=1)
+    armazenamento._caminho_indice().unlink()
+
+    assert caminho.read_bytes().startswith(armazenamento.container_save.MAGIC)
+    assert armazenamento.carregar_jogo(1) == estado
+    assert [s.andar for s in armazenamento.listar_saves()] == [2]
+
+
+def test_save_comprimido_corrompido_cai_para_backup(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """O CRC recusa o save corrompido e o `.bak` é lido sem descomprimir o principal."""
+    configurar_diretorio(tmp_path, monkeypatch)
+    monkeypatch.setattr(armazenamento.config, "SAVE_COMPRESSAO", "lzma")
+    armazenamento.salvar_jogo(_estado_minimo("Ana", andar=1), slot_id=1)
+    caminho = armazenamento.salvar_jogo(_estado_minimo("Ana", andar=2), slot_id=1)
+    corrompido = bytearray(caminho.read_bytes())
+    corrompido[-10] ^= 0xFF
+    caminho.write_bytes(bytes(corrompido))
+
+    descompressoes: list[int] = []
+    descomprimir = armazenamento.container_save.lzma.decompress
+
+    def contar(dados: bytes) -> bytes:
+        descompressoes.append(len(dados))
+        return descomprimir(dados)
+
+    monkeypatch.setattr(armazenamento.container_save.lzma, "decompress", contar)
+
+    assert armazenamento.carregar_jogo(1)["nivel_masmorra"] == 1
+    assert len(descompressoes) == 1
+
+
+def _estado_com_mapa(nome: str, andar: int = 1, visitada: bool = False) -> EstadoJogo:
+    estado = _estado_minimo(nome, andar)
+    estado["mapa"] = {
+        "formato": "mapa-delta-v1",
+        "largura": 3,
+        "altura": 1,
+        "padrao": {"tipo": "parede", "nome": "Parede", "descricao": ""},
+        "paredes": [1, 2, 0],
+        "salas": [
+            {"tipo": "entrada", "nome": "Entrada"},
+            {"tipo": "sala", "nome": "Sala", "visitada": visitada},
+        ],
+    }
+    return estado
+
+
+def test_save_incremental_anexa_so_o_delta_ao_diario(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Depois do primeiro snapshot, saves incrementais não regravam o arquivo inteiro."""
+    configurar_diretorio(tmp_path, monkeypatch)
+    caminho = armazenamento.salvar_jogo(_estado_com_mapa("Ana"), slot_id=1, incremental=True)
+    snapshot = caminho.read_bytes()
+
+    estado = _estado_com_mapa("Ana", andar=2, visitada=True)
+    armazenamento.salvar_jogo(estado, slot_id=1, incremental=True)
+
+    assert caminho.read_bytes() == snapshot
+    diario = armazenamento.diario_save.caminho_diario(caminho)
+    (entrada,) = armazenamento.diario_save.ler_entradas(diario, json.loads(snapshot)["diario_id"])
+    assert entrada["delta"] == {
+        "campos": {"nivel_masmorra": 2},
+        "salas": {"1": {"tipo": "sala", "nome": "Sala", "visitada": True}},
+    }
+
+    armazenamento._DIARIOS.clear()
+    assert armazenamento.carregar_jogo(1) == estado
+    assert [s.andar for s in armazenamento.listar_saves()] == [2]
+
+
+def test_base_do_diario_nao_compartilha_o_estado_do_chamador(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Mutar o estado salvo ou o carregado não corrompe o delta do próximo save."""
+    configurar_diretorio(tmp_path, monkeypatch)
+    estado = _estado_com_mapa("Ana")
+    armazenamento.salvar_jogo(estado, slot_id=1, incremental=True)
+    estado["nivel_masmorra"] = 2
+    estado["mapa"]["salas"][1]["visitada"] = True
+    armazenamento.salvar_jogo(estado, slot_id=1, incremental=True)
+
+    armazenamento._DIARIOS.clear()
+    carregado = armazenamento.carregar_jogo(1)
+    assert carregado == estado
+    carregado["jogador"]["nivel"] = 5
+    armazenamento.salvar_jogo(carregado, slot_id=1, incremental=True)
+    carregado["jogador"]["nivel"] = 6
+    armazenamento.salvar_jogo(carregado, slot_id=1, incremental=True)
+
+    armazenamento._DIARIOS.clear()
+    assert armazenamento.carregar_jogo(1) == carregado
+
+
+def test_listar_saves_ordena_pela_data_do_ultimo_save_incremental(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Um slot salvo só pelo diário continua no topo, mesmo com o snapshot mais antigo."""
+    configurar_diretorio(tmp_path, monkeypatch)
+    relogio = [datetime(2026, 1, 1, 10, 0, tzinfo=UTC)]
+
+    class DataFixa(datetime):
+        @classmethod
+        def now(cls, tz: object = None) -> datetime:
+            return relogio[0]
+
+    monkeypatch.setattr(armazenamento, "datetime", DataFixa)
+    armazenamento.salvar_jogo(_estado_minimo("Ana"), slot_id=1, incremental=True)
+    relogio[0] += timedelta(minutes=1)
+    segundo = armazenamento.salvar_jogo(_estado_minimo("Bia"), slot_id=2, incremental=True)
+    relogio[0] += timedelta(minutes=1)
+    armazenamento.salvar_jogo(_estado_minimo("Ana", 2), slot_id=1, incremental=True)
+    # O snapshot do slot 2 é o arquivo modificado por último.
+    futuro = segundo.stat().st_mtime + 3600
+    os.utime(segundo, (futuro, futuro))
+
+    assert [s.slot_id for s in armazenamento.listar_saves()] == ["1", "2"]
+    armazenamento._caminho_indice().unlink()
+    assert [s.slot_id for s in armazenamento.listar_saves()] == ["1", "2"]
+
+
+def test_diario_e_compactado_a_cada_n_entradas(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Ao atingir o limite, o save incremental grava um snapshot novo e zera o diário."""
+    configurar_diretorio(tmp_path, monkeypatch)
+    monkeypatch.setattr(armazenamento.config, "SAVE_DIARIO_COMPACTAR_A_CADA", 2)
+    caminho = armazenamento.salvar_jogo(_estado_minimo("Ana"), slot_id=1, incremental=True)
+    for andar in (2, 3):
+        armazenamento.salvar_jogo(_estado_minimo("Ana", andar), slot_id=1, incremental=True)
+    id_antigo = json.loads(caminho.read_text(encoding="utf-8"))["diario_id"]
+
+    armazenamento.salvar_jogo(_estado_minimo("Ana", 4), slot_id=1, incremental=True)
+
+    snapshot = json.loads(caminho.read_text(encoding="utf-8"))
+    assert snapshot["diario_id"] != id_antigo
+    assert snapshot["dados"]["nivel_masmorra"] == 4
+    assert not armazenamento.diario_save.caminho_diario(caminho).exists()
+    assert armazenamento.carregar_jogo(1)["nivel_masmorra"] == 4
+
+
+def test_diario_com_linha_truncada_e_backup_corrompido(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Uma escrita interrompida no fim do diário é ignorada; o `.bak` leva o seu diário."""
+    configurar_diretorio(tmp_path, monkeypatch)
+    monkeypatch.setattr(armazenamento.config, "SAVE_DIARIO_COMPACTAR_A_CADA", 1)
+    caminho = armazenamento.salvar_jogo(_estado_minimo("Ana"), slot_id=1, incremental=True)
+    armazenamento.salvar_jogo(_estado_minimo("Ana", 2), slot_id=1, incremental=True)
+    diario = armazenamento.diario_save.caminho_diario(caminho)
+    with diario.open("ab") as arquivo:
+        arquivo.write(b'0badc0de {"id": "incompleto"')
+
+    armazenamento._DIARIOS.clear()
+    assert armazenamento.carregar_jogo(1)["nivel_masmorra"] == 2
+
+    armazenamento.salvar_jogo(_estado_minimo("Ana", 3), slot_id=1, incremental=True)
+    caminho.write_text("{corrompido", encoding="utf-8")
+    assert armazenamento.carregar_jogo(1)["nivel_masmorra"] == 2
+
+
+def test_snapshot_alterado_fora_do_jogo_forca_save_completo(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Se o snapshot mudou em disco, o delta não é anexado sobre uma base errada."""
+    configurar_diretorio(tmp_path, monkeypatch)
+    caminho = armazenamento.salvar_jogo(_estado_minimo("Ana"), slot_id=1, incremental=True)
+    armazenamento.salvar_jogo(_estado_minimo("Bia"), slot_id=1)
+    armazenamento._DIARIOS[caminho].assinatura = [0, 0]
+
+    armazenamento.salvar_jogo(_estado_minimo("Ana", 5), slot_id=1, incremental=True)
+
+    assert json.loads(caminho.read_text(encoding="utf-8"))["dados"]["nivel_masmorra"] == 5
+    assert not armazenamento.diario_save.caminho_diario(caminho).exists()
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 import json
+import os
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from urllib.error import URLError
 
 import pytest
 
-from src import atualizador
+from src import atualizador, combate
 
 
 def test_deve_verificar_sem_ultimo() -> None:
@@ -117,3 +118,72 @@ def test_verificar_atualizacao_sucesso_limpa_flag_de_falha(
     prefs = atualizador.carregar_preferencias(fake_settings)
     assert prefs["ultima_falha_iso"] is None
     assert prefs["last_check_iso"] == datetime(2025, 11, 10, tzinfo=UTC).isoformat()
+
+
+def test_servico_preferencias_le_disco_uma_vez(tmp_path: Path) -> None:
+    """Depois da primeira leitura, consultas repetidas não tocam o disco."""
+    settings = tmp_path / "settings.json"
+    preferencias = atualizador.DEFAULT_PREFERENCIAS.copy()
+    preferencias["combat_log_breakdown"] = True
+    settings.write_text(json.dumps(preferencias), encoding="utf-8")
+    servico = atualizador.ServicoPreferencias(caminho=settings)
+
+    for _ in range(50):
+        assert servico.valor("combat_log_breakdown") is True
+    assert servico.leituras_disco == 1
+    assert servico.escritas_disco == 0
+
+    assert servico.revalidar() is False
+    assert servico.leituras_disco == 1
+
+
+def test_servico_preferencias_recarrega_quando_mtime_muda(tmp_path: Path) -> None:
+    """Edições externas no arquivo são captadas na revalidação pelo mtime."""
+    settings = tmp_path / "settings.json"
+    settings.write_text(json.dumps(atualizador.DEFAULT_PREFERENCIAS), encoding="utf-8")
+    servico = atualizador.ServicoPreferencias(caminho=settings)
+    assert servico.valor("tutorial_enabled") is True
+
+    editado = atualizador.DEFAULT_PREFERENCIAS.copy()
+    editado["tutorial_enabled"] = False
+    settings.write_text(json.dumps(editado), encoding="utf-8")
+    mtime = settings.stat().st_mtime_ns
+    os.utime(settings, ns=(mtime + 1_000_000_000, mtime + 1_000_000_000))
+
+    assert servico.revalidar() is True
+    assert servico.valor("tutorial_enabled") is False
+    assert servico.leituras_disco == 2
+
+
+def test_servico_preferencias_agrupa_escritas(tmp_path: Path) -> None:
+    """Várias alterações viram uma única escrita; arquivo ausente é criado ao gravar."""
+    settings = tmp_path / "settings.json"
+    servico = atualizador.ServicoPreferencias(caminho=settings)
+
+    servico.definir(tutorial_enabled=False)
+    servico.definir(combat_log_breakdown=True, frequency="diaria")
+    assert not settings.exists()
+    assert servico.pendente
+
+    servico.gravar()
+    servico.gravar()
+    assert servico.escritas_disco == 1
+    salvo = atualizador.carregar_preferencias(settings)
+    assert salvo["tutorial_enabled"] is False
+    assert salvo["combat_log_breakdown"] is True
+    assert salvo["frequency"] == "diaria"
+
+
+def test_breakdown_do_combate_nao_faz_io(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """O início de cada luta consulta só o cache compartilhado."""
+    settings = tmp_path / "settings.json"
+    settings.write_text(json.dumps(atualizador.DEFAULT_PREFERENCIAS), encoding="utf-8")
+    monkeypatch.setattr(atualizador, "SETTINGS_PATH", settings)
+    servico = atualizador.servico_preferencias()
+    servico.revalidar()
+    leituras = servico.leituras_disco
+
+    for _ in range(20):
+        assert combate._breakdown_ativo() is False
+        assert combate.auto_resolver_ativo() is False
+    assert servico.leituras_disco == leituras
@@ -0,0 +1,117 @@
+import random
+from pathlib import Path
+
+import pytest
+
+import jogo
+from src import armazenamento
+from src.autosave import MOTIVO_CHEFE, MOTIVO_DESCIDA, MOTIVO_TURNOS, PoliticaAutosave
+from src.gerador_mapa import gerar_mapa
+from src.gravador_saves import ResultadoGravacao
+from src.personagem import criar_personagem
+
+
+class _RelogioFalso:
+    def __init__(self) -> None:
+        self.agora = 1000.0
+
+    def __call__(self) -> float:
+        return self.agora
+
+
+def _politica(relogio: _RelogioFalso, **opcoes: int | float) -> PoliticaAutosave:
+    parametros: dict[str, int | float] = {
+        "a_cada_turnos": 10,
+        "bytes_por_minuto": 1000,
+        "intervalo_min_s": 5.0,
+    }
+    parametros.update(opcoes)
+    return PoliticaAutosave(
+        ativo=True,
+        a_cada_turnos=int(parametros["a_cada_turnos"]),
+        bytes_por_minuto=int(parametros["bytes_por_minuto"]),
+        intervalo_min_s=parametros["intervalo_min_s"],
+        agora=relogio,
+    )
+
+
+def _concluir(politica: PoliticaAutosave, motivo: str, turno: int, tamanho: int) -> None:
+    politica.registrar(
+        motivo,
+        turno,
+        ResultadoGravacao("1", Path("save_1.json"), duracao_s=0.01, bytes_gravados=tamanho),
+    )
+
+
+def test_gatilho_de_turnos_conta_a_partir_do_ultimo_autosave() -> None:
+    """A cada N turnos sai um autosave; a contagem recomeça no turno do último."""
+    relogio = _RelogioFalso()
+    politica = _politica(relogio)
+
+    assert politica.proximo_motivo(0) is None
+    assert politica.proximo_motivo(9) is None
+    assert politica.proximo_motivo(10) == MOTIVO_TURNOS
+    _concluir(politica, MOTIVO_TURNOS, 10, 100)
+    relogio.agora += 30
+    assert politica.proximo_motivo(19) is None
+    assert politica.proximo_motivo(20) == MOTIVO_TURNOS
+
+
+def test_gatilho_barrado_pelo_orcamento_fica_pendente_ate_caber() -> None:
+    """Intervalo mínimo, save em andamento e teto de bytes adiam o autosave sem perdê-lo."""
+    relogio = _RelogioFalso()
+    politica = _politica(relogio, bytes_por_minuto=1000)
+
+    politica.marcar(MOTIVO_DESCIDA)
+    assert politica.proximo_motivo(1) == MOTIVO_DESCIDA
+    politica.marcar(MOTIVO_CHEFE)
+    relogio.agora += 10
+    assert politica.proximo_motivo(2) is None  # o autosave anterior ainda não terminou
+    _concluir(politica, MOTIVO_DESCIDA, 1, 600)
+
+    assert politica.proximo_motivo(3) is None  # 600 + 600 estimados > 1000 por minuto
+    assert politica.bytes_na_janela() == 600
+    relogio.agora += 60
+    assert politica.proximo_motivo(4) == MOTIVO_CHEFE
+    _concluir(politica, MOTIVO_CHEFE, 4, 600)
+
+    politica.marcar(MOTIVO_DESCIDA)
+    relogio.agora += 1
+    assert politica.proximo_motivo(5) is None  # intervalo mínimo de 5 s
+    assert politica.adiados == 3
+    assert [(m.motivo, m.turno, m.bytes_gravados) for m in politica.metricas] == [
+        (MOTIVO_DESCIDA, 1, 600),
+        (MOTIVO_CHEFE, 4, 600),
+    ]
+
+
+def test_politica_desligada_nunca_salva() -> None:
+    """Com o autosave desligado, nem gatilhos de evento nem turnos disparam."""
+    politica = PoliticaAutosave(ativo=False, a_cada_turnos=1)
+    politica.marcar(MOTIVO_CHEFE)
+
+    assert politica.proximo_motivo(0) is None
+    assert politica.proximo_motivo(50) is None
+
+
+def test_autosave_na_exploracao_grava_pelo_gravador_e_mede_o_custo(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Descer de andar agenda um autosave atômico no slot atual com duração e bytes medidos."""
+    monkeypatch.setattr(armazenamento, "_DIRETORIO_SALVAMENTO", tmp_path)
+    monkeypatch.setattr(armazenamento, "_ARQUIVO_SALVAMENTO", tmp_path / "save.json")
+    contexto = jogo.ContextoJogo(autosave=PoliticaAutosave(ativo=True, a_cada_turnos=0))
+    contexto.jogador = criar_personagem("Heroi", "guerreiro")
+    contexto.mapa_atual = gerar_mapa(1, rng=random.Random(7))
+    contexto.slot_atual = "2"
+    contexto.inicializar_rng(7)
+
+    contexto.autosave.marcar(MOTIVO_DESCIDA)
+    jogo._verificar_autosave(contexto, contexto.jogador, contexto.mapa_atual)
+    contexto.gravador.encerrar()
+
+    assert armazenamento.carregar_jogo("2")["jogador"]["nome"] == "Heroi"
+    [metrica] = contexto.autosave.metricas
+    assert metrica.sucesso and metrica.motivo == MOTIVO_DESCIDA
+    assert metrica.bytes_gravados == (tmp_path / "save_2.json").stat().st_size
+    assert metrica.duracao_s > 0
@@ -0,0 +1,90 @@
+import json
+import random
+
+import pytest
+
+from src import config
+from src.codec_mapa import (
+    FORMATO_MAPA,
+    codificar_linhas,
+    codificar_mapa,
+    decodificar_mapa,
+    validar_mapa_codificado,
+)
+from src.entidades import Inimigo, Sala
+from src.gerador_mapa import gerar_mapa
+from src.mapa_compacto import MapaCompacto, criar_parede
+
+
+def _grade_dicts(mapa: MapaCompacto) -> list[list[dict[str, object]]]:
+    return [[sala.to_dict() for sala in linha] for linha in mapa]
+
+
+def test_codec_reconstroi_todas_as_celulas() -> None:
+    """Decodificar o mapa codificado devolve exatamente as mesmas salas."""
+    mapa = gerar_mapa(4, config.DIFICULDADES["normal"], rng=random.Random(8))
+    mapa[0][0].visitada = True
+
+    codificado = json.loads(json.dumps(codificar_mapa(mapa)))
+    decodificado = decodificar_mapa(codificado)
+
+    assert _grade_dicts(decodificado) == _grade_dicts(mapa)
+    assert decodificado.quantidade_salas == len(codificado["salas"])
+
+
+def test_paredes_viram_sequencias_e_salas_so_guardam_diferencas() -> None:
+    """Paredes não geram registros; salas só trazem os campos fora do padrão."""
+    grade = [[criar_parede() for _ in range(4)] for _ in range(3)]
+    grade[0][1] = Sala(tipo="entrada", nome="Entrada", descricao="")
+    grade[0][2] = Sala(tipo="sala", nome="Sala", descricao="", visitada=True)
+    grade[2][3] = Sala(
+        tipo="sala",
+        nome="Covil",
+        descricao="",
+        inimigo_atual=Inimigo(
+            nome="Rato", hp=3, hp_max=3, ataque=1, defesa=0, xp_recompensa=1, drop_raridade="comum"
+        ),
+    )
+
+    codificado = codificar_mapa(grade)
+
+    assert codificado["formato"] == FORMATO_MAPA
+    assert codificado["paredes"] == [1, 2, 8, 1, 0]
+    assert codificado["salas"][0] == {"tipo": "entrada", "nome": "Entrada", "descricao": ""}
+    assert codificado["salas"][1]["visitada"] is True
+    assert "pode_ter_inimigo" not in codificado["salas"][1]
+    assert isinstance(codificado["salas"][2]["inimigo_atual"], dict)
+    assert _grade_dicts(decodificar_mapa(codificado)) == [
+        [sala.to_dict() for sala in linha] for linha in grade
+    ]
+
+
+def test_grade_antiga_de_dicionarios_e_convertida_sem_perdas() -> None:
+    """Saves antigos (inclusive com campos ausentes) viram o mesmo mapa pelo codec."""
+    mapa = gerar_mapa(2, config.DIFICULDADES["facil"], rng=random.Random(3))
+    linhas = _grade_dicts(mapa)
+    linhas[0][0] = {"tipo": "sala", "nome": "Antiga", "descricao": "sem campos novos"}
+
+    convertido = decodificar_mapa(codificar_linhas(linhas))
+
+    assert _grade_dicts(convertido) == _grade_dicts(MapaCompacto.de_dicts(linhas))
+
+
+@pytest.mark.parametrize(
+    "alteracao",
+    [
+        {"largura": 0},
+        {"paredes": [1, 2]},
+        {"salas": []},
+        {"paredes": [-1, 2, 99]},
+        {"formato": "outro"},
+    ],
+)
+def test_validacao_rejeita_mapa_codificado_inconsistente(alteracao: dict[str, object]) -> None:
+    """Estruturas incoerentes não chegam a ser hidratadas."""
+    grade = [[criar_parede() for _ in range(3)] for _ in range(2)]
+    grade[1][1] = Sala(tipo="entrada", nome="Entrada", descricao="")
+    codificado = {**codificar_mapa(grade), **alteracao}
+
+    with pytest.raises(ValueError):
+        validar_mapa_codificado(codificado)
@@ -2,8 +2,10 @@ import random
 
 import pytest
 
-from src import combate
+from src import combate, motor_combate
 from src.combate import calcular_dano
+from src.entidades import Inimigo, Personagem
+from src.relogio import RelogioInstantaneo
 
 
 def test_calcular_dano() -> None:
@@ -32,8 +34,8 @@ def test_calcular_dano() -> None:
 
 def test_calcular_dano_com_detalhes_exibe_breakdown(monkeypatch: pytest.MonkeyPatch) -> None:
     """Breakdown deve mostrar fórmula com ataque, defesa e resultado."""
-    monkeypatch.setattr(combate.random, "uniform", lambda *_: 1.0)
-    dano, detalhe = combate._calcular_dano_com_detalhes(10, 3)
+    monkeypatch.setattr(motor_combate.random, "uniform", lambda *_: 1.0)
+    dano, detalhe = motor_combate._calcular_dano_com_detalhes(10, 3)
     assert dano == 7
     assert "ATK 10" in detalhe
     assert "DEF 3" in detalhe
@@ -42,7 +44,134 @@ def test_calcular_dano_com_detalhes_exibe_breakdown(monkeypatch: pytest.MonkeyPa
 
 def test_calcular_dano_com_detalhes_aplica_piso_minimo(monkeypatch: pytest.MonkeyPatch) -> None:
     """Quando ataque positivo não supera defesa, o piso de 1 deve ser aplicado."""
-    monkeypatch.setattr(combate.random, "uniform", lambda *_: 1.0)
-    dano, detalhe = combate._calcular_dano_com_detalhes(1, 10)
+    monkeypatch.setattr(motor_combate.random, "uniform", lambda *_: 1.0)
+    dano, detalhe = motor_combate._calcular_dano_com_detalhes(1, 10)
     assert dano == 1
     assert "piso mínimo" in detalhe
+
+
+def test_iniciar_combate_delega_regras_ao_motor(monkeypatch: pytest.MonkeyPatch) -> None:
+    """O adaptador de UI deve repassar as escolhas ao motor até o desfecho."""
+    jogador = Personagem(
+        nome="Teste",
+        classe="Guerreiro",
+        hp=30,
+        hp_max=30,
+        ataque=50,
+        defesa=5,
+        ataque_base=50,
+        defesa_base=5,
+        x=0,
+        y=0,
+        nivel=1,
+        xp_atual=0,
+        xp_para_proximo_nivel=100,
+    )
+    inimigo = Inimigo(
+        nome="Rato",
+        hp=5,
+        hp_max=5,
+        ataque=1,
+        defesa=0,
+        xp_recompensa=1,
+        drop_raridade="comum",
+    )
+    escolhas = iter(["x", "1"])
+    monkeypatch.setattr(combate, "desenhar_tela_combate", lambda *_: next(escolhas))
+    monkeypatch.setattr(combate, "_breakdown_ativo", lambda: False)
+    relogio = RelogioInstantaneo()
+
+    venceu, inimigo_final = combate.iniciar_combate(
+        jogador, inimigo, lambda _j: False, rng=random.Random(5), relogio=relogio
+    )
+
+    assert relogio.pausas == 1
+    assert venceu is True
+    assert inimigo_final.hp <= 0
+
+
+def _criar_duelo_desigual() -> tuple[Personagem, Inimigo]:
+    jogador = Personagem(
+        nome="Veterano",
+        classe="Guerreiro",
+        hp=80,
+        hp_max=80,
+        ataque=12,
+        defesa=6,
+        ataque_base=12,
+        defesa_base=6,
+        x=0,
+        y=0,
+        nivel=8,
+        xp_atual=0,
+        xp_para_proximo_nivel=100,
+    )
+    inimigo = Inimigo(
+        nome="Rato",
+        hp=30,
+        hp_max=30,
+        ataque=9,
+        defesa=1,
+        xp_recompensa=1,
+        drop_raridade="comum",
+    )
+    return jogador, inimigo
+
+
+def test_combate_trivial_respeita_limiar() -> None:
+    """Só lutas com vitória praticamente certa podem ser auto-resolvidas."""
+    jogador, inimigo = _criar_duelo_desigual()
+    assert combate.combate_trivial(jogador, inimigo) is True
+
+    jogador.hp = 4
+    assert combate.combate_trivial(jogador, inimigo) is False
+
+
+def test_resolver_combate_automatico_e_deterministico(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A mesma seed deve gerar o mesmo desfecho e o mesmo HP final da luta manual."""
+    telas: list[str] = []
+    monkeypatch.setattr(combate, "desenhar_tela_evento", lambda titulo, _m: telas.append(titulo))
+    monkeypatch.setattr(combate, "desenhar_tela_combate", lambda *_: "1")
+    monkeypatch.setattr(combate, "_breakdown_ativo", lambda: False)
+
+    jogador_auto, inimigo_auto = _criar_duelo_desigual()
+    venceu_auto, _ = combate.resolver_combate_automatico(
+        jogador_auto, inimigo_auto, rng=random.Random(11)
+    )
+    jogador_manual, inimigo_manual = _criar_duelo_desigual()
+    venceu_manual, _ = combate.iniciar_combate(
+        jogador_manual, inimigo_manual, lambda _j: False, rng=random.Random(11)
+    )
+
+    assert telas == ["COMBATE RESOLVIDO"]
+    assert venceu_auto is venceu_manual is True
+    assert jogador_auto.hp == jogador_manual.hp < jogador_auto.hp_max
+    assert inimigo_auto.hp == inimigo_manual.hp
+
+
+def test_resolver_combate_automatico_no_limite_de_turnos_volta_ao_manual(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Sem desfecho no limite de turnos, a luta segue pela tela em vez de virar derrota."""
+    telas: list[str] = []
+    chamadas: list[tuple[Personagem, Inimigo]] = []
+    monkeypatch.setattr(combate, "desenhar_tela_evento", lambda titulo, _m: telas.append(titulo))
+
+    def combate_manual(
+        jogador: Personagem, inimigo: Inimigo, *_args: object, **_kwargs: object
+    ) -> tuple[bool, Inimigo]:
+        chamadas.append((jogador, inimigo))
+        return True, inimigo
+
+    monkeypatch.setattr(combate, "iniciar_combate", combate_manual)
+    jogador, inimigo = _criar_duelo_desigual()
+    jogador.ataque = inimigo.ataque = 0  # ninguém causa dano: o motor bate no limite
+
+    venceu, inimigo_final = combate.resolver_combate_automatico(
+        jogador, inimigo, rng=random.Random(3)
+    )
+
+    assert telas == ["COMBATE PROLONGADO"]
+    assert chamadas == [(jogador, inimigo)]
+    assert venceu is True and inimigo_final is inimigo
+    assert jogador.esta_vivo()
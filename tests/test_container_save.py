@@ -0,0 +1,46 @@
+import zlib
+
+import pytest
+
+from src import container_save
+
+
+@pytest.mark.parametrize("algoritmo", ["nenhum", "zlib", "lzma"])
+def test_empacotar_e_desempacotar_preservam_o_corpo(algoritmo: str) -> None:
+    """O corpo volta idêntico e o cabeçalho descreve o conteúdo sem descomprimir."""
+    corpo = ('{"dados": "' + "masmorra " * 500 + '"}').encode()
+
+    pacote = container_save.empacotar(corpo, schema=3, algoritmo=algoritmo)
+    cabecalho = container_save.ler_cabecalho(pacote)
+
+    assert container_save.eh_container(pacote)
+    assert (cabecalho.schema, cabecalho.algoritmo) == (3, algoritmo)
+    assert cabecalho.tamanho == len(pacote) - container_save.TAMANHO_CABECALHO
+    assert container_save.desempacotar(pacote) == corpo
+    if algoritmo != "nenhum":
+        assert len(pacote) < len(corpo)
+
+
+def test_crc_detecta_corrupcao_antes_de_descomprimir(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Um byte trocado no corpo é recusado sem chegar ao descompressor."""
+    pacote = bytearray(container_save.empacotar(b'{"a": 1}' * 50, schema=3))
+    pacote[-1] ^= 0xFF
+
+    def falhar(_: bytes) -> bytes:
+        raise AssertionError("não deveria descomprimir um corpo corrompido")
+
+    monkeypatch.setattr(zlib, "decompress", falhar)
+    with pytest.raises(ValueError, match="CRC32"):
+        container_save.desempacotar(bytes(pacote))
+
+
+def test_save_truncado_ou_com_algoritmo_invalido_e_recusado() -> None:
+    """Tamanho divergente, cabeçalho curto e algoritmo desconhecido geram ValueError."""
+    pacote = container_save.empacotar(b"{}", schema=3)
+
+    with pytest.raises(ValueError):
+        container_save.desempacotar(pacote[:-1])
+    with pytest.raises(ValueError):
+        container_save.ler_cabecalho(pacote[:5])
+    with pytest.raises(ValueError):
+        container_save.empacotar(b"{}", schema=3, algoritmo="brotli")
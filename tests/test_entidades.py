@@ -0,0 +1,169 @@
+import copy
+import pickle
+from dataclasses import FrozenInstanceError, asdict, fields
+
+import pytest
+
+from src.economia import Moeda
+from src.entidades import (
+    PADROES_SALA,
+    Inimigo,
+    Inventario,
+    Item,
+    Motivacao,
+    Personagem,
+    Sala,
+    StatusTemporario,
+    chave_item,
+)
+
+
+def _inimigo() -> Inimigo:
+    return Inimigo(
+        nome="Goblin",
+        hp=8,
+        hp_max=10,
+        ataque=3,
+        defesa=1,
+        xp_recompensa=12,
+        drop_raridade="comum",
+        drop_item_nome="Poção",
+    )
+
+
+def _personagem() -> Personagem:
+    espada = Item("Espada", "arma", "Afiada", bonus={"ataque": 3}, preco_bronze=40)
+    return Personagem(
+        nome="Heroi",
+        hp=20,
+        hp_max=25,
+        ataque=9,
+        defesa=4,
+        classe="Guerreiro",
+        ataque_base=6,
+        defesa_base=4,
+        x=2,
+        y=3,
+        nivel=2,
+        xp_atual=15,
+        xp_para_proximo_nivel=150,
+        inventario=[Item("Poção", "consumivel", "Cura", efeito={"hp": 10})],
+        equipamento={"arma": espada, "armadura": None, "escudo": None},
+        carteira=Moeda(valor_bronze=123),
+        status_temporarios=[StatusTemporario("ataque", 2, 1, "Fúria")],
+        motivacao=Motivacao("vinganca", "Vingança", "Acertar as contas."),
+    )
+
+
+@pytest.mark.parametrize(
+    "entidade",
+    [
+        Item("Escudo", "escudo", "", bonus={"defesa": 2}),
+        _inimigo(),
+        Motivacao("fama", "Fama", "Ser lembrado."),
+        StatusTemporario("defesa", -1, 2),
+        Sala("sala", "Cripta", "Fria", pode_ter_inimigo=True, inimigo_atual=_inimigo()),
+        Sala("parede", "Parede", ""),
+        _personagem(),
+    ],
+)
+def test_to_dict_manual_gera_o_mesmo_dicionario_que_asdict(entidade: object) -> None:
+    """Os serializadores escritos à mão cobrem todos os campos, na ordem de `asdict`."""
+    esperado = asdict(entidade)  # type: ignore[call-overload]
+    if isinstance(entidade, Personagem):
+        # O inventário empilhado vai para o save como a lista plana de antes.
+        esperado["inventario"] = [asdict(item) for item in entidade.inventario]
+    serializado = entidade.to_dict()  # type: ignore[attr-defined]
+
+    assert serializado == esperado
+    assert list(serializado) == [campo.name for campo in fields(entidade)]  # type: ignore[arg-type]
+
+
+def test_to_dict_nao_compartilha_dicionarios_mutaveis() -> None:
+    """Alterar o dicionário serializado não altera a entidade."""
+    item = Item("Anel", "arma", "", bonus={"ataque": 1})
+
+    item.to_dict()["bonus"]["ataque"] = 99
+
+    assert item.bonus == {"ataque": 1}
+
+
+def test_from_dict_completa_campos_ausentes_pela_tabela_de_padroes() -> None:
+    """Sala, inimigo e personagem voltam iguais; campos ausentes usam os padrões."""
+    sala = Sala.from_dict({"tipo": "sala", "nome": "Antiga", "descricao": "", "visitada": True})
+
+    assert sala == Sala("sala", "Antiga", "", visitada=True)
+    assert PADROES_SALA["nivel_area"] == 1 and "tipo" not in PADROES_SALA
+    original = Sala("sala", "Cripta", "", inimigo_atual=_inimigo(), trama_id="t1")
+    assert Sala.from_dict(original.to_dict()) == original
+    assert Personagem.from_dict(_personagem().to_dict()) == _personagem()
+    sem_drop = {k: v for k, v in _inimigo().to_dict().items() if k != "drop_item_nome"}
+    assert Inimigo.from_dict(sem_drop).drop_item_nome is None
+
+
+@pytest.mark.parametrize(
+    "entidade",
+    [
+        Item("Escudo", "escudo", ""),
+        _inimigo(),
+        Motivacao("fama", "Fama", "Ser lembrado."),
+        StatusTemporario("defesa", -1, 2),
+        Sala("sala", "Cripta", ""),
+        _personagem(),
+        Moeda(10),
+    ],
+)
+def test_entidades_sem_dict_por_instancia_e_copiaveis(entidade: object) -> None:
+    """Slots eliminam o `__dict__`; cópia profunda e pickle (processos) continuam valendo."""
+    assert not hasattr(entidade, "__dict__")
+    # Dataclasses congeladas com slots levantam TypeError aqui no Python 3.12.
+    with pytest.raises((AttributeError, TypeError)):
+        entidade.atributo_inexistente = 1  # type: ignore[attr-defined]
+    assert copy.deepcopy(entidade) == entidade
+    assert pickle.loads(pickle.dumps(entidade)) == entidade
+
+
+def test_item_e_motivacao_sao_imutaveis_mas_entidades_de_estado_nao() -> None:
+    """Itens e motivações são congelados; inimigo, sala, status e carteira seguem mutáveis."""
+    with pytest.raises(FrozenInstanceError):
+        Item("Anel", "arma", "").nome = "Outro"  # type: ignore[misc]
+    with pytest.raises(FrozenInstanceError):
+        Motivacao("a", "b", "c").titulo = "d"  # type: ignore[misc]
+
+    inimigo = _inimigo()
+    inimigo.hp -= 3
+    sala = Sala("sala", "Cripta", "")
+    sala.visitada = True
+    carteira = Moeda(10)
+    carteira.receber(5)
+    assert (inimigo.hp, sala.visitada, carteira.valor_bronze) == (5, True, 15)
+
+
+def test_inventario_empilha_itens_iguais_e_remove_por_chave() -> None:
+    """Unidades iguais viram uma pilha com um único `Item`; a lista do save não muda."""
+    pocao = Item("Poção", "consumivel", "Cura", efeito={"hp": 10})
+    espada = Item("Espada", "arma", "", bonus={"ataque": 3})
+    inventario = Inventario([pocao, espada, Item.from_dict(pocao.to_dict()), pocao])
+
+    assert len(inventario) == 4
+    assert [(item.nome, qtd) for _, item, qtd in inventario.pilhas()] == [
+        ("Poção", 3),
+        ("Espada", 1),
+    ]
+    assert all(item is pocao for item in inventario if item.nome == "Poção")
+    assert inventario[-1] is espada and espada in inventario
+
+    assert inventario.remover_chave(chave_item(espada)) is espada
+    inventario.remove(pocao)
+    assert len(inventario) == 2 and espada not in inventario
+    with pytest.raises(ValueError):
+        inventario.remover_chave(chave_item(espada))
+
+    jogador = _personagem()
+    jogador.inventario.extend([pocao, pocao])
+    dados = jogador.to_dict()
+    assert dados["inventario"] == [pocao.to_dict()] * 3
+    carregado = Personagem.from_dict(dados)
+    assert isinstance(carregado.inventario, Inventario)
+    assert carregado.inventario.quantidade(chave_item(pocao)) == 3
+    assert carregado == jogador
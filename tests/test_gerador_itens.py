@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import random
+
 import pytest
 
 from src import gerador_itens
@@ -41,3 +43,34 @@ def test_obter_item_por_nome_encontra_independente_de_maisculas() -> None:
 def test_obter_item_por_nome_inexistente() -> None:
     """Quando não encontra, retorna None."""
     assert gerador_itens.obter_item_por_nome("Item Inventado") is None
+
+
+def test_itens_do_catalogo_sao_prototipos_compartilhados() -> None:
+    """Drops e buscas por nome devolvem o mesmo `Item` imutável, sem cópia por chamada."""
+    primeiro = gerador_itens.obter_item_por_nome("Lâmina Fantasmal")
+    assert primeiro is gerador_itens.obter_item_por_nome("lâmina fantasmal")
+
+    sorteados = {
+        id(gerador_itens.gerar_item_aleatorio("comum", rng=random.Random(semente)))
+        for semente in range(50)
+    }
+    prototipos = {id(item) for item in gerador_itens._prototipos()[0]["comum"]}
+    prototipos |= {id(item) for item in gerador_itens._prototipos()[0]["consumivel"]}
+    assert sorteados <= prototipos
+
+
+def test_prototipo_compartilhado_nao_pode_ser_alterado() -> None:
+    """Mexer no bônus de um drop não pode vazar para os próximos drops."""
+    espada = gerador_itens.obter_item_por_nome("Espada Afiada")
+    assert espada is not None
+    bonus_original = dict(espada.bonus)
+
+    with pytest.raises(TypeError):
+        espada.bonus["ataque"] = 999  # type: ignore[index]
+    with pytest.raises(TypeError):
+        espada.bonus.update(ataque=999)
+
+    novo_drop = gerador_itens.obter_item_por_nome("Espada Afiada")
+    assert novo_drop is espada
+    assert novo_drop.bonus == bonus_original
+    assert type(novo_drop.to_dict()["bonus"]) is dict
@@ -0,0 +1,125 @@
+import threading
+from pathlib import Path
+
+from src.armazenamento import EstadoJogo
+from src.gravador_saves import GravadorSaves, ResultadoGravacao, SlotSave
+
+
+class _GravacaoFalsa:
+    """Registra as chamadas e pode segurar a primeira gravação até ser liberada."""
+
+    def __init__(self, *, bloquear: bool = False, erro: Exception | None = None) -> None:
+        self.chamadas: list[tuple[EstadoJogo, SlotSave, bool]] = []
+        self.iniciou = threading.Event()
+        self.liberar = threading.Event()
+        self.erro = erro
+        if not bloquear:
+            self.liberar.set()
+
+    def __call__(self, estado: EstadoJogo, slot_id: SlotSave, incremental: bool) -> Path:
+        self.chamadas.append((estado, slot_id, incremental))
+        self.iniciou.set()
+        assert self.liberar.wait(5)
+        if self.erro is not None:
+            raise self.erro
+        return Path(f"save_{slot_id}.json")
+
+
+def test_pedidos_do_mesmo_slot_sao_agrupados_enquanto_o_disco_esta_ocupado() -> None:
+    """Só o estado mais recente de cada slot é gravado depois da gravação em curso."""
+    gravar = _GravacaoFalsa(bloquear=True)
+    gravador = GravadorSaves(gravar)
+
+    gravador.agendar({"turno": 1}, "1", incremental=True)
+    assert gravar.iniciou.wait(5)
+    gravador.agendar({"turno": 2}, "1", incremental=True)
+    gravador.agendar({"turno": 3}, "1", incremental=True)
+    assert gravador.pendente()
+    assert gravador.status_para_hud() == "💾 Salvando..."
+
+    gravar.liberar.set()
+    assert gravador.aguardar(timeout=5)
+
+    assert [estado["turno"] for estado, _, _ in gravar.chamadas] == [1, 3]
+    assert (gravador.gravacoes, gravador.agrupadas, gravador.falhas) == (2, 1, 0)
+    gravador.encerrar()
+
+
+def test_save_completo_agrupado_nao_vira_incremental() -> None:
+    """Um pedido completo ainda na fila mantém a gravação completa ao ser substituído."""
+    gravar = _GravacaoFalsa(bloquear=True)
+    gravador = GravadorSaves(gravar)
+
+    gravador.agendar({"turno": 0}, "2")
+    assert gravar.iniciou.wait(5)
+    gravador.agendar({"turno": 1}, "2")
+    gravador.agendar({"turno": 2}, "2", incremental=True)
+    gravar.liberar.set()
+    gravador.encerrar()
+
+    assert gravar.chamadas[-1] == ({"turno": 2}, "2", False)
+    assert not gravador.pendente()
+
+
+def test_status_do_hud_mostra_o_resultado_uma_unica_vez() -> None:
+    """Sucesso e falha viram uma mensagem no HUD, exibida só uma vez."""
+    gravador = GravadorSaves(_GravacaoFalsa())
+    gravador.agendar({}, "1")
+    assert gravador.aguardar(timeout=5)
+    assert gravador.status_para_hud() == "💾 Jogo salvo em save_1.json."
+    assert gravador.status_para_hud() is None
+
+    gravador_falho = GravadorSaves(_GravacaoFalsa(erro=OSError("disco cheio")))
+    gravador_falho.agendar({}, "1")
+    assert gravador_falho.aguardar(timeout=5)
+    assert gravador_falho.status_para_hud() == "⚠️ Não foi possível salvar: disco cheio."
+    assert gravador_falho.status_para_hud() is None
+    assert gravador_falho.ultimo_resultado is not None
+    assert not gravador_falho.ultimo_resultado.sucesso
+    assert gravador_falho.falhas == 1
+    gravador.encerrar()
+    gravador_falho.encerrar()
+
+
+def test_encerrar_grava_o_que_estiver_pendente(tmp_path: Path) -> None:
+    """Sair do jogo com um save na fila ainda o leva até o disco."""
+    destino = tmp_path / "save.json"
+
+    def gravar(estado: EstadoJogo, _slot: SlotSave, _incremental: bool) -> Path:
+        destino.write_text(str(estado["turno"]))
+        return destino
+
+    gravador = GravadorSaves(gravar)
+    gravador.agendar({"turno": 7})
+    gravador.encerrar()
+
+    assert destino.read_text() == "7"
+    assert gravador.status_para_hud() == f"💾 Jogo salvo em {destino}."
+
+
+def test_erro_inesperado_de_um_slot_nao_derruba_a_fila() -> None:
+    """Um `RuntimeError` vira falha do pedido e os slots seguintes ainda são gravados."""
+    chamadas: list[SlotSave] = []
+    resultados = []
+
+    def gravar(estado: EstadoJogo, slot_id: SlotSave, incremental: bool) -> Path:
+        chamadas.append(slot_id)
+        if slot_id == "ruim":
+            raise RuntimeError("slot inválido")
+        return Path(f"save_{slot_id}.json")
+
+    def callback_com_defeito(resultado: ResultadoGravacao) -> None:
+        raise KeyError(resultado.slot_id)
+
+    gravador = GravadorSaves(gravar)
+    gravador.agendar({"turno": 1}, "ruim", ao_concluir=callback_com_defeito)
+    gravador.agendar({"turno": 1}, "bom", ao_concluir=resultados.append)
+    assert gravador.aguardar(timeout=5)
+    gravador.agendar({"turno": 2}, "depois", ao_concluir=resultados.append)
+    assert gravador.aguardar(timeout=5)
+    gravador.encerrar()
+
+    assert chamadas == ["ruim", "bom", "depois"]
+    assert [resultado.slot_id for resultado in resultados] == ["bom", "depois"]
+    assert all(resultado.sucesso for resultado in resultados)
+    assert (gravador.gravacoes, gravador.falhas, gravador.erros_callback) == (3, 1, 1)
@@ -0,0 +1,250 @@
+import io
+import json
+import random
+import sqlite3
+from pathlib import Path
+
+import pytest
+from rich.console import Console
+
+from src import armazenamento, ui
+from src import historico as modulo_historico
+from src.historico import HistoricoRuns
+
+
+@pytest.fixture
+def diretorio_historico(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Redireciona o histórico para um diretório temporário."""
+    monkeypatch.setattr(armazenamento, "_DIRETORIO_SALVAMENTO", tmp_path)
+    monkeypatch.setattr(armazenamento, "_ARQUIVO_HISTORICO", tmp_path / "history.json")
+    return tmp_path
+
+
+def _run(indice: int, **campos: object) -> dict[str, object]:
+    entrada: dict[str, object] = {
+        "motivo": "morte",
+        "personagem": f"Heroi {indice}",
+        "classe": "Guerreiro",
+        "dificuldade": "normal",
+        "andar_alcancado": 1,
+        "inimigo_causa_morte": "Goblin",
+        "timestamp_local": f"2026-01-01 00:00:{indice % 60:02d}",
+    }
+    entrada.update(campos)
+    return entrada
+
+
+def test_historico_nao_tem_limite_e_pagina_do_mais_recente(diretorio_historico: Path) -> None:
+    """Todas as runs ficam guardadas e as páginas vêm da mais recente para a mais antiga."""
+    for indice in range(75):
+        armazenamento.registrar_historico(_run(indice, andar_alcancado=indice % 7))
+
+    historico = armazenamento.abrir_historico()
+
+    assert historico.contar() == 75
+    primeira = historico.consultar(pagina=0, por_pagina=20)
+    ultima = historico.consultar(pagina=3, por_pagina=20)
+    assert [e["personagem"] for e in primeira[:2]] == ["Heroi 74", "Heroi 73"]
+    assert [e["personagem"] for e in ultima] == [f"Heroi {i}" for i in range(14, -1, -1)]
+    assert historico.contar(andar_minimo=6) == 10
+
+
+def test_filtros_e_agregados_usam_as_colunas_indexadas(tmp_path: Path) -> None:
+    """Filtros por classe, dificuldade e seed e os agregados de andar e causa de morte."""
+    historico = HistoricoRuns(tmp_path / "history.db")
+    historico.registrar(_run(1, classe="Mago", andar_alcancado=4, seed_run=2**63 - 1))
+    historico.registrar(_run(2, classe="Mago", andar_alcancado=9, dificuldade="dificil"))
+    historico.registrar(_run(3, andar_alcancado=6, inimigo_causa_morte="Lich"))
+    historico.registrar(_run(4, motivo="saida", inimigo_causa_morte=None))
+
+    assert historico.melhor_andar_por_classe() == {"Mago": 9, "Guerreiro": 6}
+    assert historico.causas_de_morte() == [("Goblin", 2), ("Lich", 1)]
+    assert historico.contar(classe="Mago", dificuldade="dificil") == 1
+    [semente] = historico.consultar(seed_run=2**63 - 1)
+    assert semente["personagem"] == "Heroi 1"
+
+    historico.limpar()
+    assert historico.contar() == 0
+
+
+def test_history_json_antigo_e_importado_uma_unica_vez(diretorio_historico: Path) -> None:
+    """O JSON das versões anteriores vira linhas do banco e é renomeado após a importação."""
+    legado = diretorio_historico / "history.json"
+    legado.write_text(json.dumps([_run(1), _run(2), "lixo"]), encoding="utf-8")
+
+    armazenamento.registrar_historico(_run(3))
+    historico = armazenamento.abrir_historico()
+
+    assert not legado.exists()
+    assert (diretorio_historico / "history.json.importado").exists()
+    assert [e["personagem"] for e in historico.consultar()] == ["Heroi 3", "Heroi 2", "Heroi 1"]
+
+
+def test_tela_de_historico_navega_entre_paginas(
+    diretorio_historico: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """N avança uma página, P volta e Enter sai; só a página exibida é consultada."""
+    for indice in range(5):
+        armazenamento.registrar_historico(_run(indice))
+    paginas: list[int] = []
+    consultar_original = HistoricoRuns.consultar
+
+    def consultar(self: HistoricoRuns, **filtros: int) -> list[dict[str, object]]:
+        paginas.append(filtros["pagina"])
+        return consultar_original(self, **filtros)
+
+    respostas = iter(["n", "n", "n", "p", ""])
+    monkeypatch.setattr(HistoricoRuns, "consultar", consultar)
+    monkeypatch.setattr(ui, "limpar_tela", lambda: None)
+    monkeypatch.setattr(ui.console, "print", lambda *args, **kwargs: None)
+    monkeypatch.setattr(ui.console, "input", lambda *args, **kwargs: next(respostas))
+
+    ui.desenhar_historico(limite=2)
+
+    assert paginas == [0, 1, 2, 2, 1]
+
+
+def _runs_variadas(quantidade: int) -> list[dict[str, object]]:
+    rng = random.Random(3)
+    return [
+        _run(
+            indice,
+            classe=rng.choice(["Guerreiro", "Mago", "Arqueiro"]),
+            motivo=rng.choice(["morte", "morte", "saida"]),
+            andar_alcancado=rng.randint(1, 12),
+            turnos_totais=rng.randint(10, 500),
+            inimigo_causa_morte=rng.choice(["Goblin", "Lich", "Esqueleto"]),
+        )
+        for indice in range(quantidade)
+    ]
+
+
+def test_estatisticas_agregadas_por_classe_e_andar(tmp_path: Path) -> None:
+    """Taxas por classe, percentis de profundidade e inimigo mais letal por andar."""
+    historico = HistoricoRuns(tmp_path / "history.db")
+    for andar in range(1, 11):
+        historico.registrar(_run(andar, andar_alcancado=andar, turnos_totais=10 * andar))
+    historico.registrar(_run(11, classe="Mago", motivo="saida", andar_alcancado=3))
+    historico.registrar(_run(12, classe="Mago", andar_alcancado=3, inimigo_causa_morte="Lich"))
+    historico.registrar(_run(13, classe="Mago", andar_alcancado=3, inimigo_causa_morte="Lich"))
+
+    guerreiro, mago = historico.estatisticas_por_classe()
+    assert (guerreiro.classe, guerreiro.runs, guerreiro.melhor_andar) == ("Guerreiro", 10, 10)
+    assert guerreiro.andar_medio == 5.5 and guerreiro.turnos_medios == 55.0
+    assert guerreiro.taxa_morte == 1.0
+    assert (mago.runs, mago.mortes, mago.saidas) == (3, 2, 1)
+    assert round(mago.taxa_sobrevivencia, 2) == 0.33
+    assert historico.percentis_andar((50, 90), classe="Guerreiro") == {50: 5, 90: 9}
+    assert historico.percentis_andar((50,)) == {50: 4}
+    letais = historico.inimigo_mais_letal_por_andar()
+    assert letais[3] == ("Lich", 2)
+    assert letais[7] == ("Goblin", 1)
+    assert [e["andar_alcancado"] for e in historico.ranking(3)] == [10, 9, 8]
+    assert historico.contar() == 13
+
+
+def test_agregados_incrementais_batem_com_o_recalculo_completo(tmp_path: Path) -> None:
+    """Somar run a run dá as mesmas tabelas que agregar o histórico inteiro de uma vez."""
+    historico = HistoricoRuns(tmp_path / "history.db")
+    runs = _runs_variadas(300)
+    historico.importar(runs[:150])
+    for entrada in runs[150:]:
+        historico.registrar(entrada)
+    incremental = (
+        historico.estatisticas_por_classe(),
+        historico.percentis_andar(),
+        historico.inimigo_mais_letal_por_andar(),
+    )
+
+    with sqlite3.connect(historico.caminho) as conexao:
+        conexao.executescript(modulo_historico._RECALCULAR_ESTATISTICAS)
+    conexao.close()
+
+    recalculado = (
+        historico.estatisticas_por_classe(),
+        historico.percentis_andar(),
+        historico.inimigo_mais_letal_por_andar(),
+    )
+    assert incremental == recalculado
+
+
+def test_banco_do_schema_1_ganha_estatisticas_ao_abrir(tmp_path: Path) -> None:
+    """Bancos criados antes das tabelas agregadas são recalculados na migração."""
+    caminho = tmp_path / "history.db"
+    with sqlite3.connect(caminho) as conexao:
+        conexao.executescript(modulo_historico._SCHEMA)
+        conexao.executemany(
+            modulo_historico._INSERIR,
+            [modulo_historico._linha_de(entrada) for entrada in _runs_variadas(40)],
+        )
+        conexao.execute("PRAGMA user_version = 1")
+    conexao.close()
+
+    historico = HistoricoRuns(caminho)
+
+    assert historico.contar() == 40
+    assert sum(estat.runs for estat in historico.estatisticas_por_classe()) == 40
+    assert historico.inimigo_mais_letal_por_andar()
+
+
+def test_tela_de_historico_abre_o_ranking(
+    diretorio_historico: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """R no histórico mostra o ranking com as tabelas agregadas."""
+    historico = armazenamento.abrir_historico()
+    historico.importar(_runs_variadas(30))
+    paineis: list[str] = []
+    respostas = iter(["r", "", ""])
+    monkeypatch.setattr(ui, "limpar_tela", lambda: None)
+    monkeypatch.setattr(
+        ui.console, "print", lambda painel, *args, **kwargs: paineis.append(str(painel.title))
+    )
+    monkeypatch.setattr(ui.console, "input", lambda *args, **kwargs: next(respostas))
+
+    ui.desenhar_historico()
+
+    assert "Ranking: runs mais profundas" in paineis
+    assert "Letalidade por andar" in paineis
+
+
+def test_banco_corrompido_vira_historico_vazio_sem_derrubar_o_jogo(
+    diretorio_historico: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Um `history.db` ilegível não quebra o registro da run nem as telas."""
+    (diretorio_historico / "history.db").write_bytes(b"isto nao e um banco sqlite" * 100)
+    with pytest.raises(sqlite3.DatabaseError):
+        HistoricoRuns(diretorio_historico / "history.db").contar()
+
+    assert armazenamento.registrar_historico(_run(1)) is False
+
+    tela = Console(file=io.StringIO(), width=200)
+    respostas = iter(["r", "", ""])
+    monkeypatch.setattr(ui, "limpar_tela", lambda: None)
+    monkeypatch.setattr(ui.console, "print", tela.print)
+    monkeypatch.setattr(ui.console, "input", lambda *args, **kwargs: next(respostas))
+
+    ui.desenhar_historico()
+
+    # Histórico, ranking e o histórico de novo ao voltar do ranking.
+    assert tela.file.getvalue().count("Histórico indisponível") == 3  # type: ignore[attr-defined]
+
+
+def test_importacao_legada_desfeita_se_a_renomeacao_falhar(
+    diretorio_historico: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Sem conseguir renomear o JSON, nada é importado; a nova tentativa não duplica."""
+    legado = diretorio_historico / "history.json"
+    legado.write_text(json.dumps([_run(1), _run(2)]), encoding="utf-8")
+
+    def replace_falho(origem: object, destino: object) -> None:
+        raise PermissionError("arquivo em uso")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(armazenamento.os, "replace", replace_falho)
+        assert armazenamento.abrir_historico().contar() == 0
+        assert armazenamento.abrir_historico().contar() == 0
+    assert legado.exists()
+
+    assert armazenamento.abrir_historico().contar() == 2
+    assert armazenamento.abrir_historico().contar() == 2
+    assert not legado.exists()
@@ -108,7 +108,7 @@ def test_fluxo_integrado_criacao_evento_combate_save_load_continuar(
     monkeypatch.setattr(
         jogo,
         "iniciar_combate",
-        lambda jogador, inimigo, usar_item, rng=None: (True, inimigo),
+        lambda jogador, inimigo, usar_item, rng=None, relogio=None: (True, inimigo),
     )
     assert jogo.executar_estado_combate(contexto) == jogo.Estado.EXPLORACAO
     assert sala_combate.inimigo_derrotado is True
@@ -119,6 +119,9 @@ def test_fluxo_integrado_criacao_evento_combate_save_load_continuar(
         lambda _j, _s, opcoes, *_args: str(opcoes.index("Salvar jogo") + 1),
     )
     assert jogo.executar_estado_exploracao(contexto) == jogo.Estado.EXPLORACAO
+    assert contexto.gravador.aguardar(timeout=5)
+    assert contexto.gravador.ultimo_resultado is not None
+    assert contexto.gravador.ultimo_resultado.sucesso
 
     estado_salvo = armazenamento.carregar_jogo("1")
     assert estado_salvo["seed_run"] == contexto.seed_run
@@ -9,8 +9,9 @@ from jogo import (
     serializar_mapa,
     verificar_level_up,
 )
+from src import config
 from src.economia import Moeda
-from src.entidades import Inimigo, Item, Personagem, Sala
+from src.entidades import Inimigo, Inventario, Item, Personagem, Sala, chave_item
 from src.personagem_utils import (
     adicionar_status_temporario,
     aplicar_bonus_equipamento,
@@ -260,7 +261,7 @@ def test_serializar_e_hidratar_mapa() -> None:
         ]
     ]
     serializado = serializar_mapa(mapa)
-    assert isinstance(serializado[0][0]["inimigo_atual"], dict)
+    assert isinstance(serializado["salas"][0]["inimigo_atual"], dict)
 
     hidratado = hidratar_mapa(serializado)
     assert isinstance(hidratado[0][0].inimigo_atual, Inimigo)
@@ -300,17 +301,16 @@ def test_remover_item_por_chave(jogador_base: Personagem, espada_curta: Item) ->
     """Remover item por chave deve retirar apenas uma instância do agrupamento."""
     outra_espada = Item(nome="Espada Curta", tipo="arma", descricao="", bonus={"ataque": 3})
     jogador_base.inventario = [espada_curta, outra_espada]
-    chave = (
-        espada_curta.nome,
-        espada_curta.tipo,
-        tuple(sorted(espada_curta.bonus.items())),
-        (),
-    )
+    chave = chave_item(espada_curta)
 
     removido = remover_item_por_chave(jogador_base.inventario, chave)
     assert removido.nome == "Espada Curta"
     assert len(jogador_base.inventario) == 1
 
+    jogador_base.inventario = Inventario([espada_curta, outra_espada])
+    assert remover_item_por_chave(jogador_base.inventario, chave) is espada_curta
+    assert jogador_base.inventario.quantidade(chave) == 1
+
 
 def test_aplicar_consequencia_trama_registra_marca(
     jogador_base: Personagem, monkeypatch: pytest.MonkeyPatch
@@ -333,3 +333,31 @@ def test_aplicar_consequencia_trama_registra_marca(
     assert sala.trama_consequencia_texto
     assert contexto.trama_consequencia_resumo
     assert any(item.nome == "Broche do Sobrevivente" for item in jogador_base.inventario)
+
+
+def test_definir_tamanho_mapa_rejeita_save_corrompido() -> None:
+    """Tamanho do andar vem do save; valores inválidos são erro de carregamento."""
+    contexto = jogo.ContextoJogo()
+    contexto.definir_tamanho_mapa(64, 32)
+    assert (contexto.largura_mapa, contexto.altura_mapa) == (64, 32)
+
+    for largura, altura in (("64", 32), (64, 2)):
+        with pytest.raises(jogo.ErroCarregamento):
+            contexto.definir_tamanho_mapa(largura, altura)
+    assert (contexto.largura_mapa, contexto.altura_mapa) == (64, 32)
+
+
+def test_tamanho_mapa_da_linha_de_comando_vale_para_novas_runs() -> None:
+    """`--mapa` define o andar das novas runs, inclusive depois de um reset."""
+    argumentos = jogo._ler_argumentos(["--mapa", "48x24"])
+    contexto = jogo.ContextoJogo(tamanho_mapa_novas_runs=argumentos.mapa)
+    assert (contexto.largura_mapa, contexto.altura_mapa) == (48, 24)
+
+    contexto.definir_tamanho_mapa(64, 32)
+    contexto.resetar_jogo()
+    assert (contexto.largura_mapa, contexto.altura_mapa) == (48, 24)
+
+    assert jogo._ler_argumentos([]).mapa == (config.MAP_WIDTH, config.MAP_HEIGHT)
+    for invalido in ("48", "3x10", "axb"):
+        with pytest.raises(SystemExit):
+            jogo._ler_argumentos(["--mapa", invalido])
@@ -0,0 +1,80 @@
+import random
+
+from src.entidades import Inimigo, Personagem
+from src.log_combate import LogCombate
+from src.motor_combate import AcaoCombate, EstadoCombate
+from src.ui_base import limitar_log
+
+
+def test_log_combate_formata_apenas_ao_ler() -> None:
+    """Entradas guardam modelo e argumentos; o texto sai só na leitura."""
+    log = LogCombate()
+    log.registrar("Você ataca o {0} e causa {1} de dano!", "Goblin", 7)
+    log.append("Mensagem {literal} sem argumentos")
+    assert list(log) == [
+        "Você ataca o Goblin e causa 7 de dano!",
+        "Mensagem {literal} sem argumentos",
+    ]
+    assert log[-1] == "Mensagem {literal} sem argumentos"
+
+
+def test_log_combate_transborda_para_disco_mantendo_ordem() -> None:
+    """Com o buffer cheio, as entradas antigas vão para disco sem se perder."""
+    log = LogCombate(limite_memoria=8)
+    for indice in range(50):
+        log.registrar("evento {0}", indice)
+
+    assert len(log) == 50
+    assert log.transbordadas > 0
+    assert len(log._entradas) <= 8
+    assert list(log) == [f"evento {indice}" for indice in range(50)]
+    assert log[0] == "evento 0"
+    assert log[10:13] == ["evento 10", "evento 11", "evento 12"]
+    assert limitar_log(log, limite=3) == [
+        "(… +47 eventos anteriores)",
+        "evento 47",
+        "evento 48",
+        "evento 49",
+    ]
+
+
+def test_log_de_luta_longa_fica_limitado_em_memoria() -> None:
+    """Uma luta de chefe longa não acumula entradas em memória além do limite."""
+    jogador = Personagem(
+        nome="Teste",
+        classe="Guerreiro",
+        hp=5000,
+        hp_max=5000,
+        ataque=12,
+        defesa=10,
+        ataque_base=12,
+        defesa_base=10,
+        x=0,
+        y=0,
+        nivel=1,
+        xp_atual=0,
+        xp_para_proximo_nivel=100,
+    )
+    chefe = Inimigo(
+        nome="Lich",
+        hp=3000,
+        hp_max=3000,
+        ataque=12,
+        defesa=10,
+        xp_recompensa=1,
+        drop_raridade="epico",
+    )
+    estado = EstadoCombate(
+        jogador=jogador,
+        inimigo=chefe,
+        rng=random.Random(2),
+        mostrar_breakdown=True,
+        log=LogCombate(limite_memoria=64),
+    )
+    while not estado.encerrado:
+        estado.step(AcaoCombate.ATACAR)
+
+    assert len(estado.log) > 1000
+    assert len(estado.log._entradas) <= 64
+    assert estado.log[1].startswith("Você ataca o Lich e causa")
+    assert "(ATK 12 x" in estado.log[1]
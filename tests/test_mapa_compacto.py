@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from jogo import hidratar_mapa, serializar_mapa
+from src import config
+from src.entidades import Sala
+from src.gerador_mapa import gerar_mapa
+from src.mapa_compacto import MapaCompacto, criar_parede, iterar_salas
+
+
+def test_mapa_compacto_compartilha_paredes_e_guarda_salas_esparsas() -> None:
+    """Paredes não alocam uma Sala por célula; salas reais ficam no dicionário."""
+    mapa = MapaCompacto(4, 3, criar_parede(2))
+    sala = Sala(tipo="sala", nome="Sala", descricao="Teste")
+    mapa[1][2] = sala
+
+    assert len(mapa) == 3
+    assert len(mapa[0]) == 4
+    assert mapa[1][2] is sala
+    assert mapa[0][0] is mapa[2][3] is mapa.parede
+    assert mapa.eh_parede(0, 0) and not mapa.eh_parede(2, 1)
+    assert mapa.quantidade_salas == 1
+    assert [s.tipo for s in mapa[1]] == ["parede", "parede", "sala", "parede"]
+    assert list(iterar_salas(mapa)) == [(2, 1, sala)]
+
+    mapa[1][2] = mapa.parede
+    assert mapa.quantidade_salas == 0
+    with pytest.raises(IndexError):
+        mapa.obter(4, 0)
+
+
+def test_gerar_mapa_retorna_mapa_compacto_com_caminho_principal() -> None:
+    """O gerador usa a grade compacta e mantém entrada, chefe e escada."""
+    mapa = gerar_mapa(1, config.DIFICULDADES["normal"], rng=random.Random(7))
+
+    assert isinstance(mapa, MapaCompacto)
+    tipos = {sala.tipo for _, _, sala in iterar_salas(mapa)}
+    assert {"entrada", "chefe", "escada"} <= tipos
+    assert mapa.quantidade_salas < config.MAP_WIDTH * config.MAP_HEIGHT
+
+
+def test_serializacao_do_mapa_compacto_e_idempotente() -> None:
+    """Serializar, hidratar e serializar de novo produz o mesmo save."""
+    mapa = gerar_mapa(3, config.DIFICULDADES["normal"], rng=random.Random(21))
+    serializado = serializar_mapa(mapa)
+
+    assert (serializado["largura"], serializado["altura"]) == (
+        config.MAP_WIDTH,
+        config.MAP_HEIGHT,
+    )
+    hidratado = hidratar_mapa(serializado)
+    assert serializar_mapa(hidratado) == serializado
+    assert hidratado.quantidade_salas == mapa.quantidade_salas
+
+
+def test_mapa_compacto_de_linhas_deduplica_paredes() -> None:
+    """Grades legadas de `list[list[Sala]]` viram mapas compactos equivalentes."""
+    grade = [[criar_parede() for _ in range(3)] for _ in range(2)]
+    grade[1][1] = Sala(tipo="entrada", nome="Entrada", descricao="")
+
+    mapa = MapaCompacto.de_linhas(grade)
+
+    assert mapa.quantidade_salas == 1
+    assert mapa[1][1].tipo == "entrada"
+    assert mapa[0][2] is mapa.parede
+
+
+def test_gerar_mapa_aceita_tamanho_por_run() -> None:
+    """O tamanho do andar é parâmetro; salas secundárias só tocam o caminho principal."""
+    mapa = gerar_mapa(2, config.DIFICULDADES["normal"], rng=random.Random(4), largura=40, altura=25)
+
+    assert (mapa.largura, mapa.altura) == (40, 25)
+    posicoes = {(x, y): sala for x, y, sala in iterar_salas(mapa)}
+    tipos = [sala.tipo for sala in posicoes.values()]
+    assert tipos.count("entrada") == 1
+    assert tipos.count("escada") == 1
+    for x, y in posicoes:
+        vizinhos = {(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)}
+        assert vizinhos & posicoes.keys()
+
+
+def test_gerar_mapa_rejeita_tamanho_fora_dos_limites() -> None:
+    """Andares pequenos demais não comportam entrada, chefe e escada."""
+    with pytest.raises(ValueError):
+        gerar_mapa(1, rng=random.Random(1), largura=2, altura=10)
@@ -0,0 +1,103 @@
+import random
+
+from src.entidades import Inimigo, Personagem
+from src.motor_combate import (
+    AcaoCombate,
+    EstadoCombate,
+    ResultadoCombate,
+    resolver_combate,
+)
+
+
+def _jogador(hp: int = 30, ataque: int = 8, defesa: int = 3) -> Personagem:
+    """Cria um jogador mínimo para o motor."""
+    return Personagem(
+        nome="Teste",
+        classe="Guerreiro",
+        hp=hp,
+        hp_max=hp,
+        ataque=ataque,
+        defesa=defesa,
+        ataque_base=ataque,
+        defesa_base=defesa,
+        x=0,
+        y=0,
+        nivel=1,
+        xp_atual=0,
+        xp_para_proximo_nivel=100,
+    )
+
+
+def _inimigo(hp: int = 12, ataque: int = 5, defesa: int = 1) -> Inimigo:
+    """Cria um inimigo mínimo para o motor."""
+    return Inimigo(
+        nome="Goblin",
+        hp=hp,
+        hp_max=hp,
+        ataque=ataque,
+        defesa=defesa,
+        xp_recompensa=10,
+        drop_raridade="comum",
+    )
+
+
+def test_step_ataque_resolve_turno_do_jogador_e_do_inimigo() -> None:
+    """Um ataque aplica dano nos dois lados quando o inimigo sobrevive."""
+    jogador, inimigo = _jogador(), _inimigo(hp=100)
+    estado = EstadoCombate(jogador, inimigo, rng=random.Random(7))
+
+    assert estado.step(AcaoCombate.ATACAR) is None
+    assert inimigo.hp < 100
+    assert jogador.hp < 30
+    assert estado.turnos == 1
+    assert estado.log[0] == "Um Goblin selvagem aparece!"
+    assert estado.log[1].startswith("Você ataca o Goblin")
+
+
+def test_resolver_combate_e_deterministico_com_mesma_seed() -> None:
+    """Mesma seed deve produzir o mesmo desfecho e o mesmo HP final."""
+    finais = []
+    for _ in range(2):
+        estado = resolver_combate(_jogador(), _inimigo(), rng=random.Random(99))
+        finais.append((estado.resultado, estado.turnos, estado.jogador.hp, estado.inimigo.hp))
+    assert finais[0] == finais[1]
+    assert finais[0][0] is ResultadoCombate.VITORIA
+
+
+def test_politica_do_inimigo_pode_ser_substituida() -> None:
+    """Um inimigo passivo nunca causa dano ao jogador."""
+    jogador = _jogador()
+    estado = resolver_combate(
+        jogador,
+        _inimigo(hp=50),
+        politica_inimigo=lambda _estado: AcaoCombate.FUGIR,
+        rng=random.Random(3),
+        registrar_log=True,
+    )
+    assert estado.resultado is ResultadoCombate.VITORIA
+    assert jogador.hp == 30
+    assert "O Goblin hesita e não ataca." in estado.log
+
+
+def test_usar_item_sem_consumivel_nao_consome_turno() -> None:
+    """Sem item disponível, o inimigo não ganha ataque grátis."""
+    jogador = _jogador()
+    estado = EstadoCombate(jogador, _inimigo(), rng=random.Random(1), usar_item=lambda _j: False)
+
+    estado.step(AcaoCombate.USAR_ITEM)
+
+    assert jogador.hp == 30
+    assert estado.turnos == 0
+    assert estado.log[-1] == "Você não tem itens consumíveis ou decidiu não usar."
+
+
+def test_fuga_bem_sucedida_encerra_o_combate() -> None:
+    """Fuga com rolagem favorável encerra sem vencedor."""
+
+    class RngFuga(random.Random):
+        def random(self) -> float:
+            return 0.0
+
+    estado = EstadoCombate(_jogador(), _inimigo(), rng=RngFuga())
+    assert estado.step(AcaoCombate.FUGIR) is ResultadoCombate.FUGA
+    assert estado.encerrado
@@ -0,0 +1,58 @@
+import jogo
+from src.aleatoriedade import derivar_seed_andar
+from src.estados.exploracao import agendar_proximo_andar, chave_andar, gerar_andar
+from src.mapa_compacto import Mapa
+
+
+def _resumo(mapa: Mapa) -> list[list[tuple[str, str, bool]]]:
+    return [[(sala.tipo, sala.nome, sala.pode_ter_inimigo) for sala in linha] for linha in mapa]
+
+
+def _contexto(seed: int) -> jogo.ContextoJogo:
+    contexto = jogo.ContextoJogo()
+    contexto.inicializar_rng(seed)
+    contexto.definir_dificuldade("normal")
+    return contexto
+
+
+def test_derivar_seed_andar_e_estavel_e_distinta_por_andar() -> None:
+    """A seed do andar depende só da seed da run e do número do andar."""
+    assert derivar_seed_andar(123, 2) == derivar_seed_andar(123, 2)
+    assert derivar_seed_andar(123, 2) != derivar_seed_andar(123, 3)
+    assert derivar_seed_andar(123, 2) != derivar_seed_andar(124, 2)
+
+
+def test_andar_pre_gerado_e_identico_ao_gerado_na_hora() -> None:
+    """Com ou sem pré-geração, o próximo andar sai igual e não consome o RNG da run."""
+    contexto = _contexto(777)
+    estado_rng = contexto.rng.getstate()
+    agendar_proximo_andar(contexto)
+    pre_gerado = contexto.pregerador.obter(chave_andar(contexto, 2))
+
+    sem_pre_geracao = gerar_andar(_contexto(777), 2)
+
+    assert pre_gerado is not None
+    assert contexto.pregerador.aproveitados == 1
+    assert _resumo(pre_gerado) == _resumo(sem_pre_geracao)
+    assert contexto.rng.getstate() == estado_rng
+
+
+def test_andar_pre_gerado_e_descartado_se_dificuldade_muda() -> None:
+    """Mudanças que afetam a geração invalidam o andar antecipado."""
+    contexto = _contexto(99)
+    agendar_proximo_andar(contexto)
+    contexto.definir_dificuldade("dificil")
+
+    assert contexto.pregerador.obter(chave_andar(contexto, 2)) is None
+    assert contexto.pregerador.descartados == 1
+    contexto.pregerador.encerrar()
+
+
+def test_andar_nao_depende_de_quanto_o_rng_da_run_foi_usado() -> None:
+    """Combates nos andares anteriores não mudam o layout dos próximos andares."""
+    calmo = _contexto(2024)
+    agitado = _contexto(2024)
+    for _ in range(500):
+        agitado.rng.random()
+
+    assert _resumo(gerar_andar(calmo, 5)) == _resumo(gerar_andar(agitado, 5))
@@ -0,0 +1,131 @@
+import math
+import random
+import time
+
+import pytest
+
+from src.entidades import Inimigo, Personagem
+from src.motor_combate import ResultadoCombate, resolver_combate
+from src.previsao_combate import _sobrevivencia, distribuicao_dano, prever_combate
+
+
+def test_distribuicao_dano_soma_um_e_respeita_piso() -> None:
+    """A distribuição de um golpe é uma probabilidade válida e nunca tem dano zero."""
+    distribuicao = distribuicao_dano(10, 3)
+    assert [dano for dano, _ in distribuicao] == [5, 6, 7, 8]
+    assert math.isclose(sum(p for _, p in distribuicao), 1.0)
+    assert distribuicao_dano(1, 10) == ((1, 1.0),)
+    assert distribuicao_dano(0, 0) == ((0, 1.0),)
+
+
+def test_prever_combate_com_dano_deterministico() -> None:
+    """Com piso mínimo nos dois lados, o resultado é exato e conhecido."""
+    previsao = prever_combate(2, 0, 10, 1, 50, 3)
+    assert previsao.chance_vitoria == pytest.approx(1.0)
+    assert previsao.turnos_esperados == pytest.approx(3.0)
+
+    previsao = prever_combate(1, 50, 3, 2, 0, 3)
+    # Ambos precisam de 3 golpes; o jogador ataca primeiro e vence.
+    assert previsao.chance_vitoria == pytest.approx(1.0)
+
+
+def test_prever_combate_sem_dano_possivel() -> None:
+    """Sem ataque dos dois lados a luta não termina."""
+    previsao = prever_combate(0, 0, 10, 0, 0, 10)
+    assert previsao.chance_vitoria == 0.0
+    assert math.isinf(previsao.turnos_esperados)
+
+
+def test_prever_combate_memoriza_e_responde_rapido() -> None:
+    """Chamadas repetidas usam o cache LRU."""
+    prever_combate.cache_clear()
+    inicio = time.perf_counter()
+    prever_combate(20, 10, 125, 15, 5, 100)
+    frio = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    prever_combate(20, 10, 125, 15, 5, 100)
+    quente = time.perf_counter() - inicio
+
+    assert prever_combate.cache_info().hits == 1
+    assert frio < 0.02
+    assert quente < 0.001
+
+
+def _sobrevivencia_direta(ataque: int, defesa: int, hp: int) -> list[float]:
+    """Cadeia de Markov sem atalhos: convolui a massa com cada dano possível."""
+    massa = [1.0] + [0.0] * (hp - 1)
+    sobrevivencia = [1.0]
+    while sobrevivencia[-1] > 1e-12:
+        nova = [0.0] * hp
+        for acumulado, probabilidade in enumerate(massa):
+            for dano, chance in distribuicao_dano(ataque, defesa):
+                if probabilidade and acumulado + dano < hp:
+                    nova[acumulado + dano] += probabilidade * chance
+        massa = nova
+        sobrevivencia.append(math.fsum(massa))
+    return sobrevivencia
+
+
+@pytest.mark.parametrize(("ataque", "defesa", "hp"), [(25, 18, 120), (40, 12, 314), (9, 3, 34)])
+def test_sobrevivencia_por_faixas_bate_com_a_convolucao_direta(
+    ataque: int, defesa: int, hp: int
+) -> None:
+    """As somas de prefixo por faixa reproduzem a convolução dano a dano."""
+    _sobrevivencia.cache_clear()
+    rapida = _sobrevivencia(ataque, defesa, hp)
+    direta = _sobrevivencia_direta(ataque, defesa, hp)
+
+    assert rapida is not None
+    assert len(rapida) == len(direta)
+    assert rapida == pytest.approx(direta, abs=1e-12)
+
+
+@pytest.mark.parametrize(
+    "atributos",
+    [
+        (30, 12, 150, 30, 20, 314),  # chefe de andar alto
+        (25, 10, 120, 35, 18, 432),
+        (60, 20, 250, 50, 40, 500),
+        (5, 0, 500, 100, 100, 500),
+    ],
+)
+def test_prever_combate_frio_em_escala_de_chefe(atributos: tuple[int, ...]) -> None:
+    """Chefes com centenas de HP cabem no orçamento de 20 ms mesmo sem cache."""
+    prever_combate.cache_clear()
+    _sobrevivencia.cache_clear()
+    distribuicao_dano.cache_clear()
+    inicio = time.perf_counter()
+    previsao = prever_combate(*atributos)
+    frio = time.perf_counter() - inicio
+
+    assert 0.0 <= previsao.chance_vitoria <= 1.0
+    assert frio < 0.02
+
+
+def test_prever_combate_confere_com_motor_escalar() -> None:
+    """A chance exata deve bater com a frequência observada no motor de combate."""
+    rng = random.Random(404)
+    lutas = 3_000
+    vitorias = 0
+    for _ in range(lutas):
+        jogador = Personagem(
+            nome="Teste",
+            classe="Guerreiro",
+            hp=30,
+            hp_max=30,
+            ataque=9,
+            defesa=3,
+            ataque_base=9,
+            defesa_base=3,
+            x=0,
+            y=0,
+            nivel=1,
+            xp_atual=0,
+            xp_para_proximo_nivel=100,
+        )
+        inimigo = Inimigo("Orc", 34, 34, 9, 3, xp_recompensa=1, drop_raridade="comum")
+        estado = resolver_combate(jogador, inimigo, rng=rng)
+        vitorias += estado.resultado is ResultadoCombate.VITORIA
+
+    previsao = prever_combate(9, 3, 30, 9, 3, 34)
+    assert abs(previsao.chance_vitoria - vitorias / lutas) < 0.04
@@ -0,0 +1,73 @@
+import random
+import time
+
+import pytest
+
+from src import combate, relogio
+from src.entidades import Inimigo, Personagem
+from src.relogio import RelogioAcelerado, RelogioInstantaneo, RelogioReal
+
+
+def test_relogio_instantaneo_so_contabiliza() -> None:
+    """O relógio instantâneo não bloqueia, mas registra o tempo virtual."""
+    relogio_virtual = RelogioInstantaneo()
+    inicio = time.perf_counter()
+    for _ in range(100):
+        relogio_virtual.pausar(1.0)
+    assert time.perf_counter() - inicio < 0.1
+    assert relogio_virtual.pausas == 100
+    assert relogio_virtual.tempo_virtual == pytest.approx(100.0)
+
+
+def test_relogio_acelerado_divide_pausas(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Pausas aceleradas preservam a proporção entre esperas."""
+    dormidas: list[float] = []
+    monkeypatch.setattr(relogio.time, "sleep", dormidas.append)
+    RelogioAcelerado(fator=20).pausar(1.0)
+    RelogioReal().pausar(0.5)
+    RelogioReal().pausar(0)
+    assert dormidas == [pytest.approx(0.05), 0.5]
+    with pytest.raises(ValueError):
+        RelogioAcelerado(fator=0)
+
+
+def test_combate_usa_relogio_injetado(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Entradas inválidas e fugas não esperam de verdade com relógio instantâneo."""
+    jogador = Personagem(
+        nome="Teste",
+        classe="Guerreiro",
+        hp=500,
+        hp_max=500,
+        ataque=1,
+        defesa=50,
+        ataque_base=1,
+        defesa_base=50,
+        x=0,
+        y=0,
+        nivel=1,
+        xp_atual=0,
+        xp_para_proximo_nivel=100,
+    )
+    inimigo = Inimigo(
+        nome="Golem",
+        hp=500,
+        hp_max=500,
+        ataque=1,
+        defesa=50,
+        xp_recompensa=1,
+        drop_raridade="comum",
+    )
+    escolhas = iter(["x"] * 20 + ["3"] * 50)
+    monkeypatch.setattr(combate, "desenhar_tela_combate", lambda *_: next(escolhas))
+    monkeypatch.setattr(combate, "_breakdown_ativo", lambda: False)
+    relogio_virtual = RelogioInstantaneo()
+
+    inicio = time.perf_counter()
+    venceu, _ = combate.iniciar_combate(
+        jogador, inimigo, lambda _j: False, rng=random.Random(3), relogio=relogio_virtual
+    )
+
+    assert venceu is False
+    assert time.perf_counter() - inicio < 0.5
+    assert relogio_virtual.pausas == 21
+    assert relogio_virtual.tempo_virtual == pytest.approx(21 * combate.PAUSA_FEEDBACK)
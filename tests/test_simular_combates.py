@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from src.entidades import Inimigo, Personagem
+from src.motor_combate import ResultadoCombate, resolver_combate
+
+np = pytest.importorskip("numpy")
+
+from src.simular_combates import simular_combates  # noqa: E402
+
+
+def _taxa_vitoria_escalar(quantidade: int, seed: int) -> float:
+    """Roda o motor escalar para o mesmo confronto usado na simulação vetorizada."""
+    rng = random.Random(seed)
+    vitorias = 0
+    for _ in range(quantidade):
+        jogador = Personagem(
+            nome="Teste",
+            classe="Guerreiro",
+            hp=30,
+            hp_max=30,
+            ataque=9,
+            defesa=3,
+            ataque_base=9,
+            defesa_base=3,
+            x=0,
+            y=0,
+            nivel=1,
+            xp_atual=0,
+            xp_para_proximo_nivel=100,
+        )
+        inimigo = Inimigo(
+            nome="Orc",
+            hp=34,
+            hp_max=34,
+            ataque=9,
+            defesa=3,
+            xp_recompensa=1,
+            drop_raridade="comum",
+        )
+        estado = resolver_combate(jogador, inimigo, rng=rng)
+        vitorias += estado.resultado is ResultadoCombate.VITORIA
+    return vitorias / quantidade
+
+
+def test_simulacao_vetorizada_bate_com_motor_escalar() -> None:
+    """A taxa de vitória vetorizada deve ficar próxima da obtida pelo motor escalar."""
+    resultado = simular_combates(9, 3, 30, 9, 3, 34, quantidade=20_000, rng=2026)
+
+    assert resultado.encerradas.all()
+    assert abs(resultado.taxa_vitoria - _taxa_vitoria_escalar(4_000, 2026)) < 0.04
+
+
+def test_piso_minimo_garante_fim_da_luta() -> None:
+    """Defesa muito alta ainda sofre 1 de dano por golpe, como no jogo."""
+    resultado = simular_combates(2, 0, 10, 1, 50, 3, quantidade=10, rng=1)
+
+    assert resultado.vitorias.all()
+    assert (resultado.turnos == 3).all()
+    assert resultado.distribuicao_turnos() == {3: 10}
+
+
+def test_atributos_em_array_simulam_lutas_independentes() -> None:
+    """Cada posição dos arrays descreve uma luta diferente."""
+    resultado = simular_combates(
+        np.array([100, 1]), 0, np.array([50, 1]), 5, 0, np.array([5, 500]), rng=7
+    )
+
+    assert resultado.total == 2
+    assert resultado.vitorias.tolist() == [True, False]
+    assert sum(resultado.distribuicao_hp_restante().values()) == 1